@@ -1,6 +1,11 @@
-import matplotlib
+import importlib.metadata
 
-# matplotlib.use("Agg")
+try:
+    # Declared once, in pyproject.toml
+    __version__ = importlib.metadata.version("rfbudget")
+except importlib.metadata.PackageNotFoundError:
+    # Source tree that is not installed
+    __version__ = "0+unknown"
 
 from .utils import (
     Hz_t,
@@ -32,12 +37,37 @@ from .utils import (
     temp_to_nf,
     loss_temp_to_nf,
     EARTH_RADIUS,
+    REFERENCE_TEMPERATURE,
+    EARTH_MU,
+    EARTH_ROTATION_RATE,
+    SPEED_OF_LIGHT,
+)
+from .physics import (
+    distance_max,
+    great_circle_distance,
+    Orbit,
+    kepler_position,
+    orbit_elements,
+    propagate,
+    eci_to_ecef,
+    geodetic_to_ecef,
+    look_angles,
+)
+from .core import (
+    Element,
+    Budget,
+    BudgetInputs,
+    BudgetResult,
+    evaluate,
+    Cascade,
+    cascade,
+    element_columns,
 )
-from .physics import distance_max, Orbit
-from .core import Element, Budget
 from .elements import (
     Antenna,
     NPort,
+    Splitter,
+    Combiner,
     TwoPortsElement,
     Amplifier,
     Loss,
@@ -55,11 +85,100 @@ from .propagation import (
     RadarFreeSpaceBasicLoss,
     OkumuraHataPathLoss,
     CostHataPathLoss,
+    TerrainPathLoss,
+    GaseousAttenuation,
+    RainAttenuation,
+    free_space_path_loss,
+    radar_free_space_basic_loss,
+    okumura_hata_path_loss,
+    cost_hata_path_loss,
+    terrain_path_loss,
+    path_loss_stage,
+    sweep_path_loss,
+    sweep_distance,
+)
+from .terrain import (
+    DigitalElevationModel,
+    knife_edge_loss,
+    bullington_loss,
+    deygout_loss,
+)
+from .atmosphere import (
+    gaseous_specific_attenuation,
+    gaseous_attenuation,
+    rain_coefficients,
+    rain_attenuation,
+)
+from .coverage import GeoGrid, CoverageMap, coverage_map
+from .network import SparseMatrix, GridIndex, NetworkResult, evaluate_network
+from .constellation import Visibility, VisibilityWindows, visibility
+from .modcod import ModcodTable, DVB_S2, LORA, data_volume
+from .ber import (
+    Modulation,
+    erfc,
+    q_function,
+    ebn0_from_snr,
+    bit_error_rate,
+    packet_error_rate,
+    ber_vs_distance,
+    ber_vs_input_power,
+)
+from .scenario import (
+    Stage,
+    EvaluationPlan,
+    compile_scenario,
+    load_scenario,
+)
+from .streaming import StreamedSweep, iter_sweep, stream_sweep
+from .cache import ResultCache, element_hash, budget_hash
+from .variants import VariantSet, VariantResult
+from .compiler import CompiledBudget, compile_budget
+from .explorer import BudgetExplorer, icon_html
+from .plotting import new_figure, decimate, plot_levels, plot_sweep, save_figure
+from .pattern import AntennaPattern, DIPOLE_GAIN, load_msi
+from .radar import (
+    Swerling,
+    Integration,
+    detection_threshold,
+    detection_probability,
+    required_snr,
+    radar_snr,
+    detection_probability_vs_range,
+    max_detection_range,
 )
-from .visualizer import into_schemdraw
+from .cable import (
+    CableType,
+    CABLES,
+    cable_type,
+    cable_loss,
+    cable_noise_figure,
+)
+from .thermal import (
+    WORST,
+    Corner,
+    element_columns_at,
+    temperature_sweep,
+    worst_case,
+)
+from .dynrange import DynamicRange, dynamic_range, op1db_column
+from .graph import INPUT, BudgetGraph, NodeResult
+from .compression import CompressionModel, PowerSweep, power_sweep
+from .intermod import BlockerAnalysis, blocker_analysis
+from .svg import into_svg, render_schematic
+from .export import ExportResult, diagram_hash, export_schematics
 
 budget = Budget
 
+
+def __getattr__(name: str):
+    # schemdraw and matplotlib are only imported when the schemdraw renderer is used
+    if name == "into_schemdraw":
+        from .visualizer import into_schemdraw
+
+        return into_schemdraw
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
 __all__ = [
     "Hz_t",
     "dB_t",
@@ -90,12 +209,31 @@ __all__ = [
     "temp_to_nf",
     "loss_temp_to_nf",
     "EARTH_RADIUS",
+    "REFERENCE_TEMPERATURE",
+    "EARTH_MU",
+    "EARTH_ROTATION_RATE",
+    "SPEED_OF_LIGHT",
     "distance_max",
+    "great_circle_distance",
     "Orbit",
+    "kepler_position",
+    "orbit_elements",
+    "propagate",
+    "eci_to_ecef",
+    "geodetic_to_ecef",
+    "look_angles",
     "Element",
     "Budget",
+    "BudgetInputs",
+    "BudgetResult",
+    "evaluate",
+    "Cascade",
+    "cascade",
+    "element_columns",
     "Antenna",
     "NPort",
+    "Splitter",
+    "Combiner",
     "TwoPortsElement",
     "Amplifier",
     "Loss",
@@ -111,6 +249,105 @@ __all__ = [
     "RadarFreeSpaceBasicLoss",
     "OkumuraHataPathLoss",
     "CostHataPathLoss",
+    "TerrainPathLoss",
+    "GaseousAttenuation",
+    "RainAttenuation",
+    "gaseous_specific_attenuation",
+    "gaseous_attenuation",
+    "rain_coefficients",
+    "rain_attenuation",
+    "free_space_path_loss",
+    "radar_free_space_basic_loss",
+    "okumura_hata_path_loss",
+    "cost_hata_path_loss",
+    "terrain_path_loss",
+    "path_loss_stage",
+    "sweep_path_loss",
+    "sweep_distance",
+    "DigitalElevationModel",
+    "knife_edge_loss",
+    "bullington_loss",
+    "deygout_loss",
+    "GeoGrid",
+    "CoverageMap",
+    "coverage_map",
+    "SparseMatrix",
+    "GridIndex",
+    "NetworkResult",
+    "evaluate_network",
+    "Visibility",
+    "VisibilityWindows",
+    "visibility",
+    "ModcodTable",
+    "DVB_S2",
+    "LORA",
+    "data_volume",
+    "Modulation",
+    "erfc",
+    "q_function",
+    "ebn0_from_snr",
+    "bit_error_rate",
+    "packet_error_rate",
+    "ber_vs_distance",
+    "ber_vs_input_power",
+    "Stage",
+    "EvaluationPlan",
+    "compile_scenario",
+    "load_scenario",
+    "StreamedSweep",
+    "iter_sweep",
+    "stream_sweep",
+    "ResultCache",
+    "element_hash",
+    "budget_hash",
+    "VariantSet",
+    "VariantResult",
+    "CompiledBudget",
+    "compile_budget",
+    "BudgetExplorer",
+    "icon_html",
+    "new_figure",
+    "decimate",
+    "plot_levels",
+    "plot_sweep",
+    "save_figure",
+    "AntennaPattern",
+    "DIPOLE_GAIN",
+    "load_msi",
+    "Swerling",
+    "Integration",
+    "detection_threshold",
+    "detection_probability",
+    "required_snr",
+    "radar_snr",
+    "detection_probability_vs_range",
+    "max_detection_range",
+    "CableType",
+    "CABLES",
+    "cable_type",
+    "cable_loss",
+    "cable_noise_figure",
+    "WORST",
+    "Corner",
+    "element_columns_at",
+    "temperature_sweep",
+    "worst_case",
+    "DynamicRange",
+    "dynamic_range",
+    "op1db_column",
+    "INPUT",
+    "BudgetGraph",
+    "NodeResult",
+    "CompressionModel",
+    "PowerSweep",
+    "power_sweep",
+    "BlockerAnalysis",
+    "blocker_analysis",
     "into_schemdraw",
+    "into_svg",
+    "render_schematic",
+    "ExportResult",
+    "diagram_hash",
+    "export_schematics",
     "budget",
 ]
@@ -0,0 +1,227 @@
+from typing import Dict, Tuple
+import numpy as np
+from .utils import Hz_t, dB_t, deg_t, m_t, km, GHz
+
+# Lookup grids in log10(frequency in GHz), evaluated once on first use
+_GRID_SIZE = 2048
+_tables: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+# ITU-R P.838-3 coefficients: (a_j, b_j, c_j), m, c
+_P838_K_H = (
+    ((-5.33980, -0.10008, 1.13098), (-0.35351, 1.26970, 0.45400),
+     (-0.23789, 0.86036, 0.15354), (-0.94158, 0.64552, 0.16817)),
+    -0.18961, 0.71147,
+)
+_P838_K_V = (
+    ((-3.80595, 0.56934, 0.81061), (-3.44965, -0.22911, 0.51059),
+     (-0.39902, 0.73042, 0.11899), (0.50167, 1.07319, 0.27195)),
+    -0.16398, 0.63297,
+)
+_P838_ALPHA_H = (
+    ((-0.14318, 1.82442, -0.55187), (0.29591, 0.77564, 0.19822),
+     (0.32177, 0.63773, 0.13164), (-5.37610, -0.96230, 1.47828),
+     (16.1721, -3.29980, 3.43990)),
+    0.67849, -1.95537,
+)
+_P838_ALPHA_V = (
+    ((-0.07771, 2.33840, -0.76284), (0.56727, 0.95545, 0.54039),
+     (-0.20238, 1.14520, 0.26809), (-48.2991, 0.791669, 0.116226),
+     (48.5833, 0.791459, 0.116479)),
+    -0.053739, 0.83433,
+)
+
+# Equivalent heights of the simplified slant path model
+OXYGEN_HEIGHT = km(6)
+WATER_VAPOUR_HEIGHT = km(1.6)
+
+
+def _p838(coefficients: tuple, log_f: np.ndarray) -> np.ndarray:
+    terms, m_coef, c_coef = coefficients
+    s = sum(a * np.exp(-(((log_f - b) / c) ** 2)) for a, b, c in terms)
+    return s + m_coef * log_f + c_coef
+
+
+def _oxygen(f: np.ndarray) -> np.ndarray:
+    """
+    Specific attenuation of dry air (dB/km) at 1013hPa and 15°C,
+    ITU-R P.676-5 Annex 2 for f <= 54GHz.
+    """
+    rp = 1.0
+    rt = 288.0 / (273.0 + 15.0)
+
+    def phi(a: float, b: float, c: float, d: float) -> float:
+        return rp**a * rt**b * np.exp(c * (1 - rp) + d * (1 - rt))
+
+    xi1 = phi(0.0717, -1.8132, 0.0156, -1.6515)
+    xi2 = phi(0.5146, -4.6368, -0.1921, -5.7416)
+    xi3 = phi(0.3414, -6.5851, 0.2130, -8.5854)
+    return (
+        7.2 * rt**2.8 / (f**2 + 0.34 * rp**2 * rt**1.6)
+        + 0.62 * xi3 / (np.maximum(54 - f, 0) ** (1.16 * xi1) + 0.83 * xi2)
+    ) * f**2 * rp**2 * 1e-3
+
+
+def _water_vapour(f: np.ndarray) -> np.ndarray:
+    """
+    Specific attenuation of water vapour (dB/km per g/m³) at 1013hPa and 15°C,
+    ITU-R P.676-5 Annex 2, linearized around a density of 7.5g/m³.
+    """
+    rp = 1.0
+    rt = 288.0 / (273.0 + 15.0)
+    rho = 7.5
+    eta1 = 0.955 * rp * rt**0.68 + 0.006 * rho
+    eta2 = 0.735 * rp * rt**0.5 + 0.0353 * rt**4 * rho
+
+    def g(fi: float) -> np.ndarray:
+        return 1 + ((f - fi) / (f + fi)) ** 2
+
+    return (
+        3.98 * eta1 * np.exp(2.23 * (1 - rt)) / ((f - 22.235) ** 2 + 9.42 * eta1**2) * g(22)
+        + 11.96 * eta1 * np.exp(0.7 * (1 - rt)) / ((f - 183.31) ** 2 + 11.14 * eta1**2)
+        + 0.081 * eta1 * np.exp(6.44 * (1 - rt)) / ((f - 321.226) ** 2 + 6.29 * eta1**2)
+        + 3.66 * eta1 * np.exp(1.6 * (1 - rt)) / ((f - 325.153) ** 2 + 9.22 * eta1**2)
+        + 25.37 * eta1 * np.exp(1.09 * (1 - rt)) / (f - 380) ** 2
+        + 17.4 * eta1 * np.exp(1.46 * (1 - rt)) / (f - 448) ** 2
+        + 844.6 * eta1 * np.exp(0.17 * (1 - rt)) / (f - 557) ** 2 * g(557)
+        + 290 * eta1 * np.exp(0.41 * (1 - rt)) / (f - 752) ** 2 * g(752)
+        + 8.3328e4 * eta2 * np.exp(0.99 * (1 - rt)) / (f - 1780) ** 2 * g(1780)
+    ) * f**2 * rt**2.5 * 1e-4
+
+
+def _table(name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Precomputed interpolation grid of a coefficient, indexed by log10(f/GHz)."""
+    if name not in _tables:
+        if name in ("oxygen", "water_vapour"):
+            log_f = np.linspace(0, np.log10(54), _GRID_SIZE)
+        else:
+            log_f = np.linspace(0, np.log10(1000), _GRID_SIZE)
+        f = 10**log_f
+        values = {
+            "oxygen": lambda: _oxygen(f),
+            "water_vapour": lambda: _water_vapour(f),
+            "k_h": lambda: 10 ** _p838(_P838_K_H, log_f),
+            "k_v": lambda: 10 ** _p838(_P838_K_V, log_f),
+            "alpha_h": lambda: _p838(_P838_ALPHA_H, log_f),
+            "alpha_v": lambda: _p838(_P838_ALPHA_V, log_f),
+        }[name]()
+        _tables[name] = (log_f, values)
+    return _tables[name]
+
+
+def _lookup(name: str, freq: np.ndarray) -> np.ndarray:
+    log_f, values = _table(name)
+    x = np.log10(np.asarray(freq, dtype=float) / GHz(1))
+    if np.any(x < log_f[0]) or np.any(x > log_f[-1]):
+        raise ValueError(
+            "Expected frequency to be in 1 - {:.0f}GHz range".format(10 ** log_f[-1])
+        )
+    return np.interp(x, log_f, values)
+
+
+def gaseous_specific_attenuation(
+    freq: Hz_t, water_vapour_density: float = 7.5
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Specific attenuation (dB/km) of oxygen and water vapour at sea level,
+    element-wise on arrays, valid from 1 to 54GHz.
+    """
+    gamma_o = _lookup("oxygen", freq)
+    gamma_w = _lookup("water_vapour", freq) * np.asarray(water_vapour_density)
+    return gamma_o, gamma_w
+
+
+def gaseous_attenuation(
+    freq: Hz_t, elevation: deg_t, water_vapour_density: float = 7.5
+) -> dB_t:
+    """
+    Slant path attenuation (dB) of atmospheric gases in the style of ITU-R P.676,
+    with constant equivalent heights for oxygen and water vapour.
+    Valid for elevations above 5°.
+    """
+    gamma_o, gamma_w = gaseous_specific_attenuation(freq, water_vapour_density)
+    zenith = gamma_o * OXYGEN_HEIGHT / km(1) + gamma_w * WATER_VAPOUR_HEIGHT / km(1)
+    return zenith / np.sin(np.radians(elevation))
+
+
+def rain_coefficients(
+    freq: Hz_t, elevation: deg_t = deg_t(0), polarization_tilt: deg_t = deg_t(45)
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coefficients k and alpha of the specific attenuation k.R^alpha, ITU-R P.838-3.
+    polarization_tilt: 0° horizontal, 90° vertical, 45° circular.
+    """
+    k_h = _lookup("k_h", freq)
+    k_v = _lookup("k_v", freq)
+    alpha_h = _lookup("alpha_h", freq)
+    alpha_v = _lookup("alpha_v", freq)
+    c = np.cos(np.radians(elevation)) ** 2 * np.cos(2 * np.radians(polarization_tilt))
+    k = (k_h + k_v + (k_h - k_v) * c) / 2
+    alpha = (k_h * alpha_h + k_v * alpha_v + (k_h * alpha_h - k_v * alpha_v) * c) / (2 * k)
+    return k, alpha
+
+
+def rain_attenuation(
+    freq: Hz_t,
+    elevation: deg_t,
+    rain_rate: float,
+    availability: float = 99.99,
+    latitude: deg_t = deg_t(45),
+    station_height: m_t = m_t(0),
+    rain_height: m_t = km(3),
+    polarization_tilt: deg_t = deg_t(45),
+) -> dB_t:
+    """
+    Rain attenuation (dB) exceeded during (100 - availability)% of an average
+    year on a slant path, ITU-R P.618 section 2.2.1.1, element-wise on arrays.
+    rain_rate: rain rate exceeded 0.01% of the time (mm/h)
+    rain_height: see ITU-R P.839
+    """
+    f = np.asarray(freq, dtype=float) / GHz(1)
+    theta = np.radians(elevation)
+    phi = np.abs(np.asarray(latitude, dtype=float))
+    k, alpha = rain_coefficients(freq, elevation, polarization_tilt)
+    gamma_r = k * np.asarray(rain_rate, dtype=float) ** alpha
+    h = np.maximum((np.asarray(rain_height) - np.asarray(station_height)) / km(1), 0)
+    slant = h / np.sin(theta)
+    horizontal = slant * np.cos(theta)
+    r = 1 / (
+        1
+        + 0.78 * np.sqrt(horizontal * gamma_r / f)
+        - 0.38 * (1 - np.exp(-2 * horizontal))
+    )
+    zeta = np.degrees(np.arctan2(h, horizontal * r))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rain_length = np.where(
+            zeta > np.degrees(theta), horizontal * r / np.cos(theta), slant
+        )
+    chi = np.where(phi < 36, 36 - phi, 0.0)
+    nu = 1 / (
+        1
+        + np.sqrt(np.sin(theta))
+        * (
+            31 * (1 - np.exp(-np.degrees(theta) / (1 + chi)))
+            * np.sqrt(rain_length * gamma_r)
+            / f**2
+            - 0.45
+        )
+    )
+    a001 = gamma_r * rain_length * nu
+    p = 100 - np.asarray(availability, dtype=float)
+    beta = np.where(
+        (p >= 1) | (phi >= 36),
+        0.0,
+        np.where(
+            np.degrees(theta) >= 25,
+            -0.005 * (phi - 36),
+            -0.005 * (phi - 36) + 1.8 - 4.25 * np.sin(theta),
+        ),
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exponent = -(
+            0.655
+            + 0.033 * np.log(p)
+            - 0.045 * np.log(a001)
+            - beta * (1 - p) * np.sin(theta)
+        )
+        attenuation = a001 * (p / 0.01) ** exponent
+    return np.where(a001 > 0, attenuation, 0.0)
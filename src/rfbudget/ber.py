@@ -0,0 +1,138 @@
+from typing import Optional
+import numpy as np
+from .core import Budget
+from .propagation import sweep_distance
+from .utils import Hz_t, dB_t, dBm_t
+
+# Chebyshev fit of erfc(x).exp(x²)(1 + x/2), see Numerical Recipes "erfcc"
+_ERFC_COEFFICIENTS = (
+    -1.26551223,
+    1.00002368,
+    0.37409196,
+    0.09678418,
+    -0.18628806,
+    0.27886807,
+    -1.13520398,
+    1.48851587,
+    -0.82215223,
+    0.17087277,
+)
+
+
+class Modulation:
+    """Modulations with a closed form bit error rate on AWGN channel"""
+
+    BPSK = "BPSK"
+    QPSK = "QPSK"
+    # Differentially coherent BPSK
+    DBPSK = "DBPSK"
+    # M-ary PSK, Gray coded
+    PSK = "PSK"
+    # Square M-ary QAM, Gray coded
+    QAM = "QAM"
+    # Orthogonal M-ary FSK, coherent detection
+    FSK = "FSK"
+    # Orthogonal M-ary FSK, envelope (non-coherent) detection
+    NoncoherentFSK = "NoncoherentFSK"
+
+
+def erfc(x: np.ndarray) -> np.ndarray:
+    """Complementary error function on arrays, relative error below 1.2e-7."""
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x)
+    t = 1 / (1 + 0.5 * z)
+    poly = np.zeros_like(t)
+    for c in reversed(_ERFC_COEFFICIENTS):
+        poly = poly * t + c
+    r = t * np.exp(-z * z + poly)
+    return np.where(x >= 0, r, 2 - r)
+
+
+def q_function(x: np.ndarray) -> np.ndarray:
+    """Gaussian tail probability Q(x)."""
+    return 0.5 * erfc(np.asarray(x, dtype=float) / np.sqrt(2))
+
+
+def ebn0_from_snr(snr: dB_t, signal_bandwidth: Hz_t, bit_rate: float) -> dB_t:
+    """Eb/N0 (dB) from the SNR (dB) measured in the signal bandwidth."""
+    return np.asarray(snr, dtype=float) + 10 * np.log10(
+        np.asarray(signal_bandwidth, dtype=float) / np.asarray(bit_rate, dtype=float)
+    )
+
+
+def bit_error_rate(ebn0: dB_t, modulation: str, order: int = 2) -> np.ndarray:
+    """
+    Bit error rate on AWGN channel at Eb/N0 (dB), element-wise on arrays.
+    order: number of symbols M of PSK, QAM and FSK modulations.
+    M-PSK and M-QAM use the nearest neighbour approximation (exact for
+    4-QAM); M-ary FSK uses the union bound when coherent and the exact
+    expression when non-coherent.
+    """
+    gamma = 10 ** (np.asarray(ebn0, dtype=float) / 10)
+    if order < 2 or order & (order - 1):
+        raise ValueError("Expected a modulation order that is a power of 2")
+    k = np.log2(order)
+    if modulation in (Modulation.BPSK, Modulation.QPSK):
+        return q_function(np.sqrt(2 * gamma))
+    elif modulation == Modulation.DBPSK:
+        return 0.5 * np.exp(-gamma)
+    elif modulation == Modulation.PSK:
+        if order <= 4:
+            return q_function(np.sqrt(2 * gamma))
+        return 2 / k * q_function(np.sqrt(2 * k * gamma) * np.sin(np.pi / order))
+    elif modulation == Modulation.QAM:
+        if k % 2:
+            raise ValueError("Expected a square QAM constellation")
+        return (
+            4 / k * (1 - 1 / np.sqrt(order))
+            * q_function(np.sqrt(3 * k * gamma / (order - 1)))
+        )
+    elif modulation == Modulation.FSK:
+        symbol_error = (order - 1) * q_function(np.sqrt(k * gamma))
+        return np.minimum(order / 2 / (order - 1) * symbol_error, 0.5)
+    elif modulation == Modulation.NoncoherentFSK:
+        symbol_error = np.zeros_like(gamma)
+        binomial = 1.0
+        for n in range(1, order):
+            binomial *= (order - n) / n
+            symbol_error += (
+                (-1) ** (n + 1) * binomial / (n + 1) * np.exp(-n * k * gamma / (n + 1))
+            )
+        return order / 2 / (order - 1) * symbol_error
+    else:
+        raise ValueError("Unexpected modulation")
+
+
+def packet_error_rate(ber: np.ndarray, packet_bits: int) -> np.ndarray:
+    """Probability that a packet holds at least one error, with independent bit errors."""
+    return -np.expm1(packet_bits * np.log1p(-np.asarray(ber, dtype=float)))
+
+
+def ber_vs_distance(
+    budget: Budget,
+    distance: np.ndarray,
+    bit_rate: float,
+    modulation: str,
+    order: int = 2,
+    stage: Optional[int] = None,
+) -> np.ndarray:
+    """Bit error rate at the output of the budget for an array of distances."""
+    snr = sweep_distance(budget, distance, stage).snr[-1]
+    ebn0 = ebn0_from_snr(snr, budget.signal_bandwidth, bit_rate)
+    return bit_error_rate(ebn0, modulation, order)
+
+
+def ber_vs_input_power(
+    budget: Budget,
+    input_power: dBm_t,
+    bit_rate: float,
+    modulation: str,
+    order: int = 2,
+) -> np.ndarray:
+    """
+    Bit error rate at the output of the budget for an array of available
+    input powers (dBm). The cascade is linear so the SNR follows the input power.
+    """
+    snr = budget.snr[-1] + np.asarray(input_power, dtype=float) - budget.available_input_power
+    ebn0 = ebn0_from_snr(snr, budget.signal_bandwidth, bit_rate)
+    return bit_error_rate(ebn0, modulation, order)
@@ -0,0 +1,128 @@
+from typing import Dict, Optional, Sequence, Union
+import numpy as np
+from .utils import Hz_t, dB_t, m_t, kelvin_t, MHz, loss_temp_to_nf
+
+FEET = 0.3048  # m
+
+
+class CableType:
+    """
+    Attenuation (dB/m) of a transmission line versus frequency, either from
+    the model k1·√f + k2·f with f in MHz (conductor and dielectric losses) or
+    from a datasheet table interpolated on log-log axes. Beyond the table the
+    attenuation is extrapolated from the nearest √f segment.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        k1: float = 0.0,
+        k2: float = 0.0,
+        freq: Optional[Sequence[Hz_t]] = None,
+        attenuation: Optional[Sequence[float]] = None,
+    ):
+        self.name: str = name
+        self.k1: float = k1
+        self.k2: float = k2
+        self.freq: Optional[np.ndarray] = None
+        self.attenuation: Optional[np.ndarray] = None
+        if freq is not None or attenuation is not None:
+            if freq is None or attenuation is None or len(freq) != len(attenuation):
+                raise ValueError("Expected as many frequencies and attenuations")
+            order = np.argsort(np.asarray(freq, dtype=float))
+            self.freq = np.asarray(freq, dtype=float)[order]
+            self.attenuation = np.asarray(attenuation, dtype=float)[order]
+            if self.freq[0] <= 0 or np.any(self.attenuation <= 0):
+                raise ValueError("Expected positive frequencies and attenuations")
+
+    @classmethod
+    def per_100ft(cls, name: str, k1: float, k2: float) -> "CableType":
+        """Type from the coefficients of datasheets giving dB/100ft with f in MHz."""
+        return cls(name, k1 / (100 * FEET), k2 / (100 * FEET))
+
+    @classmethod
+    def from_table(
+        cls, name: str, freq: Sequence[Hz_t], attenuation_per_100m: Sequence[float]
+    ) -> "CableType":
+        """Type from a datasheet table of dB/100m."""
+        return cls(name, freq=freq, attenuation=np.asarray(attenuation_per_100m) / 100)
+
+    def loss_per_m(self, freq: Hz_t) -> np.ndarray:
+        """Attenuation (dB/m) element-wise on an array of frequencies."""
+        f = np.asarray(freq, dtype=float)
+        if self.freq is None:
+            f_mhz = f / MHz(1)
+            return self.k1 * np.sqrt(f_mhz) + self.k2 * f_mhz
+        log_f = np.log(np.maximum(f, 1e-300))
+        log_table = np.log(self.freq)
+        inside = np.exp(np.interp(log_f, log_table, np.log(self.attenuation)))
+        below = self.attenuation[0] * np.sqrt(f / self.freq[0])
+        above = self.attenuation[-1] * np.sqrt(f / self.freq[-1])
+        return np.where(f < self.freq[0], below, np.where(f > self.freq[-1], above, inside))
+
+    def loss_at(self, freq: Hz_t, length: m_t) -> dB_t:
+        """Loss (dB) of a run, broadcast over arrays of frequencies and lengths."""
+        return dB_t(self.loss_per_m(freq) * np.asarray(length, dtype=float))
+
+    def __repr__(self) -> str:
+        return "CableType({!r})".format(self.name)
+
+
+# Common coaxial cables, Times Microwave LMR coefficients and a typical RG
+# datasheet table
+CABLES: Dict[str, CableType] = {
+    c.name: c
+    for c in (
+        CableType.per_100ft("LMR-195", 0.36255, 0.00026),
+        CableType.per_100ft("LMR-240", 0.24243, 0.00033),
+        CableType.per_100ft("LMR-400", 0.12229, 0.00026),
+        CableType.per_100ft("LMR-600", 0.07497, 0.00026),
+        CableType.from_table(
+            "RG-58",
+            [MHz(10), MHz(50), MHz(100), MHz(200), MHz(400), MHz(1000), MHz(3000)],
+            [4.6, 10.8, 16.1, 23.0, 33.8, 56.1, 111.5],
+        ),
+        CableType.from_table(
+            "RG-213",
+            [MHz(10), MHz(50), MHz(100), MHz(200), MHz(400), MHz(1000), MHz(3000)],
+            [2.0, 4.6, 6.6, 9.8, 14.4, 26.2, 52.5],
+        ),
+    )
+}
+
+
+def cable_type(cable: Union[CableType, str]) -> CableType:
+    """Cable type from the library by name, or the given type."""
+    if isinstance(cable, CableType):
+        return cable
+    if cable not in CABLES:
+        raise ValueError("Unknown cable type: {}".format(cable))
+    return CABLES[cable]
+
+
+def cable_loss(
+    cables: Sequence[Union[CableType, str]], lengths: Sequence[m_t], freq: Hz_t
+) -> dB_t:
+    """
+    Loss (dB) of many cable runs across a frequency grid, with shape
+    (runs,) + freq.shape. Each distinct cable type is evaluated once.
+    """
+    types = [cable_type(c) for c in cables]
+    lengths = np.asarray(lengths, dtype=float)
+    if lengths.shape != (len(types),):
+        raise ValueError("Expected one length per cable run")
+    f = np.asarray(freq, dtype=float)
+    per_m = np.empty((len(types),) + f.shape)
+    rows: Dict[int, list] = {}
+    for i, t in enumerate(types):
+        rows.setdefault(id(t), [t]).append(i)
+    for t, *index in rows.values():
+        per_m[index] = t.loss_per_m(f)
+    return dB_t(per_m * lengths.reshape((-1,) + (1,) * f.ndim))
+
+
+def cable_noise_figure(loss: dB_t, temp: Optional[kelvin_t] = None) -> dB_t:
+    """Noise figure (dB) of lines at a physical temperature, element-wise on arrays."""
+    if temp is None:
+        return dB_t(np.asarray(loss, dtype=float))
+    return loss_temp_to_nf(np.asarray(loss, dtype=float), np.asarray(temp, dtype=float))
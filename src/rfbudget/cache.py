@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+from typing import Any, Dict, Optional
+import numpy as np
+from . import __version__
+from .core import RESULTS_VERSION
+
+# Budget attributes computed by `Budget.update`
+RESULT_FIELDS = (
+    "output_freq",
+    "output_power",
+    "transducer_gain",
+    "f",
+    "nf",
+    "iip2",
+    "oip2",
+    "iip3",
+    "oip3",
+    "snr",
+    "capacity",
+    "total_noise_temp",
+    "receiver_thermal_noise_dBm",
+)
+
+
+# Results are cached per installed version of the package and of the budget
+# computations
+CACHE_VERSION = "{}+results{}".format(__version__, RESULTS_VERSION)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "rfbudget",
+    "results.sqlite",
+)
+
+
+def _feed(h: Any, value: Any) -> None:
+    """Canonical encoding of a value into a hash."""
+    if value is None or isinstance(value, (bool, str)):
+        h.update(repr(value).encode())
+    elif isinstance(value, (int, float, np.number)):
+        h.update(b"n" + struct.pack("<d", float(value)))
+    elif isinstance(value, np.ndarray):
+        h.update("a{}{}".format(value.dtype.str, value.shape).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update("l{}".format(len(value)).encode())
+        for v in value:
+            _feed(h, v)
+    elif isinstance(value, dict):
+        h.update("d{}".format(len(value)).encode())
+        for k in sorted(value, key=str):
+            _feed(h, str(k))
+            _feed(h, value[k])
+    else:
+        # Element, propagation model inputs such as a DigitalElevationModel...
+        cls = type(value)
+        h.update("o{}.{}".format(cls.__module__, cls.__qualname__).encode())
+        _feed(h, {k: v for k, v in vars(value).items() if not k.startswith("_")})
+
+
+def element_hash(element: Any) -> str:
+    """Content hash of an element: its type and all its public attributes."""
+    h = hashlib.sha256()
+    _feed(h, element)
+    return h.hexdigest()
+
+
+def budget_hash(budget: Any) -> str:
+    """Content hash of the inputs of a budget and of the library version."""
+    h = hashlib.sha256()
+    _feed(
+        h,
+        [
+            CACHE_VERSION,
+            [element_hash(elt) for elt in budget.elements],
+            budget.input_freq,
+            budget.available_input_power,
+            budget.signal_bandwidth,
+            budget.with_oip,
+            budget.T_receiver,
+        ],
+    )
+    return h.hexdigest()
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if value is None:
+        return None
+    return float(value)
+
+
+class ResultCache:
+    """
+    On disk store of budget results keyed by `budget_hash`, in a SQLite
+    database in WAL mode so that several processes can share it.
+    Least recently used entries are evicted above `max_size` bytes, entries of
+    other library versions are dropped when the cache is opened.
+    A cache can be shared between threads, each one using its own connection.
+    Reads do not write to the database: access times are recorded in memory
+    and written with the next `put`.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_size: int = 256 * 1024 * 1024,
+        timeout: float = 30.0,
+    ):
+        self.path: str = path
+        self.max_size: int = max_size
+        self.timeout: float = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._accessed: Dict[str, float] = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, "
+                "version TEXT, value TEXT, size INTEGER, accessed REAL)"
+            )
+            db.execute("DELETE FROM results WHERE version != ?", (CACHE_VERSION,))
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, not shared with forked worker processes
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.connection = sqlite3.connect(self.path, timeout=self.timeout)
+            local.connection.execute("PRAGMA journal_mode=WAL")
+            local.pid = os.getpid()
+        return local.connection
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT value FROM results WHERE key = ? AND version = ?",
+                (key, CACHE_VERSION),
+            ).fetchone()
+        if row is None:
+            return None
+        with self._lock:
+            self._accessed[key] = time.time()
+        return json.loads(row[0])
+
+    def put(self, key: str, results: Dict[str, Any]) -> None:
+        value = json.dumps({k: _to_json(v) for k, v in results.items()})
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        with self._connect() as db:
+            db.executemany(
+                "UPDATE results SET accessed = ? WHERE key = ?",
+                [(t, k) for k, t in accessed.items()],
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, CACHE_VERSION, value, len(value), time.time()),
+            )
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_size:
+                rows = db.execute(
+                    "SELECT key, size FROM results ORDER BY accessed"
+                ).fetchall()
+                evicted = []
+                for old_key, size in rows:
+                    if total <= self.max_size:
+                        break
+                    evicted.append((old_key,))
+                    total -= size
+                db.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+    def __len__(self) -> int:
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def size(self) -> int:
+        """Total size (bytes) of the stored results."""
+        with self._connect() as db:
+            return db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._connect() as db:
+            db.execute("DELETE FROM results")
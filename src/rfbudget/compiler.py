@@ -0,0 +1,253 @@
+import keyword
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import numpy as np
+from numpy import log10, log2, sqrt
+from .core import Budget, Cascade, K_BOLTZMANN
+from .utils import Hz_t
+
+# Parameters of a stage that can be left free, "loss" sets the gain to -loss
+# and the noise figure to loss like a passive `Loss`.
+FREE_PARAMETERS = ("gain", "nf", "oip3", "iip2", "loss")
+
+Value = Union[float, str]
+
+# Prefix of the identifiers of the generated code, reserved so that free
+# parameters cannot shadow them
+PREFIX = "_rf_"
+
+
+class _Emitter:
+    """
+    Straight line code generation with constant folding: values are either
+    floats known at compile time or names of variables of the generated code.
+    """
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self._count = 0
+
+    @staticmethod
+    def code(value: Value) -> str:
+        if not isinstance(value, float):
+            return value
+        if np.isinf(value):
+            return "-{}inf".format(PREFIX) if value < 0 else PREFIX + "inf"
+        return repr(value)
+
+    def op(self, template: str, fn: Callable[..., float], *args: Value) -> Value:
+        if all(isinstance(a, float) for a in args):
+            with np.errstate(divide="ignore", over="ignore"):
+                return float(fn(*args))
+        name = "{}v{}".format(PREFIX, self._count)
+        self._count += 1
+        self.lines.append(
+            "    {} = {}".format(name, template.format(*(self.code(a) for a in args)))
+        )
+        return name
+
+    def add(self, a: Value, b: Value) -> Value:
+        if a == 0.0:
+            return b
+        if b == 0.0:
+            return a
+        return self.op("{} + {}", lambda x, y: x + y, a, b)
+
+    def div(self, a: Value, b: Value) -> Value:
+        if a == 0.0:
+            return 0.0
+        return self.op("{} / {}", lambda x, y: x / y, a, b)
+
+    def linear(self, db: Value) -> Value:
+        return self.op("10 ** ({} / 10)", lambda x: 10 ** (x / 10), db)
+
+
+class CompiledBudget:
+    """
+    Evaluation function specialized for the topology and constants of a
+    budget. Call it with arrays of the free parameters (and optionally of
+    `available_input_power`); they broadcast against each other and results
+    have the stage as first axis like `cascade()`.
+    """
+
+    def __init__(
+        self,
+        parameters: List[str],
+        source: str,
+        function: Callable[..., Tuple[Any, ...]],
+        output_freq: List[Hz_t],
+        available_input_power: float,
+        receiver_thermal_noise_dBm: float,
+    ):
+        self.parameters: List[str] = parameters
+        self.source: str = source
+        self.output_freq: List[Hz_t] = output_freq
+        self.available_input_power: float = available_input_power
+        self.receiver_thermal_noise_dBm: float = receiver_thermal_noise_dBm
+        self._function = function
+
+    def __call__(self, available_input_power: Optional[Any] = None, **params: Any) -> Cascade:
+        missing = set(self.parameters) - set(params)
+        if missing or len(params) != len(self.parameters):
+            raise ValueError(
+                "Expected the free parameters {}".format(", ".join(self.parameters))
+            )
+        if available_input_power is None:
+            available_input_power = self.available_input_power
+        with np.errstate(divide="ignore"):
+            columns = self._function(
+                np.asarray(available_input_power, dtype=float),
+                *(np.asarray(params[name], dtype=float) for name in self.parameters),
+            )
+        shape = np.broadcast_shapes(*(np.shape(v) for column in columns for v in column))
+        stacked = [np.stack([np.broadcast_to(v, shape) for v in column]) for column in columns]
+        return Cascade(*stacked, np.asarray(self.receiver_thermal_noise_dBm))
+
+
+def compile_budget(
+    budget: Budget, free: Optional[Dict[str, Tuple[int, str]]] = None
+) -> CompiledBudget:
+    """
+    Generate the evaluation function of a budget.
+    free: parameter name -> (stage, one of FREE_PARAMETERS); every other value
+        of the budget is folded into the generated code.
+    """
+    from .elements import Modulator, ConverterType
+
+    free = free or {}
+    n = len(budget.elements)
+    if n == 0:
+        raise ValueError("Expected a budget with at least one element")
+    overrides: Dict[Tuple[int, str], str] = {}
+    for name, (stage, parameter) in free.items():
+        if (
+            not name.isidentifier()
+            or keyword.iskeyword(name)
+            or name.startswith(PREFIX)
+            or name == "available_input_power"
+        ):
+            raise ValueError("Unexpected free parameter name: {}".format(name))
+        if parameter not in FREE_PARAMETERS:
+            raise ValueError("Unexpected free parameter: {}".format(parameter))
+        if not -n <= stage < n:
+            raise ValueError("Unexpected stage: {}".format(stage))
+        stage = stage % n
+        if parameter == "loss":
+            written = {"gain": "(-{})".format(name), "nf": name}
+        else:
+            written = {parameter: name}
+        for column, code in written.items():
+            if (stage, column) in overrides:
+                raise ValueError(
+                    "Free parameters setting the {} of stage {} twice".format(column, stage)
+                )
+            overrides[(stage, column)] = code
+
+    e = _Emitter()
+    inf = float("inf")
+    bandwidth = float(budget.signal_bandwidth)
+    t_receiver = float(budget.T_receiver)
+    columns: Dict[str, List[Value]] = {
+        k: []
+        for k in (
+            "output_power", "transducer_gain", "f", "nf", "snr", "capacity",
+            "total_noise_temp", "oip3", "iip3", "oip2", "iip2", "noise",
+        )
+    }
+    output_freq = []
+    freq = budget.input_freq or 0
+    gain_total: Value = 0.0
+    f: Value = 1.0
+    inv_oip3: Value = 0.0
+    iip2_sum: Value = 0.0
+    for stage, elt in enumerate(budget.elements):
+
+        def param(attribute: str) -> Value:
+            if (stage, attribute) in overrides:
+                return overrides[(stage, attribute)]
+            value = getattr(elt, attribute, None)
+            return inf if value is None else float(value)
+
+        gain, nf = param("gain"), param("nf")
+        gain_before = e.linear(gain_total)
+        gain_total = e.add(gain_total, gain)
+        excess = e.op("{} - 1", lambda x: x - 1, e.linear(nf))
+        f = e.add(f, e.div(excess, gain_before))
+        columns["transducer_gain"].append(gain_total)
+        columns["f"].append(f)
+        columns["nf"].append(e.op("10 * _rf_log10({})", lambda x: 10 * log10(x), f))
+        temp = e.op(
+            "{} + 290.0 * ({} - 1)", lambda t, x: t + 290.0 * (x - 1), t_receiver, f
+        )
+        columns["total_noise_temp"].append(temp)
+        noise = e.op(
+            "10 * _rf_log10({} * {})",
+            lambda x, c: 10 * log10(x * c),
+            temp, K_BOLTZMANN * bandwidth * 1000,
+        )
+        # Input referred noise power (dBm) in the signal bandwidth
+        columns["noise"].append(noise)
+        if budget.with_oip:
+            inv_stage_oip3 = e.div(1.0, e.linear(param("oip3")))
+            if inv_oip3 != 0.0:
+                inv_oip3 = e.div(inv_oip3, e.linear(gain))
+            inv_oip3 = e.add(inv_oip3, inv_stage_oip3)
+            iip2 = param("iip2")
+            if iip2 != inf:
+                term = e.op("_rf_sqrt({})", sqrt, e.div(gain_before, e.linear(iip2)))
+                iip2_sum = e.add(iip2_sum, term)
+            oip3 = e.op("-10 * _rf_log10({})", lambda x: -10 * log10(x), inv_oip3)
+            iip2_db = e.op("-20 * _rf_log10({})", lambda x: -20 * log10(x), iip2_sum)
+        else:
+            oip3, iip2_db = inf, inf
+        columns["oip3"].append(oip3)
+        columns["iip3"].append(e.op("{} - {}", lambda a, b: a - b, oip3, gain_total))
+        columns["iip2"].append(iip2_db)
+        columns["oip2"].append(e.add(iip2_db, gain_total))
+
+        if isinstance(elt, Modulator):
+            if elt.converter_type == ConverterType.Down:
+                freq = freq - elt.lo
+            else:
+                freq = freq + elt.lo
+        output_freq.append(Hz_t(freq))
+
+    # Terms depending on the input power
+    lines = list(e.lines)
+    for stage in range(n):
+        g, noise = (_Emitter.code(columns[k][stage]) for k in ("transducer_gain", "noise"))
+        p, s, c = ("{}{}{}".format(PREFIX, k, stage) for k in "psc")
+        lines.append("    {} = available_input_power + {}".format(p, g))
+        lines.append("    {} = {} - {} - {}".format(s, p, noise, g))
+        lines.append("    {} = {!r} * _rf_log2(1 + 10 ** ({} / 10))".format(c, bandwidth, s))
+        columns["output_power"].append(p)
+        columns["snr"].append(s)
+        columns["capacity"].append(c)
+    thermal_noise = float(10 * log10(K_BOLTZMANN * t_receiver * bandwidth * 1000))
+
+    order = (
+        "output_power", "transducer_gain", "f", "nf", "snr", "capacity",
+        "total_noise_temp", "oip3", "iip3", "oip2", "iip2",
+    )
+
+    def row(values: List[Value]) -> str:
+        return "({},)".format(", ".join(_Emitter.code(v) for v in values))
+
+    names = list(free)
+    source = "def _rf_evaluate({}):\n".format(", ".join(["available_input_power"] + names))
+    source += "\n".join(lines) + "\n"
+    source += "    return (\n"
+    for key in order:
+        source += "        {},\n".format(row(columns[key]))
+    source += "    )\n"
+    namespace: Dict[str, Any] = {
+        "_rf_log10": log10, "_rf_log2": log2, "_rf_sqrt": sqrt, "_rf_inf": inf,
+    }
+    exec(compile(source, "<rfbudget compiled budget>", "exec"), namespace)
+    return CompiledBudget(
+        names,
+        source,
+        namespace["_rf_evaluate"],
+        output_freq,
+        float(budget.available_input_power),
+        thermal_noise,
+    )
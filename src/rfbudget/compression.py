@@ -0,0 +1,129 @@
+import numpy as np
+from typing import Optional, Tuple
+from .core import Budget
+from .utils import dBm_t, dBm
+
+
+class CompressionModel:
+    """AM/AM compression models for active stages"""
+
+    Linear = "Linear"
+    # See C. Rapp, "Effects of HPA-nonlinearity on a 4-DPSK/OFDM-signal for a digital sound broadcasting system"
+    Rapp = "Rapp"
+    # Linear up to saturation, then clipped
+    SoftLimiter = "SoftLimiter"
+
+
+def compression_points(
+    model: str,
+    op1db: Optional[dBm_t] = None,
+    psat: Optional[dBm_t] = None,
+    smoothness: float = 2.0,
+) -> Tuple[Optional[dBm_t], Optional[dBm_t]]:
+    """
+    Return the (output P1dB, Psat) pair of a compression model given one of them.
+    """
+    if op1db is not None and psat is not None:
+        raise ValueError("Expected only one of op1db and psat")
+    if op1db is None and psat is None:
+        return None, None
+    if model == CompressionModel.SoftLimiter:
+        # The output is clipped at Psat, 1dB compression is reached right there.
+        return (op1db, op1db) if psat is None else (psat, psat)
+    elif model == CompressionModel.Rapp:
+        if smoothness <= 0:
+            raise ValueError("Expected a positive smoothness for the Rapp model")
+        # Pout = G.Pin / (1 + (G.Pin/Psat)^p)^(1/p)
+        # 1dB compression when (1 + x^p)^(1/p) = 10^0.1 with x = G.Pin/Psat
+        x = (10 ** (0.1 * smoothness) - 1) ** (1 / smoothness)
+        offset = 10 * np.log10(x) - 1
+        if psat is None:
+            return op1db, dBm(float(op1db - offset))
+        return dBm(float(psat + offset)), psat
+    else:
+        raise ValueError("Unexpected compression model")
+
+
+def am_am(
+    model: Optional[str],
+    linear_output: np.ndarray,
+    psat: Optional[dBm_t],
+    smoothness: float = 2.0,
+) -> np.ndarray:
+    """
+    Apply an AM/AM compression to the (uncompressed) linear output power, in mW.
+    """
+    if model is None or model == CompressionModel.Linear or psat is None:
+        return linear_output
+    psat_mW = 10 ** (psat / 10)
+    if model == CompressionModel.SoftLimiter:
+        return np.minimum(linear_output, psat_mW)
+    elif model == CompressionModel.Rapp:
+        return linear_output / (1 + (linear_output / psat_mW) ** smoothness) ** (
+            1 / smoothness
+        )
+    else:
+        raise ValueError("Unexpected compression model")
+
+
+class PowerSweep:
+    """
+    Compressed cascade evaluated over an array of available input power.
+
+    Arrays are indexed by stage then input power.
+    """
+
+    def __init__(
+        self,
+        input_power: np.ndarray,
+        output_power: np.ndarray,
+        small_signal_gain: np.ndarray,
+        noise_floor: np.ndarray,
+    ):
+        self.input_power: np.ndarray = input_power
+        self.output_power: np.ndarray = output_power
+        self.transducer_gain: np.ndarray = output_power - input_power
+        self.small_signal_gain: np.ndarray = small_signal_gain
+        self.compression: np.ndarray = small_signal_gain[:, None] - self.transducer_gain
+        # Input referred noise in the signal bandwidth
+        self.noise_floor: np.ndarray = noise_floor
+        self.input_p1db: np.ndarray = np.array(
+            [self._crossing(c, 1.0) for c in self.compression]
+        )
+        self.output_p1db: np.ndarray = self.input_p1db + small_signal_gain - 1
+        self.dynamic_range: np.ndarray = self.input_p1db - noise_floor
+
+    def _crossing(self, compression: np.ndarray, level: float) -> float:
+        if compression[-1] < level:
+            return float("nan")
+        # Compression is non decreasing with the input power
+        return float(np.interp(level, compression, self.input_power))
+
+
+def power_sweep(budget: Budget, input_power: np.ndarray) -> PowerSweep:
+    """
+    Evaluate the output power of every stage with the compression models of the
+    elements, for a 1-D increasing array of available input power (dBm).
+    """
+    p_in = np.asarray(input_power, dtype=float)
+    if p_in.ndim != 1 or np.any(np.diff(p_in) <= 0):
+        raise ValueError("Expected a 1-D increasing array of input power")
+    levels = []
+    current = 10 ** (p_in / 10)
+    for elt in budget.elements:
+        current = am_am(
+            getattr(elt, "compression", None),
+            current * 10 ** (elt.gain / 10),
+            getattr(elt, "psat", None),
+            getattr(elt, "smoothness", 2.0),
+        )
+        levels.append(current)
+    with np.errstate(divide="ignore"):
+        output_power = 10 * np.log10(np.array(levels))
+    noise_floor = budget.available_input_power - np.asarray(budget.snr, dtype=float)
+    return PowerSweep(
+        input_power=p_in,
+        output_power=output_power,
+        small_signal_gain=np.asarray(budget.transducer_gain, dtype=float),
+        noise_floor=noise_floor,
+    )
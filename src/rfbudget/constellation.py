@@ -0,0 +1,173 @@
+from typing import List, Optional
+import numpy as np
+from .core import Budget
+from .physics import (
+    Orbit,
+    eci_to_ecef,
+    geodetic_to_ecef,
+    kepler_position,
+    look_angles,
+    orbit_elements,
+    propagate,
+)
+from .propagation import sweep_distance
+from .utils import deg_t, m_t, EARTH_ROTATION_RATE
+
+
+class VisibilityWindows:
+    """Contiguous visibility intervals of satellite/station pairs"""
+
+    def __init__(
+        self,
+        satellite: np.ndarray,
+        station: np.ndarray,
+        start: np.ndarray,
+        end: np.ndarray,
+    ):
+        self.satellite: np.ndarray = satellite
+        self.station: np.ndarray = station
+        self.start: np.ndarray = start
+        self.end: np.ndarray = end
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    @property
+    def duration(self) -> np.ndarray:
+        return self.end - self.start
+
+
+class Visibility:
+    """
+    Samples of the time grid where a satellite is above the elevation mask of a
+    station, as flat arrays sorted by satellite, station and time.
+    """
+
+    def __init__(
+        self,
+        satellite: np.ndarray,
+        station: np.ndarray,
+        time_index: np.ndarray,
+        time: np.ndarray,
+        elevation: np.ndarray,
+        slant_range: np.ndarray,
+        windows: VisibilityWindows,
+        snr: Optional[np.ndarray] = None,
+    ):
+        self.satellite: np.ndarray = satellite
+        self.station: np.ndarray = station
+        self.time_index: np.ndarray = time_index
+        self.time: np.ndarray = time
+        self.elevation: np.ndarray = elevation
+        self.slant_range: np.ndarray = slant_range
+        self.windows: VisibilityWindows = windows
+        self.snr: Optional[np.ndarray] = snr
+
+
+def _expand_ranges(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Concatenation of the integer ranges [lo, hi] without a Python loop"""
+    counts = hi - lo + 1
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(lo, counts) + offsets
+
+
+def visibility(
+    orbits: List[Orbit],
+    station_lat: deg_t,
+    station_lon: deg_t,
+    times: np.ndarray,
+    elevation_mask: deg_t = deg_t(10),
+    station_altitude: m_t = m_t(0),
+    coarse_step: int = 16,
+    gmst0: float = 0,
+    budget: Optional[Budget] = None,
+) -> Visibility:
+    """
+    Visibility of many satellites from many ground stations over a time grid (s).
+
+    Satellites are first propagated on a coarse grid (one sample every
+    `coarse_step`). A coarse interval is refined on the full grid only if the
+    Earth central angle between the sub-satellite point and the station could
+    fall below the coverage angle of the elevation mask: that angle changes at
+    most by the orbital plus Earth rotation rate, so pruned intervals are
+    guaranteed invisible.
+
+    budget: link budget with a distance dependent propagation model (e.g.
+    `FreeSpacePathLossFriis`), evaluated at the slant range of every visible sample.
+    """
+    t = np.asarray(times, dtype=float)
+    n_times = len(t)
+    stations = geodetic_to_ecef(
+        np.atleast_1d(station_lat),
+        np.atleast_1d(station_lon),
+        np.atleast_1d(station_altitude),
+    )
+    stations = stations.reshape(-1, 3)
+    el = orbit_elements(orbits)
+    a, e, inc, raan, argp, m0, n = el.T
+
+    # Coarse pass: Earth central angle between satellites and stations
+    coarse = np.unique(np.append(np.arange(0, n_times, coarse_step), n_times - 1))
+    sat = eci_to_ecef(propagate(orbits, t[coarse]), t[coarse], gmst0)
+    sat_unit = sat / np.linalg.norm(sat, axis=-1, keepdims=True)
+    station_radius = np.linalg.norm(stations, axis=-1)
+    station_unit = stations / station_radius[:, None]
+    angle = np.arccos(np.clip(np.einsum("sck,gk->sgc", sat_unit, station_unit), -1, 1))
+
+    mask = np.radians(elevation_mask)
+    apogee_radius = a * (1 + e)
+    coverage = (
+        np.arccos(np.clip(station_radius.min() * np.cos(mask) / apogee_radius, -1, 1))
+        - mask
+    )
+    # Highest angular rate of the satellite (at perigee) relative to the Earth
+    rate = n * (1 + e) ** 2 / (1 - e**2) ** 1.5 + EARTH_ROTATION_RATE
+    half_step = np.diff(t[coarse]) / 2
+    closest = np.minimum(angle[:, :, :-1], angle[:, :, 1:])
+    candidate = closest <= (coverage[:, None] + rate[:, None] * half_step)[:, None, :]
+    s_idx, g_idx, c_idx = np.nonzero(candidate)
+
+    # Refinement on the full grid of the candidate intervals
+    lo, hi = coarse[c_idx], coarse[c_idx + 1]
+    counts = hi - lo + 1
+    fine_t = _expand_ranges(lo, hi)
+    fine_s = np.repeat(s_idx, counts)
+    fine_g = np.repeat(g_idx, counts)
+    _, first = np.unique(
+        (fine_s * len(stations) + fine_g) * n_times + fine_t, return_index=True
+    )
+    fine_s, fine_g, fine_t = fine_s[first], fine_g[first], fine_t[first]
+    # Propagate each (satellite, time) pair once
+    st_key, inverse = np.unique(fine_s * n_times + fine_t, return_inverse=True)
+    us, ut = st_key // n_times, st_key % n_times
+    pos = kepler_position(a[us], e[us], inc[us], raan[us], argp[us], m0[us] + n[us] * t[ut])
+    pos = eci_to_ecef(pos, t[ut], gmst0)[inverse.ravel()]
+    elevation, slant = look_angles(pos, stations[fine_g])
+    visible = elevation >= elevation_mask
+
+    sat_v, sta_v, t_v = fine_s[visible], fine_g[visible], fine_t[visible]
+    new_window = np.ones(len(t_v), dtype=bool)
+    new_window[1:] = (
+        (np.diff(t_v) != 1) | (np.diff(sat_v) != 0) | (np.diff(sta_v) != 0)
+    )
+    starts = np.nonzero(new_window)[0]
+    ends = np.append(starts[1:], len(t_v)) - 1
+    windows = VisibilityWindows(
+        satellite=sat_v[starts],
+        station=sta_v[starts],
+        start=t[t_v[starts]],
+        end=t[t_v[ends]],
+    )
+    snr = None
+    if budget is not None:
+        snr = sweep_distance(budget, slant[visible]).snr[-1]
+    return Visibility(
+        satellite=sat_v,
+        station=sta_v,
+        time_index=t_v,
+        time=t[t_v],
+        elevation=elevation[visible],
+        slant_range=slant[visible],
+        windows=windows,
+        snr=snr,
+    )
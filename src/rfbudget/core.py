@@ -1,7 +1,14 @@
-from numpy import log10, log2
-from typing import List, Optional, Any
+import numpy as np
+from numpy import log10, log2, sqrt
+from typing import List, NamedTuple, Optional, Any, Sequence, Tuple
 from .utils import Hz_t, dB_t, dBm_t, kelvin_t, dB, dBm, Hz, kelvin, temp_to_nf, nf_to_temp
 
+K_BOLTZMANN = 1.38e-23
+
+# Version of the budget computations, to increase whenever `Budget.update`
+# gives different results for the same inputs (invalidates cached results)
+RESULTS_VERSION = 1
+
 
 class Element:
     """
@@ -16,6 +23,8 @@ class Element:
         temp: Optional[kelvin_t] = None,
         oip3: Optional[dBm_t] = None,
         iip3: Optional[dBm_t] = None,
+        oip2: Optional[dBm_t] = None,
+        iip2: Optional[dBm_t] = None,
     ):
         self.name: str = name or ""
         self.gain: dB_t = gain
@@ -33,6 +42,26 @@ class Element:
             self.iip3 = dBm(oip3 - gain)
         elif oip3 is None:
             self.oip3 = None
+        self.iip2: Optional[dBm_t] = iip2
+        self.oip2: Optional[dBm_t] = oip2
+        if oip2 is None and iip2 is not None and gain is not None:
+            self.oip2 = dBm(iip2 + gain)
+        elif iip2 is None and oip2 is not None and gain is not None:
+            self.iip2 = dBm(oip2 - gain)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            raise AttributeError("Cannot modify frozen element {}".format(self.name))
+        object.__setattr__(self, name, value)
+
+    def freeze(self) -> "Element":
+        """Make the element read only so that it can be shared between threads."""
+        object.__setattr__(self, "_frozen", True)
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        return getattr(self, "_frozen", False)
 
     def schemdraw(self, d: Any, options: dict) -> Any:
         from .visualizer import draw_element
@@ -48,19 +77,23 @@ class Element:
 class Budget:
     def __init__(
         self,
-        elements: List[Element] = [],
+        elements: Optional[List[Element]] = None,
         input_freq: Optional[Hz_t] = None,
         available_input_power: dBm_t = dBm(0),
         signal_bandwidth: Hz_t = Hz(1),
         without_oip: bool = False,
         T_receiver: Optional[kelvin_t] = None,
+        cache: Optional[Any] = None,
     ):
-        self.elements: List[Element] = elements
+        """
+        cache: a `ResultCache` reusing the results of identical budgets across runs
+        """
+        self.elements: List[Element] = elements if elements is not None else []
         self.input_freq: Optional[Hz_t] = input_freq
         self.available_input_power: dBm_t = available_input_power
         self.signal_bandwidth: Hz_t = signal_bandwidth
         self.with_oip: bool = not without_oip
-        self.T_receiver: Optional[kelvin_t] = T_receiver
+        self.T_receiver: kelvin_t = T_receiver if T_receiver is not None else kelvin(290)
         self.output_freq: List[Hz_t] = []
         self.output_power: List[dBm_t] = []
         self.transducer_gain: List[dB_t] = []
@@ -74,139 +107,74 @@ class Budget:
         self.capacity: List[float] = []
         self.total_noise_temp: List[kelvin_t] = []
         self.receiver_thermal_noise_dBm: Optional[dBm_t] = None
+        self.cache: Optional[Any] = cache
         self.update()
 
     def schemdraw(
-        self, options: Optional[dict] = None, as_html_table: bool = False
+        self,
+        options: Optional[dict] = None,
+        as_html_table: bool = False,
+        renderer: str = "schemdraw",
     ) -> Any:
-        from .visualizer import into_schemdraw
+        """
+        renderer: "schemdraw" for a schemdraw Drawing, "svg" for SVG text
+        written without schemdraw nor matplotlib.
+        """
+        from .svg import render_schematic
 
-        return into_schemdraw(self.elements, options, as_html_table=as_html_table)
+        return render_schematic(
+            self.elements, options, as_html_table=as_html_table, renderer=renderer
+        )
 
-    def update(self) -> None:
-        # Use dictionnaries to ease getting default value forvfirst stage.
-        # Will be converted back to list at the end
-        output_freq_dict = {}
-        output_power_dict = {}
-        transducer_gain_dict = {}
-        f_dict = {}
-        nf_dict = {}
-        snr_dict = {}
-        capacity_dict = {}
-        oip3_dict = {}
-
-        k_boltzmann = 1.38e-23
-        if self.T_receiver is None:
-            self.T_receiver = kelvin(290)
-        receiver_thermal_noise_W = k_boltzmann * self.T_receiver * self.signal_bandwidth
-        self.receiver_thermal_noise_dBm = dBm(
-            10 * log10(receiver_thermal_noise_W * 1000)
+    def inputs(self) -> "BudgetInputs":
+        return BudgetInputs(
+            input_freq=self.input_freq,
+            available_input_power=self.available_input_power,
+            signal_bandwidth=self.signal_bandwidth,
+            with_oip=self.with_oip,
+            T_receiver=self.T_receiver,
         )
 
-        oip3_parts = []
+    def update(self) -> None:
+        if self.cache is not None:
+            from .cache import budget_hash, RESULT_FIELDS
 
-        from .elements import Modulator, ConverterType
+            key = budget_hash(self)
+            cached = self.cache.get(key)
+            if cached is not None:
+                for name, value in cached.items():
+                    setattr(self, name, value)
+                return
+        result = evaluate(self.elements, self.inputs())
+        for name, value in result._asdict().items():
+            setattr(self, name, list(value) if isinstance(value, tuple) else value)
+        if self.cache is not None:
+            self.cache.put(key, {name: getattr(self, name) for name in RESULT_FIELDS})
 
-        for stage, elt in enumerate(self.elements):
-            # Output power
-            output_power_dict[stage] = (
-                output_power_dict.get(stage - 1, self.available_input_power) + elt.gain
-            )
-            transducer_gain_dict[stage] = (
-                transducer_gain_dict.get(stage - 1, 0) + elt.gain
-            )
+    def compile(self, free: Optional[dict] = None) -> Any:
+        """
+        Specialized evaluation function of this budget, see `compile_budget`.
+        free: parameter name -> (stage, "gain" | "nf" | "oip3" | "iip2" | "loss")
+        """
+        from .compiler import compile_budget
 
-            # Noise factor & figure
-            # See http://www.diva-portal.org/smash/get/diva2:1371826/FULLTEXT01.pdf
-            # and https://en.wikipedia.org/wiki/Friis_formulas_for_noise
-            # and https://www.microwaves101.com/encyclopedias/noise-figure-one-and-two-friis-and-ieee
-            if stage == 0:
-                f_dict[stage] = 10 ** (elt.nf / 10)
-            else:
-                f_dict[stage] = f_dict[stage - 1] + (10 ** (elt.nf / 10) - 1) / (
-                    10 ** (transducer_gain_dict[stage - 1] / 10)
-                )
-            nf_dict[stage] = dB(10 * log10(f_dict[stage]))
-
-            # Output frequency
-            prev_freq = output_freq_dict.get(stage - 1, self.input_freq)
-            if prev_freq is None:
-                prev_freq = Hz(0)
-            if isinstance(elt, Modulator):
-                if elt.converter_type == ConverterType.Down:
-                    output_freq_dict[stage] = Hz_t(prev_freq - elt.lo)
-                else:
-                    output_freq_dict[stage] = Hz_t(prev_freq + elt.lo)
-            else:
-                output_freq_dict[stage] = prev_freq
-
-            # SNR
-            # See https://www.commagility.com/images/pdfs/white_papers/Introduction_to_RF_Link_Budgeting_CommAgility.pdf
-            # SNR = P_sig / P_noise
-            # P_noise = k * (T_source + T_eff) * B
-            t_eff = nf_to_temp(nf_dict[stage])
-            total_noise_W = k_boltzmann * (self.T_receiver + t_eff) * self.signal_bandwidth
-            total_noise_dBm = dBm(10 * log10(total_noise_W * 1000))
-
-            snr_dict[stage] = dB(
-                output_power_dict[stage] - total_noise_dBm - transducer_gain_dict[stage]
-            )
+        return compile_budget(self, free)
 
-            # Capacity
-            snr_linear = 10 ** (snr_dict[stage] / 10)
-            capacity_dict[stage] = self.signal_bandwidth * log2(1 + snr_linear)
+    def dynamic_range(
+        self, min_snr: dB_t = dB(0), blocker_power: Optional[dBm_t] = None
+    ) -> Any:
+        """MDS, SFDR and blocking headroom per stage, see `dynrange.dynamic_range`."""
+        from .dynrange import dynamic_range
 
-            # OIP3 partial computation
-            if self.with_oip:
-                if stage == 0:
-                    oip3_linear = (
-                        10 ** (elt.oip3 / 10) if elt.oip3 is not None else float("inf")
-                    )
-                    oip3_parts.insert(stage, oip3_linear)
-                    oip3_dict[0] = (
-                        elt.oip3 if elt.oip3 is not None else dBm(float("inf"))
-                    )
-                else:
-                    gain_linear = 10 ** (elt.gain / 10)
-                    oip3_linear = (
-                        10 ** (elt.oip3 / 10) if elt.oip3 is not None else float("inf")
-                    )
-                    oip3_parts = [gain_linear * p for p in oip3_parts]
-                    oip3_parts.insert(stage, oip3_linear)
-                    s = sum([1.0 / p for p in oip3_parts])
-                    if s == 0:
-                        oip3_dict[stage] = dBm(float("inf"))
-                    else:
-                        oip3_dict[stage] = dBm(10 * log10(1 / s))
-
-        # Convert back from dictionnary to list
-        self.output_power = [
-            dBm(output_power_dict[stage]) for stage, elt in enumerate(self.elements)
-        ]
-        self.transducer_gain = [
-            dB(transducer_gain_dict[stage]) for stage, elt in enumerate(self.elements)
-        ]
-        self.f = [float(f_dict[stage]) for stage, elt in enumerate(self.elements)]
-        self.nf = [dB(nf_dict[stage]) for stage, elt in enumerate(self.elements)]
-        self.output_freq = [
-            Hz_t(output_freq_dict[stage]) for stage, elt in enumerate(self.elements)
-        ]
-        self.snr = [dB(snr_dict[stage]) for stage, elt in enumerate(self.elements)]
-        self.capacity = [
-            float(capacity_dict[stage]) for stage, elt in enumerate(self.elements)
-        ]
-        self.total_noise_temp = [
-            kelvin(self.T_receiver + nf_to_temp(nf_dict[stage]))
-            for stage, elt in enumerate(self.elements)
-        ]
-        if self.with_oip:
-            self.oip3 = [
-                dBm(oip3_dict[stage]) for stage, elt in enumerate(self.elements)
-            ]
-            self.iip3 = [
-                dBm(self.oip3[stage] - self.transducer_gain[stage])
-                for stage, elt in enumerate(self.elements)
-            ]
+        return dynamic_range(self, min_snr=min_snr, blocker_power=blocker_power)
+
+    def with_op1db(self) -> bool:
+        return any(getattr(elt, "op1db", None) is not None for elt in self.elements)
+
+    def with_oip2(self) -> bool:
+        return self.with_oip and any(
+            getattr(elt, "oip2", None) is not None for elt in self.elements
+        )
 
     def print(self) -> None:
         print("rfbudget with properties:")
@@ -224,11 +192,23 @@ class Budget:
         print("OutputPower:     (dBm)\t", self.output_power)
         print("TransducerGain:  (dB)\t", self.transducer_gain)
         print("Noisefigure:     (dB)\t", self.nf)
+        if self.with_oip2():
+            print("IIP2:            (dBm)\t", self.iip2)
+            print("OIP2:            (dBm)\t", self.oip2)
         if self.with_oip:
             print("IIP3:            (dBm)\t", self.iip3)
             print("OIP3:            (dBm)\t", self.oip3)
         print("SNR:             (dB)\t", self.snr)
         print("ChannelCapacity: (bps)\t", self.capacity)
+        dr = self.dynamic_range()
+        print("NoiseFloor:      (dBm)\t", [float(v) for v in dr.noise_floor])
+        print("MDS:             (dBm)\t", [float(v) for v in dr.mds])
+        if self.with_oip2():
+            print("SFDR2:           (dB)\t", [float(v) for v in dr.sfdr2])
+        if self.with_oip:
+            print("SFDR3:           (dB)\t", [float(v) for v in dr.sfdr3])
+        if self.with_op1db():
+            print("BlockingHeadroom:(dB)\t", [float(v) for v in dr.blocking_headroom])
 
     def to_html(self, with_icons: bool = False, options: Optional[dict] = None) -> str:
         import io
@@ -274,11 +254,16 @@ class Budget:
         print("<h3>Analysis Results</h3>", file=html)
         print("<table>", file=html)
         if with_icons:
-            from .visualizer import into_schemdraw
+            from .svg import render_schematic
 
             print(
                 "<tr><td></td><td></td>",
-                into_schemdraw(self.elements, options, as_html_table=True),
+                render_schematic(
+                    self.elements,
+                    options,
+                    as_html_table=True,
+                    renderer=options.get("renderer", "schemdraw"),
+                ),
                 "</tr>",
                 file=html,
             )
@@ -315,6 +300,21 @@ class Budget:
                 "</tr>",
                 file=html,
             )
+        if self.with_oip2():
+            if not options.get("simplified") or options.get("with_iip"):
+                print(
+                    "<tr><td>IIP2:</td><td>(dBm)</td>",
+                    self.html_cell_format(self.iip2),
+                    "</tr>",
+                    file=html,
+                )
+            if not options.get("simplified") or options.get("with_oip"):
+                print(
+                    "<tr><td>OIP2:</td><td>(dBm)</td>",
+                    self.html_cell_format(self.oip2),
+                    "</tr>",
+                    file=html,
+                )
         if self.with_oip:
             if not options.get("simplified") or options.get("with_iip"):
                 print(
@@ -343,6 +343,22 @@ class Budget:
                 "</tr>",
                 file=html,
             )
+        if not options.get("simplified") or options.get("with_dynamic_range"):
+            dr = self.dynamic_range()
+            rows = [("NoiseFloor", "dBm", dr.noise_floor), ("MDS", "dBm", dr.mds)]
+            if self.with_oip2():
+                rows.append(("SFDR2", "dB", dr.sfdr2))
+            if self.with_oip:
+                rows.append(("SFDR3", "dB", dr.sfdr3))
+            if self.with_op1db():
+                rows.append(("BlockingHeadroom", "dB", dr.blocking_headroom))
+            for label, unit, values in rows:
+                print(
+                    "<tr><td>{}:</td><td>({})</td>".format(label, unit),
+                    self.html_cell_format(values),
+                    "</tr>",
+                    file=html,
+                )
         print("</table>", file=html)
         print("</div>\n", file=html)
         return html.getvalue()
@@ -363,3 +379,298 @@ class Budget:
         except ImportError:
             self.print()
             return None
+
+
+class BudgetInputs(NamedTuple):
+    """Inputs of a budget other than its elements"""
+
+    input_freq: Optional[Hz_t] = None
+    available_input_power: dBm_t = dBm(0)
+    signal_bandwidth: Hz_t = Hz(1)
+    with_oip: bool = True
+    T_receiver: Optional[kelvin_t] = None
+
+
+class BudgetResult(NamedTuple):
+    """
+    Immutable results of `evaluate`, one value per stage.
+    Intercept points are empty when evaluated without OIP.
+    """
+
+    output_freq: Tuple[Hz_t, ...]
+    output_power: Tuple[dBm_t, ...]
+    transducer_gain: Tuple[dB_t, ...]
+    f: Tuple[float, ...]  # noise factor
+    nf: Tuple[dB_t, ...]  # noise figure
+    iip2: Tuple[dBm_t, ...]
+    oip2: Tuple[dBm_t, ...]
+    iip3: Tuple[dBm_t, ...]
+    oip3: Tuple[dBm_t, ...]
+    snr: Tuple[dB_t, ...]
+    capacity: Tuple[float, ...]
+    total_noise_temp: Tuple[kelvin_t, ...]
+    receiver_thermal_noise_dBm: dBm_t
+
+
+def evaluate(
+    elements: Sequence[Element], inputs: BudgetInputs = BudgetInputs()
+) -> BudgetResult:
+    """
+    Friis cascade of the elements. Pure function: neither the elements nor
+    the inputs are modified, so it can run concurrently on shared elements.
+    """
+    # Use dictionnaries to ease getting default value forvfirst stage.
+    # Will be converted back to tuples at the end
+    output_freq_dict = {}
+    output_power_dict = {}
+    transducer_gain_dict = {}
+    f_dict = {}
+    nf_dict = {}
+    snr_dict = {}
+    capacity_dict = {}
+    oip3_dict = {}
+    iip2_dict = {}
+
+    k_boltzmann = K_BOLTZMANN
+    t_receiver = inputs.T_receiver if inputs.T_receiver is not None else kelvin(290)
+    receiver_thermal_noise_W = k_boltzmann * t_receiver * inputs.signal_bandwidth
+    receiver_thermal_noise_dBm = dBm(10 * log10(receiver_thermal_noise_W * 1000))
+
+    oip3_parts = []
+    # Input referred second order intercept: 1/sqrt(IIP2) = sum(sqrt(G_before / IIP2_i))
+    # (coherent worst case addition of the IM2 voltages)
+    iip2_sum = 0.0
+
+    from .elements import Modulator, ConverterType
+
+    for stage, elt in enumerate(elements):
+        # Output power
+        output_power_dict[stage] = (
+            output_power_dict.get(stage - 1, inputs.available_input_power) + elt.gain
+        )
+        transducer_gain_dict[stage] = (
+            transducer_gain_dict.get(stage - 1, 0) + elt.gain
+        )
+
+        # Noise factor & figure
+        # See http://www.diva-portal.org/smash/get/diva2:1371826/FULLTEXT01.pdf
+        # and https://en.wikipedia.org/wiki/Friis_formulas_for_noise
+        # and https://www.microwaves101.com/encyclopedias/noise-figure-one-and-two-friis-and-ieee
+        if stage == 0:
+            f_dict[stage] = 10 ** (elt.nf / 10)
+        else:
+            f_dict[stage] = f_dict[stage - 1] + (10 ** (elt.nf / 10) - 1) / (
+                10 ** (transducer_gain_dict[stage - 1] / 10)
+            )
+        nf_dict[stage] = dB(10 * log10(f_dict[stage]))
+
+        # Output frequency
+        prev_freq = output_freq_dict.get(stage - 1, inputs.input_freq)
+        if prev_freq is None:
+            prev_freq = Hz(0)
+        if isinstance(elt, Modulator):
+            if elt.converter_type == ConverterType.Down:
+                output_freq_dict[stage] = Hz_t(prev_freq - elt.lo)
+            else:
+                output_freq_dict[stage] = Hz_t(prev_freq + elt.lo)
+        else:
+            output_freq_dict[stage] = prev_freq
+
+        # SNR
+        # See https://www.commagility.com/images/pdfs/white_papers/Introduction_to_RF_Link_Budgeting_CommAgility.pdf
+        # SNR = P_sig / P_noise
+        # P_noise = k * (T_source + T_eff) * B
+        t_eff = nf_to_temp(nf_dict[stage])
+        total_noise_W = k_boltzmann * (t_receiver + t_eff) * inputs.signal_bandwidth
+        total_noise_dBm = dBm(10 * log10(total_noise_W * 1000))
+
+        snr_dict[stage] = dB(
+            output_power_dict[stage] - total_noise_dBm - transducer_gain_dict[stage]
+        )
+
+        # Capacity
+        snr_linear = 10 ** (snr_dict[stage] / 10)
+        capacity_dict[stage] = inputs.signal_bandwidth * log2(1 + snr_linear)
+
+        # OIP3 partial computation
+        if inputs.with_oip:
+            if stage == 0:
+                oip3_linear = (
+                    10 ** (elt.oip3 / 10) if elt.oip3 is not None else float("inf")
+                )
+                oip3_parts.insert(stage, oip3_linear)
+                oip3_dict[0] = (
+                    elt.oip3 if elt.oip3 is not None else dBm(float("inf"))
+                )
+            else:
+                gain_linear = 10 ** (elt.gain / 10)
+                oip3_linear = (
+                    10 ** (elt.oip3 / 10) if elt.oip3 is not None else float("inf")
+                )
+                oip3_parts = [gain_linear * p for p in oip3_parts]
+                oip3_parts.insert(stage, oip3_linear)
+                s = sum([1.0 / p for p in oip3_parts])
+                if s == 0:
+                    oip3_dict[stage] = dBm(float("inf"))
+                else:
+                    oip3_dict[stage] = dBm(10 * log10(1 / s))
+
+            # IIP2 partial computation
+            if elt.iip2 is not None:
+                gain_before = transducer_gain_dict.get(stage - 1, 0)
+                iip2_sum += sqrt(10 ** (gain_before / 10) / 10 ** (elt.iip2 / 10))
+            if iip2_sum == 0:
+                iip2_dict[stage] = dBm(float("inf"))
+            else:
+                iip2_dict[stage] = dBm(-20 * log10(iip2_sum))
+
+    # Convert back from dictionnary to tuples
+    stages = range(len(elements))
+    transducer_gain = tuple(dB(transducer_gain_dict[stage]) for stage in stages)
+    oip3: Tuple[dBm_t, ...] = ()
+    iip3: Tuple[dBm_t, ...] = ()
+    iip2: Tuple[dBm_t, ...] = ()
+    oip2: Tuple[dBm_t, ...] = ()
+    if inputs.with_oip:
+        oip3 = tuple(dBm(oip3_dict[stage]) for stage in stages)
+        iip3 = tuple(dBm(oip3[stage] - transducer_gain[stage]) for stage in stages)
+        iip2 = tuple(dBm(iip2_dict[stage]) for stage in stages)
+        oip2 = tuple(dBm(iip2[stage] + transducer_gain[stage]) for stage in stages)
+    return BudgetResult(
+        output_freq=tuple(Hz_t(output_freq_dict[stage]) for stage in stages),
+        output_power=tuple(dBm(output_power_dict[stage]) for stage in stages),
+        transducer_gain=transducer_gain,
+        f=tuple(float(f_dict[stage]) for stage in stages),
+        nf=tuple(dB(nf_dict[stage]) for stage in stages),
+        iip2=iip2,
+        oip2=oip2,
+        iip3=iip3,
+        oip3=oip3,
+        snr=tuple(dB(snr_dict[stage]) for stage in stages),
+        capacity=tuple(float(capacity_dict[stage]) for stage in stages),
+        total_noise_temp=tuple(
+            kelvin(t_receiver + nf_to_temp(nf_dict[stage])) for stage in stages
+        ),
+        receiver_thermal_noise_dBm=receiver_thermal_noise_dBm,
+    )
+
+
+class Cascade:
+    """
+    Per stage results of a vectorized cascade evaluation.
+    Arrays have the stage as first axis followed by the broadcast parameter axes.
+    """
+
+    def __init__(
+        self,
+        output_power: np.ndarray,
+        transducer_gain: np.ndarray,
+        f: np.ndarray,
+        nf: np.ndarray,
+        snr: np.ndarray,
+        capacity: np.ndarray,
+        total_noise_temp: np.ndarray,
+        oip3: np.ndarray,
+        iip3: np.ndarray,
+        oip2: np.ndarray,
+        iip2: np.ndarray,
+        receiver_thermal_noise_dBm: np.ndarray,
+    ):
+        self.output_power: np.ndarray = output_power
+        self.transducer_gain: np.ndarray = transducer_gain
+        self.f: np.ndarray = f
+        self.nf: np.ndarray = nf
+        self.snr: np.ndarray = snr
+        self.capacity: np.ndarray = capacity
+        self.total_noise_temp: np.ndarray = total_noise_temp
+        self.oip3: np.ndarray = oip3
+        self.iip3: np.ndarray = iip3
+        self.oip2: np.ndarray = oip2
+        self.iip2: np.ndarray = iip2
+        self.receiver_thermal_noise_dBm: np.ndarray = receiver_thermal_noise_dBm
+
+
+def element_columns(
+    elements: List[Element],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gain, noise figure, OIP3 and IIP2 of the elements as arrays indexed by stage.
+    Missing intercept points are infinite.
+    """
+    inf = float("inf")
+    gain = np.array([elt.gain for elt in elements], dtype=float)
+    nf = np.array([elt.nf for elt in elements], dtype=float)
+    oip3 = np.array(
+        [inf if elt.oip3 is None else elt.oip3 for elt in elements], dtype=float
+    )
+    iip2 = np.array(
+        [inf if getattr(elt, "iip2", None) is None else elt.iip2 for elt in elements],
+        dtype=float,
+    )
+    return gain, nf, oip3, iip2
+
+
+def cascade(
+    gain: np.ndarray,
+    nf: np.ndarray,
+    oip3: Optional[np.ndarray] = None,
+    iip2: Optional[np.ndarray] = None,
+    available_input_power: dBm_t = dBm(0),
+    signal_bandwidth: Hz_t = Hz(1),
+    T_receiver: kelvin_t = kelvin(290),
+) -> Cascade:
+    """
+    Friis cascade of stages evaluated on arrays, same formulas as `Budget.update`.
+    gain, nf, oip3, iip2 have the stage as first axis, all arguments broadcast
+    against each other along the remaining axes.
+    """
+    inf = float("inf")
+    if oip3 is None:
+        oip3 = inf
+    if iip2 is None:
+        iip2 = inf
+    gain, nf, oip3, iip2 = np.broadcast_arrays(
+        np.asarray(gain, dtype=float),
+        np.asarray(nf, dtype=float),
+        np.asarray(oip3, dtype=float),
+        np.asarray(iip2, dtype=float),
+    )
+    p_in = np.asarray(available_input_power, dtype=float)
+    bandwidth = np.asarray(signal_bandwidth, dtype=float)
+    t_receiver = np.asarray(T_receiver, dtype=float)
+
+    transducer_gain = np.cumsum(gain, axis=0)
+    gain_before_linear = 10 ** ((transducer_gain - gain) / 10)
+    output_power = p_in + transducer_gain
+
+    # Friis formula for noise
+    f = 1 + np.cumsum((10 ** (nf / 10) - 1) / gain_before_linear, axis=0)
+    nf_cascade = 10 * log10(f)
+    total_noise_temp = t_receiver + 290.0 * (f - 1)
+    total_noise_dBm = 10 * log10(K_BOLTZMANN * total_noise_temp * bandwidth * 1000)
+    snr = output_power - total_noise_dBm - transducer_gain
+    capacity = bandwidth * log2(1 + 10 ** (snr / 10))
+
+    # 1/IIP3 = sum(G_1..i / OIP3_i)
+    with np.errstate(divide="ignore"):
+        inv_iip3 = np.cumsum(10 ** (transducer_gain / 10) / 10 ** (oip3 / 10), axis=0)
+        iip3_cascade = -10 * log10(inv_iip3)
+        # 1/sqrt(IIP2) = sum(sqrt(G_before / IIP2_i))
+        inv_sqrt_iip2 = np.cumsum(sqrt(gain_before_linear / 10 ** (iip2 / 10)), axis=0)
+        iip2_cascade = -20 * log10(inv_sqrt_iip2)
+
+    return Cascade(
+        output_power=output_power,
+        transducer_gain=transducer_gain,
+        f=f,
+        nf=nf_cascade,
+        snr=snr,
+        capacity=capacity,
+        total_noise_temp=total_noise_temp,
+        oip3=iip3_cascade + transducer_gain,
+        iip3=iip3_cascade,
+        oip2=iip2_cascade + transducer_gain,
+        iip2=iip2_cascade,
+        receiver_thermal_noise_dBm=10
+        * log10(K_BOLTZMANN * t_receiver * bandwidth * 1000),
+    )
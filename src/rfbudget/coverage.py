@@ -0,0 +1,143 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple
+import numpy as np
+from .core import Budget
+from .physics import great_circle_distance
+from .propagation import path_loss_stage, sweep_distance
+from .utils import deg_t, dB_t, dBm_t, m_t, m
+
+
+class GeoGrid:
+    """
+    Regular latitude/longitude grid. Row 0 is the northern edge, column 0 the
+    western edge, values are taken at the pixel centers.
+    """
+
+    def __init__(
+        self,
+        lat_min: deg_t,
+        lat_max: deg_t,
+        lon_min: deg_t,
+        lon_max: deg_t,
+        rows: int,
+        cols: int,
+    ):
+        self.lat_min: deg_t = lat_min
+        self.lat_max: deg_t = lat_max
+        self.lon_min: deg_t = lon_min
+        self.lon_max: deg_t = lon_max
+        self.rows: int = rows
+        self.cols: int = cols
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.rows, self.cols)
+
+    def coordinates(
+        self, rows: slice, cols: slice
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Latitude and longitude of the pixel centers of a window."""
+        r = np.arange(self.rows)[rows]
+        c = np.arange(self.cols)[cols]
+        lat = self.lat_max - (r + 0.5) * (self.lat_max - self.lat_min) / self.rows
+        lon = self.lon_min + (c + 0.5) * (self.lon_max - self.lon_min) / self.cols
+        return np.meshgrid(lat, lon, indexing="ij")
+
+    def tiles(self, tile_size: int) -> Iterator[Tuple[slice, slice]]:
+        for r in range(0, self.rows, tile_size):
+            for c in range(0, self.cols, tile_size):
+                yield (
+                    slice(r, min(r + tile_size, self.rows)),
+                    slice(c, min(c + tile_size, self.cols)),
+                )
+
+
+class CoverageMap:
+    """
+    Rasters of the received power (dBm) and SNR (dB) at the output of the last
+    stage, and the coverage mask when thresholds are given.
+    Rasters are memory mapped `.npy` files when an output directory is used.
+    """
+
+    def __init__(
+        self,
+        grid: GeoGrid,
+        received_power: np.ndarray,
+        snr: np.ndarray,
+        mask: Optional[np.ndarray] = None,
+    ):
+        self.grid: GeoGrid = grid
+        self.received_power: np.ndarray = received_power
+        self.snr: np.ndarray = snr
+        self.mask: Optional[np.ndarray] = mask
+
+    def coverage_ratio(self) -> float:
+        if self.mask is None:
+            raise ValueError("Expected a coverage map computed with a threshold")
+        return float(np.mean(self.mask))
+
+
+def _raster(
+    output_dir: Optional[str], name: str, shape: Tuple[int, int], dtype: type
+) -> np.ndarray:
+    if output_dir is None:
+        return np.empty(shape, dtype=dtype)
+    return np.lib.format.open_memmap(
+        os.path.join(output_dir, name + ".npy"), mode="w+", dtype=dtype, shape=shape
+    )
+
+
+def coverage_map(
+    budget: Budget,
+    grid: GeoGrid,
+    tx_lat: deg_t,
+    tx_lon: deg_t,
+    output_dir: Optional[str] = None,
+    tile_size: int = 512,
+    workers: Optional[int] = None,
+    snr_threshold: Optional[dB_t] = None,
+    power_threshold: Optional[dBm_t] = None,
+    min_distance: m_t = m(1),
+    dtype: type = np.float32,
+) -> CoverageMap:
+    """
+    Coverage of a transmitter over a geographic grid.
+
+    The budget describes the link with its propagation model (e.g.
+    `FreeSpacePathLossFriis`, `OkumuraHataPathLoss`, `CostHataPathLoss`);
+    the distance of that model is replaced by the distance of every pixel.
+    Pixels are evaluated by tiles in a thread pool, which bounds memory use;
+    results are written in place, to memory mapped rasters in `output_dir` if given.
+    Outside of their validity range the statistical models are extrapolated.
+    """
+    stage = path_loss_stage(budget.elements)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+    received_power = _raster(output_dir, "received_power", grid.shape, dtype)
+    snr = _raster(output_dir, "snr", grid.shape, dtype)
+    with_mask = snr_threshold is not None or power_threshold is not None
+    mask = _raster(output_dir, "coverage", grid.shape, np.bool_) if with_mask else None
+
+    def run(window: Tuple[slice, slice]) -> None:
+        lat, lon = grid.coordinates(*window)
+        distance = np.maximum(great_circle_distance(tx_lat, tx_lon, lat, lon), min_distance)
+        result = sweep_distance(budget, distance, stage)
+        received_power[window] = result.output_power[-1]
+        snr[window] = result.snr[-1]
+        if mask is not None:
+            covered = np.ones(distance.shape, dtype=bool)
+            if snr_threshold is not None:
+                covered &= result.snr[-1] >= snr_threshold
+            if power_threshold is not None:
+                covered &= result.output_power[-1] >= power_threshold
+            mask[window] = covered
+
+    # NumPy releases the GIL in the vector kernels, threads are enough.
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(run, grid.tiles(tile_size)))
+
+    for raster in (received_power, snr, mask):
+        if isinstance(raster, np.memmap):
+            raster.flush()
+    return CoverageMap(grid, received_power, snr, mask)
@@ -0,0 +1,114 @@
+from typing import Any, List, Optional
+import numpy as np
+from .core import Element, K_BOLTZMANN
+from .utils import Hz_t, dB_t, dBm_t
+
+
+class DynamicRange:
+    """
+    Input referred dynamic range at the output of each stage.
+    Arrays have the stage as first axis followed by the broadcast axes of the
+    results and of the bandwidth.
+    """
+
+    def __init__(
+        self,
+        noise_floor: np.ndarray,
+        mds: np.ndarray,
+        sfdr3: np.ndarray,
+        sfdr2: np.ndarray,
+        ip1db: np.ndarray,
+        blocking_headroom: np.ndarray,
+    ):
+        self.noise_floor: np.ndarray = noise_floor  # dBm in the bandwidth
+        self.mds: np.ndarray = mds  # minimum detectable signal (dBm)
+        self.sfdr3: np.ndarray = sfdr3  # dB
+        self.sfdr2: np.ndarray = sfdr2  # dB
+        self.ip1db: np.ndarray = ip1db  # input 1dB compression point (dBm)
+        self.blocking_headroom: np.ndarray = blocking_headroom  # dB
+
+
+def op1db_column(elements: List[Element]) -> np.ndarray:
+    """Output 1dB compression points of the elements, infinite when not given."""
+    return np.array(
+        [
+            float("inf") if getattr(elt, "op1db", None) is None else elt.op1db
+            for elt in elements
+        ],
+        dtype=float,
+    )
+
+
+def _stage_first(values: Any, ndim: int) -> np.ndarray:
+    """Array with the stage as first axis, padded after it to ndim axes."""
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return values
+    return values.reshape(values.shape[:1] + (1,) * (ndim - values.ndim) + values.shape[1:])
+
+
+def dynamic_range(
+    result: Any,
+    signal_bandwidth: Optional[Hz_t] = None,
+    op1db: Optional[np.ndarray] = None,
+    min_snr: dB_t = dB_t(0),
+    blocker_power: Optional[dBm_t] = None,
+) -> DynamicRange:
+    """
+    Dynamic range from the results of a cascade: a `Budget`, a `BudgetResult`
+    or a vectorized `Cascade`.
+    - noise floor: k.T.B with T the total noise temperature (T_receiver plus
+      the noise of the stages)
+    - MDS: noise floor plus the SNR required by the demodulator (min_snr)
+    - SFDR3 = 2/3 (IIP3 - noise floor), SFDR2 = 1/2 (IIP2 - noise floor)
+    - blocking headroom: input 1dB compression point minus the blocker power
+      (the available input power of a budget by default)
+    signal_bandwidth defaults to the one of a budget and broadcasts against
+    the axes following the stage, so that arrays of bandwidths and of
+    configurations are evaluated at once.
+    op1db: output 1dB compression point per stage (first axis), taken from
+    the elements of a budget by default. Infinite values are ignored.
+    """
+    if signal_bandwidth is None:
+        signal_bandwidth = getattr(result, "signal_bandwidth", None)
+        if signal_bandwidth is None:
+            raise ValueError("Expected a signal bandwidth")
+    if op1db is None:
+        elements = getattr(result, "elements", None)
+        op1db = op1db_column(elements) if elements is not None else float("inf")
+    if blocker_power is None:
+        blocker_power = getattr(result, "available_input_power", None)
+
+    bandwidth = np.asarray(signal_bandwidth, dtype=float)
+    ndim = max(np.ndim(result.total_noise_temp), bandwidth.ndim + 1)
+    temp = _stage_first(result.total_noise_temp, ndim)
+    gain = _stage_first(result.transducer_gain, ndim)
+    noise_floor = 10 * np.log10(K_BOLTZMANN * temp * bandwidth * 1000)
+    shape = noise_floor.shape
+
+    def referred(intercept: Any, factor: float) -> np.ndarray:
+        intercept = _stage_first(intercept, ndim)
+        if intercept.size == 0:
+            # Intercept points not computed by the budget
+            return np.full(shape, np.nan)
+        return factor * (intercept - noise_floor)
+
+    # 1/IP1dB = sum(G_1..i / OP1dB_i)
+    op1db = np.asarray(op1db, dtype=float)
+    if op1db.ndim > 0:
+        op1db = _stage_first(op1db, ndim)
+    with np.errstate(divide="ignore"):
+        inv = np.cumsum(10 ** ((gain - op1db) / 10), axis=0)
+        ip1db = np.broadcast_to(-10 * np.log10(inv), shape)
+    if blocker_power is None:
+        headroom = np.full(shape, np.nan)
+    else:
+        headroom = ip1db - np.asarray(blocker_power, dtype=float)
+    return DynamicRange(
+        noise_floor,
+        noise_floor + np.asarray(min_snr, dtype=float),
+        referred(result.iip3, 2 / 3),
+        referred(result.iip2, 1 / 2),
+        ip1db,
+        headroom,
+    )
@@ -1,9 +1,28 @@
-from typing import Optional, Any
+from typing import Optional, Any, Union
+import numpy as np
 from .core import Element
-from .utils import Hz_t, dB_t, dBm_t, dB, Hz, m_t, loss_temp_to_nf, kelvin_t
+from .pattern import AntennaPattern
+from .cable import CableType, cable_noise_figure, cable_type as get_cable_type
+from .compression import CompressionModel, compression_points
+from .utils import (
+    Hz_t,
+    dB_t,
+    dBm_t,
+    dB,
+    Hz,
+    m_t,
+    loss_temp_to_nf,
+    kelvin_t,
+    REFERENCE_TEMPERATURE,
+)
 
 
 class Antenna(Element):
+    """
+    With a `pattern`, the gain is the one of the pattern towards `azimuth` and
+    `elevation` (degrees relative to the boresight) instead of `gain`.
+    """
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -12,11 +31,35 @@ class Antenna(Element):
         iip3: Optional[dBm_t] = None,
         oip3: Optional[dBm_t] = None,
         z: float = 50,
+        pattern: Optional[AntennaPattern] = None,
+        azimuth: float = 0,
+        elevation: float = 0,
     ):
+        if pattern is not None:
+            gain = dB(float(pattern.gain_at(azimuth, elevation)))
         Element.__init__(
             self, name=name or "Antenna", gain=gain, nf=nf, iip3=iip3, oip3=oip3
         )
         self.z: float = z
+        self.pattern: Optional[AntennaPattern] = pattern
+        self.azimuth: float = azimuth
+        self.elevation: float = elevation
+
+    def point(self, azimuth: float, elevation: float) -> None:
+        """Update the gain towards a new direction relative to the boresight."""
+        if self.pattern is None:
+            raise ValueError("Antenna {} has no pattern".format(self.name))
+        self.azimuth = azimuth
+        self.elevation = elevation
+        self.gain = dB(float(self.pattern.gain_at(azimuth, elevation)))
+
+    def gain_towards(self, azimuth: Any, elevation: Any) -> Any:
+        """Gain (dBi) towards arrays of directions, `gain` everywhere without pattern."""
+        if self.pattern is None:
+            return np.broadcast_to(
+                float(self.gain), np.broadcast_shapes(np.shape(azimuth), np.shape(elevation))
+            )
+        return self.pattern.gain_at(azimuth, elevation)
 
     def schemdraw(self, d: Any, options: dict) -> Any:
         from .visualizer import draw_element
@@ -25,8 +68,93 @@ class Antenna(Element):
 
 
 class NPort(Element):
-    def __init__(self):
-        pass
+    """
+    Passive element with several input or output ports, evaluated by a
+    `BudgetGraph`. `port_gains()` gives the power gain (dB) from each input to
+    each output. Signals reaching several inputs come from the same source, so
+    they add in amplitude (in phase) when `coherent`, else in power. Noise of
+    a shared origin adds like the signal, independent noises add in power. The
+    network adds the thermal noise of its losses at the physical temperature
+    `temp` (290 K by default), correlated between the outputs when `coherent`.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        gains: Any = ((0.0,),),
+        temp: Optional[kelvin_t] = None,
+        coherent: bool = True,
+    ):
+        self.gains: np.ndarray = np.atleast_2d(np.asarray(gains, dtype=float))
+        if np.any(self.gains > 0):
+            raise ValueError("Expected a passive network")
+        Element.__init__(
+            self,
+            name=name or "NPort",
+            gain=dB(float(self.gains[0, 0])),
+            nf=dB(float(-self.gains[0, 0])),
+            temp=None,
+        )
+        self.temp: Optional[kelvin_t] = temp
+        self.coherent: bool = coherent
+
+    @property
+    def inputs(self) -> int:
+        return self.gains.shape[0]
+
+    @property
+    def outputs(self) -> int:
+        return self.gains.shape[1]
+
+    def port_gains(self) -> np.ndarray:
+        return self.gains
+
+
+class Splitter(NPort):
+    """
+    Power splitter from one input to `outputs` ports, equal or with the given
+    power `ratios`, plus an insertion loss (dB) on every branch.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        outputs: int = 2,
+        insertion_loss: dB_t = dB(0),
+        ratios: Optional[Any] = None,
+        temp: Optional[kelvin_t] = None,
+    ):
+        if ratios is None:
+            ratios = np.ones(outputs)
+        ratios = np.asarray(ratios, dtype=float)
+        if ratios.shape != (outputs,) or np.any(ratios <= 0):
+            raise ValueError("Expected one positive ratio per output")
+        self.insertion_loss: dB_t = insertion_loss
+        gains = 10 * np.log10(ratios / ratios.sum()) - insertion_loss
+        NPort.__init__(self, name=name or "Splitter", gains=gains[None, :], temp=temp)
+
+
+class Combiner(NPort):
+    """
+    Combiner of `inputs` ports into one, each input reaching the output with
+    1/inputs of its power (as a Wilkinson combiner) less the insertion loss.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        inputs: int = 2,
+        insertion_loss: dB_t = dB(0),
+        coherent: bool = True,
+        temp: Optional[kelvin_t] = None,
+    ):
+        if inputs < 1:
+            raise ValueError("Expected at least one input")
+        self.insertion_loss: dB_t = insertion_loss
+        gains = np.full((inputs, 1), -10 * np.log10(inputs) - insertion_loss)
+        NPort.__init__(
+            self, name=name or "Combiner", gains=gains, temp=temp, coherent=coherent
+        )
 
 
 class TwoPortsElement(Element):
@@ -39,8 +167,19 @@ class TwoPortsElement(Element):
         oip3: Optional[dBm_t] = None,
         z_in: float = 50,
         z_out: float = 50,
+        iip2: Optional[dBm_t] = None,
+        oip2: Optional[dBm_t] = None,
     ):
-        Element.__init__(self, name=name, gain=gain, nf=nf, iip3=iip3, oip3=oip3)
+        Element.__init__(
+            self,
+            name=name,
+            gain=gain,
+            nf=nf,
+            iip3=iip3,
+            oip3=oip3,
+            iip2=iip2,
+            oip2=oip2,
+        )
         self.z_in: float = z_in
         self.z_out: float = z_out
 
@@ -55,7 +194,22 @@ class Amplifier(TwoPortsElement):
         oip3: Optional[dBm_t] = None,
         z_in: float = 50,
         z_out: float = 50,
+        iip2: Optional[dBm_t] = None,
+        oip2: Optional[dBm_t] = None,
+        op1db: Optional[dBm_t] = None,
+        psat: Optional[dBm_t] = None,
+        compression: str = CompressionModel.Rapp,
+        smoothness: float = 2.0,
+        gain_tc: float = 0.0,
+        nf_tc: float = 0.0,
+        temp_ref: kelvin_t = REFERENCE_TEMPERATURE,
     ):
+        """
+        op1db, psat: output 1dB compression point or saturated output power,
+        used by the AM/AM compression model of a power sweep.
+        gain_tc, nf_tc: drift of the gain and noise figure (dB/K) from their
+        values at the physical temperature temp_ref, used by temperature sweeps.
+        """
         TwoPortsElement.__init__(
             self,
             name=name or "LNA",
@@ -65,7 +219,15 @@ class Amplifier(TwoPortsElement):
             oip3=oip3,
             z_in=z_in,
             z_out=z_out,
+            iip2=iip2,
+            oip2=oip2,
         )
+        self.compression: str = compression
+        self.smoothness: float = smoothness
+        self.op1db, self.psat = compression_points(compression, op1db, psat, smoothness)
+        self.gain_tc: float = gain_tc
+        self.nf_tc: float = nf_tc
+        self.temp_ref: kelvin_t = temp_ref
 
     def schemdraw(self, d: Any, options: dict) -> Any:
         from .visualizer import draw_element
@@ -82,7 +244,19 @@ class Loss(TwoPortsElement):
         oip3: Optional[dBm_t] = None,
         z_in: float = 50,
         z_out: float = 50,
+        loss_tc: float = 0.0,
+        temp_ref: kelvin_t = REFERENCE_TEMPERATURE,
     ):
+        """
+        temp: physical temperature of the noise figure, which equals the loss
+        when omitted (290 K).
+        loss_tc: relative change of the loss per kelvin from its value at the
+        physical temperature temp_ref, used by temperature sweeps.
+        """
+        self.loss: dB_t = loss
+        self.temp: Optional[kelvin_t] = temp
+        self.loss_tc: float = loss_tc
+        self.temp_ref: kelvin_t = temp_ref
         if temp is not None:
             nf = loss_temp_to_nf(loss, temp)
         else:
@@ -118,6 +292,11 @@ class PathLoss(Loss):
 
 
 class Cable(Loss):
+    """
+    Loss of `length` times `loss_per_m`, or with a `cable_type` (a `CableType`
+    or the name of one of `CABLES`) the loss of the cable at `freq`.
+    """
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -127,7 +306,20 @@ class Cable(Loss):
         oip3: Optional[dBm_t] = None,
         z_in: float = 50,
         z_out: float = 50,
+        cable_type: Optional[Union[CableType, str]] = None,
+        freq: Hz_t = Hz(0),
+        loss_tc: float = 0.0,
+        temp_ref: kelvin_t = REFERENCE_TEMPERATURE,
     ):
+        self.cable_type: Optional[CableType] = None
+        if cable_type is not None:
+            if not freq > 0:
+                raise ValueError("Expected a positive frequency with a cable type")
+            self.cable_type = get_cable_type(cable_type)
+            loss_per_m = dB(float(self.cable_type.loss_per_m(freq)))
+        self.length: m_t = length
+        self.loss_per_m: dB_t = loss_per_m
+        self.freq: Hz_t = freq
         Loss.__init__(
             self,
             name=name or "Cable",
@@ -136,8 +328,28 @@ class Cable(Loss):
             oip3=oip3,
             z_in=z_in,
             z_out=z_out,
+            loss_tc=loss_tc,
+            temp_ref=temp_ref,
         )
 
+    def loss_at(self, freq: Hz_t, length: Optional[m_t] = None) -> dB_t:
+        """Loss (dB) broadcast over arrays of frequencies and lengths."""
+        if length is None:
+            length = self.length
+        if self.cable_type is None:
+            # Same loss at every frequency
+            loss = self.loss_per_m * np.asarray(length, dtype=float)
+            return dB_t(loss + np.zeros(np.shape(freq)))
+        return self.cable_type.loss_at(freq, length)
+
+    def nf_at(
+        self, freq: Hz_t, length: Optional[m_t] = None, temp: Optional[kelvin_t] = None
+    ) -> dB_t:
+        """Noise figure (dB) at a physical temperature, broadcast over arrays."""
+        if temp is None:
+            temp = self.temp
+        return cable_noise_figure(self.loss_at(freq, length), temp)
+
 
 class ConverterType:
     Down = "Down"
@@ -153,10 +365,26 @@ class Modulator(TwoPortsElement):
         oip3: Optional[dBm_t] = None,
         lo: Hz_t = Hz(0),
         converter_type: str = "",
+        iip2: Optional[dBm_t] = None,
+        oip2: Optional[dBm_t] = None,
+        op1db: Optional[dBm_t] = None,
+        psat: Optional[dBm_t] = None,
+        compression: str = CompressionModel.Rapp,
+        smoothness: float = 2.0,
+        gain_tc: float = 0.0,
+        nf_tc: float = 0.0,
+        temp_ref: kelvin_t = REFERENCE_TEMPERATURE,
     ):
+        """gain_tc, nf_tc, temp_ref: temperature drift, as for `Amplifier`."""
         TwoPortsElement.__init__(
-            self, name=name or "Mixer", gain=gain, nf=nf, oip3=oip3
+            self, name=name or "Mixer", gain=gain, nf=nf, oip3=oip3, iip2=iip2, oip2=oip2
         )
+        self.compression: str = compression
+        self.smoothness: float = smoothness
+        self.op1db, self.psat = compression_points(compression, op1db, psat, smoothness)
+        self.gain_tc: float = gain_tc
+        self.nf_tc: float = nf_tc
+        self.temp_ref: kelvin_t = temp_ref
         self.lo: Hz_t = lo
         assert converter_type is not None
         self.converter_type: str = converter_type
@@ -0,0 +1,267 @@
+import threading
+import traceback
+import warnings
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .core import Budget, Element
+from .svg import render_schematic
+from .utils import Hz, loss_temp_to_nf
+from .variants import STAGE_FIELDS, CascadeNode, advance, stage_results
+
+# Parameters of an element that can be bound to a slider, "loss" sets the
+# gain to -loss and the noise figure to loss like a passive `Loss`.
+PARAMETERS = ("gain", "nf", "oip3", "iip2", "loss")
+
+# Rows of the explorer table: attribute, label, unit
+ROWS = (
+    ("output_power", "OutputPower", "dBm"),
+    ("transducer_gain", "TransducerGain", "dB"),
+    ("nf", "Noisefigure", "dB"),
+    ("iip3", "IIP3", "dBm"),
+    ("oip3", "OIP3", "dBm"),
+    ("snr", "SNR", "dB"),
+)
+
+# Symbols kept by `icon_html`, the least recently used ones are dropped
+ICON_CACHE_SIZE = 256
+_icons: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+_icons_lock = threading.Lock()
+
+
+def icon_html(elt: Element, options: Optional[dict] = None) -> str:
+    """
+    Schematic symbol of an element as an HTML table cell. Symbols only show
+    the type and name of the element with simplified options, so they are
+    drawn once per (type, name) and reused, up to ICON_CACHE_SIZE symbols.
+    """
+    options = dict(options or {})
+    options.setdefault("simplified", True)
+    renderer = options.pop("renderer", "schemdraw")
+    if not options["simplified"]:
+        return render_schematic([elt], options, True, renderer)
+    key = (type(elt).__qualname__, elt.name, repr(sorted(options.items())) + renderer)
+    with _icons_lock:
+        if key in _icons:
+            _icons.move_to_end(key)
+            return _icons[key]
+    icon = render_schematic([elt], options, True, renderer)
+    with _icons_lock:
+        _icons[key] = icon
+        if len(_icons) > ICON_CACHE_SIZE:
+            _icons.popitem(last=False)
+    return icon
+
+
+def _overrides(elt: Element, parameter: str, value: float) -> Dict[str, float]:
+    """Values replacing the parameters of an element for a slider value."""
+    if parameter == "loss":
+        temp = getattr(elt, "temp", None)
+        nf = value if temp is None else float(loss_temp_to_nf(value, temp))
+        return {"gain": -value, "nf": nf}
+    if parameter in ("gain", "nf", "oip3", "iip2"):
+        # The output intercept points are kept when the gain changes
+        return {parameter: value}
+    raise ValueError("Unexpected parameter: {}".format(parameter))
+
+
+class BudgetExplorer:
+    """
+    Interactive view of a budget. Parameter changes are debounced, then only
+    the stages from the first modified one are recomputed from the cached
+    cumulative state of the previous stage, and only the table cells whose
+    value changed are reported to `on_change` as {(attribute, stage): value}.
+    Parameter values are kept per stage by the explorer and the elements of
+    the budget are left unchanged; the budget result lists are kept up to
+    date in place with the explorer values.
+    Errors of the debounced updates are stored in `error` and reported to
+    `on_error`, or as warnings.
+    The logic is independent of Jupyter; `widget()` builds the ipywidgets view.
+    """
+
+    def __init__(
+        self,
+        budget: Budget,
+        debounce: float = 0.1,
+        on_change: Optional[Callable[[Dict[Tuple[str, int], float]], None]] = None,
+        on_error: Optional[Callable[[str], None]] = None,
+    ):
+        self.budget: Budget = budget
+        self.debounce: float = debounce
+        self.on_change: Optional[Callable[[Dict[Tuple[str, int], float]], None]] = on_change
+        self.on_error: Optional[Callable[[str], None]] = on_error
+        self.error: Optional[str] = None  # traceback of the last failed update
+        self.recomputed_stages: int = 0
+        self._root = CascadeNode(None, None)
+        self._nodes: List[CascadeNode] = []
+        parent = self._root
+        for elt in budget.elements:
+            parent = CascadeNode(elt, parent)
+            self._nodes.append(parent)
+        self._overrides: List[Dict[str, float]] = [{} for _ in self._nodes]
+        self._pending: Dict[Tuple[int, str], float] = {}
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._recompute(0)
+
+    def _recompute(self, first: int) -> Dict[Tuple[str, int], float]:
+        b = self.budget
+        self._root.power = b.available_input_power
+        self._root.freq = b.input_freq if b.input_freq is not None else Hz(0)
+        changed = {}
+        for stage in range(first, len(self._nodes)):
+            node = self._nodes[stage]
+            advance(node, node.parent, self._overrides[stage])
+            values = stage_results(node, b.T_receiver, b.signal_bandwidth)
+            for name, value in zip(STAGE_FIELDS, values):
+                column = getattr(b, name)
+                if len(column) <= stage:
+                    # Intercept points are not computed without OIP
+                    continue
+                if column[stage] != value:
+                    column[stage] = value
+                    changed[(name, stage)] = value
+        self.recomputed_stages += len(self._nodes) - first
+        return changed
+
+    def set(self, stage: int, parameter: str, value: float) -> None:
+        """Request a parameter change, applied after the debounce delay."""
+        if parameter not in PARAMETERS:
+            raise ValueError("Unexpected parameter: {}".format(parameter))
+        n = len(self._nodes)
+        if not -n <= stage < n:
+            raise ValueError("Unexpected stage: {}".format(stage))
+        with self._lock:
+            self._pending[(stage % n, parameter)] = value
+            if self._timer is not None:
+                self._timer.cancel()
+            if self.debounce > 0:
+                self._timer = threading.Timer(self.debounce, self._flush_later)
+                self._timer.daemon = True
+                self._timer.start()
+        if self.debounce <= 0:
+            self.flush()
+
+    def flush(self) -> Dict[Tuple[str, int], float]:
+        """Apply the pending changes now and return the changed cells."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not pending:
+                return {}
+            for (stage, parameter), value in pending.items():
+                elt = self.budget.elements[stage]
+                self._overrides[stage].update(_overrides(elt, parameter, value))
+            changed = self._recompute(min(stage for stage, _ in pending))
+        if changed and self.on_change is not None:
+            self.on_change(changed)
+        return changed
+
+    def _flush_later(self) -> None:
+        """Debounced update in the timer thread, whose errors would be lost."""
+        try:
+            self.flush()
+            self.error = None
+        except Exception:
+            self.error = traceback.format_exc()
+            if self.on_error is not None:
+                self.on_error(self.error)
+            else:
+                warnings.warn("Budget explorer update failed:\n" + self.error)
+
+    def value(self, stage: int, parameter: str) -> Optional[float]:
+        """Current value of a parameter of a stage, the one of the element by default."""
+        if parameter not in PARAMETERS:
+            raise ValueError("Unexpected parameter: {}".format(parameter))
+        elt = self.budget.elements[stage]
+        values = self._overrides[stage]
+        if parameter == "loss":
+            return -values.get("gain", elt.gain)
+        return values.get(parameter, getattr(elt, parameter, None))
+
+    @staticmethod
+    def cell_id(name: str, stage: int) -> str:
+        return "rfbudget-{}-{}".format(name, stage)
+
+    @staticmethod
+    def cell_format(value: Optional[float]) -> str:
+        return "{0:.2f}".format(value) if value is not None else ""
+
+    def to_html(self, with_icons: bool = False, options: Optional[dict] = None) -> str:
+        """Result table whose cells are identified by `cell_id`."""
+        lines = ["<table>"]
+        if with_icons:
+            icons = "".join(icon_html(elt, options) for elt in self.budget.elements)
+            lines.append("<tr><td></td><td></td>{}</tr>".format(icons))
+        for name, label, unit in ROWS:
+            column = getattr(self.budget, name)
+            if not column:
+                continue
+            cells = "".join(
+                '<td id="{}">{}</td>'.format(self.cell_id(name, stage), self.cell_format(v))
+                for stage, v in enumerate(column)
+            )
+            lines.append("<tr><td>{}:</td><td>({})</td>{}</tr>".format(label, unit, cells))
+        lines.append("</table>")
+        return "\n".join(lines)
+
+    def widget(
+        self,
+        sliders: Dict[str, Tuple[int, str, float, float]],
+        with_icons: bool = True,
+        options: Optional[dict] = None,
+    ) -> Any:
+        """
+        ipywidgets view: sliders bound to element parameters and a grid of
+        result cells updated in place.
+        sliders: label -> (stage, parameter, min, max)
+        """
+        try:
+            import ipywidgets
+        except ImportError:
+            raise ImportError("The interactive explorer requires ipywidgets")
+
+        n = len(self.budget.elements)
+        cells: Dict[Tuple[str, int], Any] = {}
+        grid = []
+        if with_icons:
+            grid += [ipywidgets.HTML(""), ipywidgets.HTML("")]
+            grid += [ipywidgets.HTML(icon_html(elt, options)) for elt in self.budget.elements]
+        for name, label, unit in ROWS:
+            column = getattr(self.budget, name)
+            if not column:
+                continue
+            grid += [ipywidgets.HTML(label), ipywidgets.HTML("({})".format(unit))]
+            for stage, value in enumerate(column):
+                cells[(name, stage)] = ipywidgets.HTML(self.cell_format(value))
+                grid.append(cells[(name, stage)])
+        table = ipywidgets.GridBox(
+            grid,
+            layout=ipywidgets.Layout(
+                grid_template_columns="repeat({}, auto)".format(n + 2)
+            ),
+        )
+
+        def update(changed: Dict[Tuple[str, int], float]) -> None:
+            for key, value in changed.items():
+                if key in cells:
+                    cells[key].value = self.cell_format(value)
+
+        self.on_change = update
+        controls = []
+        for label, (stage, parameter, low, high) in sliders.items():
+            value = self.value(stage, parameter)
+            slider = ipywidgets.FloatSlider(
+                value=value if value is not None else low,
+                min=low,
+                max=high,
+                description=label,
+                continuous_update=True,
+            )
+            slider.observe(
+                lambda change, s=stage, p=parameter: self.set(s, p, change["new"]),
+                names="value",
+            )
+            controls.append(slider)
+        return ipywidgets.VBox(controls + [table])
@@ -0,0 +1,138 @@
+import hashlib
+import os
+import shutil
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .cache import _feed, element_hash
+from .core import Element
+
+
+class ExportResult:
+    """Outcome of the export of one diagram of a batch"""
+
+    def __init__(self, path: str, key: str):
+        self.path: str = path
+        self.key: str = key  # `diagram_hash`
+        self.seconds: float = 0.0  # rendering time, shared by identical diagrams
+        self.error: Optional[str] = None
+        # True when the file was rendered successfully, False when it is a copy
+        # of an identical diagram of the batch or when rendering failed
+        self.rendered: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else "failed"
+        return "ExportResult({!r}, {}, {:.3f}s)".format(self.path, status, self.seconds)
+
+
+def diagram_hash(
+    elements: List[Element], options: Optional[dict] = None, renderer: str = "schemdraw"
+) -> str:
+    """Content hash of everything a schematic depends on."""
+    h = hashlib.sha256()
+    _feed(h, [renderer, [element_hash(elt) for elt in elements], options or {}])
+    return h.hexdigest()
+
+
+def _init_worker(renderer: str, worker: bool = True) -> None:
+    """
+    Import the drawing libraries once per process. Pool workers switch
+    matplotlib to the non interactive Agg backend; the backend of the calling
+    process is left unchanged.
+    """
+    if renderer == "schemdraw":
+        if worker:
+            import matplotlib
+
+            matplotlib.use("Agg")
+        from . import visualizer  # noqa: F401
+
+
+def _render(
+    elements: List[Element], options: Optional[dict], renderer: str, paths: List[str]
+) -> Tuple[float, List[Optional[str]]]:
+    """
+    Render a diagram to the first path and copy it to the others.
+    Return the rendering time and the error of each path.
+    """
+    from .svg import render_schematic
+
+    start = time.perf_counter()
+    try:
+        drawing = render_schematic(elements, dict(options or {}), renderer=renderer)
+        if renderer == "svg":
+            with open(paths[0], "w") as f:
+                f.write(drawing)
+        else:
+            drawing.save(paths[0])
+    except Exception:
+        return time.perf_counter() - start, [traceback.format_exc()] * len(paths)
+    seconds = time.perf_counter() - start
+    errors: List[Optional[str]] = [None]
+    for path in paths[1:]:
+        try:
+            shutil.copyfile(paths[0], path)
+            errors.append(None)
+        except OSError:
+            errors.append(traceback.format_exc())
+    return seconds, errors
+
+
+def export_schematics(
+    jobs: Iterable[Tuple[Any, str]],
+    options: Optional[dict] = None,
+    renderer: str = "schemdraw",
+    workers: Optional[int] = None,
+) -> List[ExportResult]:
+    """
+    Render the schematics of many budgets (or element lists) to files across
+    a process pool. Workers import schemdraw and matplotlib once; identical
+    diagrams (same `diagram_hash`) are rendered once and copied.
+    A failing diagram is reported in its `ExportResult` and does not abort
+    the batch. With workers=0, diagrams are rendered in this process.
+    Return the results in the order of the jobs.
+    """
+    if renderer not in ("schemdraw", "svg"):
+        raise ValueError("Unexpected renderer: {}".format(renderer))
+    results: List[ExportResult] = []
+    groups: Dict[str, Tuple[List[Element], List[ExportResult]]] = {}
+    for source, path in jobs:
+        elements = list(getattr(source, "elements", source))
+        key = diagram_hash(elements, options, renderer)
+        result = ExportResult(os.fspath(path), key)
+        results.append(result)
+        groups.setdefault(key, (elements, []))[1].append(result)
+    if not groups:
+        return results
+
+    def finish(group: List[ExportResult], seconds: float, errors: List[Optional[str]]) -> None:
+        for i, (result, error) in enumerate(zip(group, errors)):
+            result.seconds = seconds
+            result.error = error
+            result.rendered = i == 0 and error is None
+
+    if workers == 0:
+        _init_worker(renderer, worker=False)
+        for elements, group in groups.values():
+            finish(group, *_render(elements, options, renderer, [r.path for r in group]))
+        return results
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(renderer,)
+    ) as pool:
+        futures = [
+            (pool.submit(_render, elements, options, renderer, [r.path for r in group]), group)
+            for elements, group in groups.values()
+        ]
+        for future, group in futures:
+            try:
+                finish(group, *future.result())
+            except Exception:
+                # Unpicklable diagram or crashed worker
+                finish(group, 0.0, [traceback.format_exc()] * len(group))
+    return results
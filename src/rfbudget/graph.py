@@ -0,0 +1,305 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from numpy import log10, sqrt
+from .core import Element, K_BOLTZMANN
+from .elements import ConverterType, Modulator, NPort
+from .utils import Hz_t, dB_t, dBm_t, kelvin_t, dB, dBm, Hz, kelvin
+
+# Name of the source node of a `BudgetGraph`
+INPUT = "input"
+
+Port = Union[str, Tuple[str, int]]
+
+
+class _PortState:
+    """
+    Absolute signal power (mW) at an output port, and noise as the amplitudes
+    (sqrt(mW)) of its independent origins: the source and each noisy stage.
+    Noise of the same origin reaching a combiner through several branches is
+    correlated and adds like the signal.
+    """
+
+    def __init__(
+        self, signal: float, noise: Dict[Tuple[str, int], float], im3: float, freq: Hz_t
+    ):
+        self.signal: float = signal
+        self.noise: Dict[Tuple[str, int], float] = noise
+        # Amplitude of the third order products, P_out^1.5 / OIP3 along a chain
+        self.im3: float = im3
+        self.freq: Hz_t = freq
+
+    @property
+    def noise_power(self) -> float:
+        return float(sum(a * a for a in self.noise.values()))
+
+
+class NodeResult:
+    """Results at an output port of a node of a `BudgetGraph`"""
+
+    def __init__(
+        self,
+        output_freq: Hz_t,
+        output_power: dBm_t,
+        noise_power: dBm_t,
+        transducer_gain: dB_t,
+        nf: dB_t,
+        snr: dB_t,
+        oip3: dBm_t,
+        iip3: dBm_t,
+    ):
+        self.output_freq: Hz_t = output_freq
+        self.output_power: dBm_t = output_power
+        self.noise_power: dBm_t = noise_power  # in the signal bandwidth
+        self.transducer_gain: dB_t = transducer_gain
+        self.nf: dB_t = nf
+        self.snr: dB_t = snr
+        self.oip3: dBm_t = oip3
+        self.iip3: dBm_t = iip3
+
+
+class _GraphNode:
+    def __init__(
+        self, name: str, element: Optional[Element], inputs: List[Tuple[str, int]]
+    ):
+        self.name: str = name
+        self.element: Optional[Element] = element
+        self.inputs: List[Tuple[str, int]] = inputs
+        self.children: List[str] = []
+        self.states: Optional[List[_PortState]] = None  # None when dirty
+
+
+def _to_dB(linear: float) -> float:
+    return float("-inf") if linear <= 0 else float(10 * log10(linear))
+
+
+class BudgetGraph:
+    """
+    Budget of a directed acyclic network of elements: splitters fan a chain out
+    to several branches, combiners join branches. Nodes are added after their
+    inputs, so the insertion order is a topological order of the graph.
+
+    Signal and noise are propagated as absolute powers, the noise being split
+    by origin: at a combiner, noise coming from a shared upstream path adds in
+    amplitude like the signal, while the noise each branch adds itself adds
+    in power. The thermal noise of a coherent splitter or combiner is
+    correlated between its outputs, with the correlation kT(I - AᵀA) of a
+    passive network (A the amplitude gains from inputs to outputs): the noise
+    of the isolation resistor of a Wilkinson splitter reaches its outputs in
+    opposite phases and cancels when they are combined in phase again.
+
+    Node states are cached: a shared upstream path is evaluated once for all
+    its branches, and after `replace` or `invalidate` only the modified nodes
+    and their descendants are evaluated again.
+    """
+
+    def __init__(
+        self,
+        input_freq: Optional[Hz_t] = None,
+        available_input_power: dBm_t = dBm(0),
+        signal_bandwidth: Hz_t = Hz(1),
+        T_receiver: kelvin_t = kelvin(290),
+    ):
+        self.input_freq: Optional[Hz_t] = input_freq
+        self.available_input_power: dBm_t = available_input_power
+        self.signal_bandwidth: Hz_t = signal_bandwidth
+        self.T_receiver: kelvin_t = T_receiver
+        self.evaluated_nodes: int = 0
+        self._nodes: Dict[str, _GraphNode] = {INPUT: _GraphNode(INPUT, None, [])}
+        self._order: List[str] = []
+        self._inputs: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._order)
+
+    def add(
+        self, name: str, element: Element, inputs: Union[Port, Sequence[Port]] = INPUT
+    ) -> str:
+        """
+        Add a node fed by the given output ports: node names or (name, port)
+        pairs, one per input of the element. Return the name.
+        """
+        if name in self._nodes:
+            raise ValueError("Duplicate node name: {}".format(name))
+        if isinstance(inputs, (str, tuple)):
+            inputs = [inputs]
+        ports = []
+        for port in inputs:
+            source, index = (port, 0) if isinstance(port, str) else port
+            if source not in self._nodes:
+                raise ValueError("Unknown input node: {}".format(source))
+            if index >= self._outputs(self._nodes[source].element):
+                raise ValueError("Unexpected output port {} of {}".format(index, source))
+            ports.append((source, index))
+        expected = element.inputs if isinstance(element, NPort) else 1
+        if len(ports) != expected:
+            raise ValueError("Expected {} inputs for node {}".format(expected, name))
+        self._nodes[name] = _GraphNode(name, element, ports)
+        for source, _ in ports:
+            self._nodes[source].children.append(name)
+        self._order.append(name)
+        return name
+
+    @staticmethod
+    def _outputs(element: Optional[Element]) -> int:
+        return element.outputs if isinstance(element, NPort) else 1
+
+    def element(self, name: str) -> Element:
+        return self._node(name).element
+
+    def _node(self, name: str) -> _GraphNode:
+        if name not in self._nodes or name == INPUT:
+            raise ValueError("Unknown node: {}".format(name))
+        return self._nodes[name]
+
+    def replace(self, name: str, element: Element) -> None:
+        """Replace the element of a node with the same ports."""
+        node = self._node(name)
+        if isinstance(element, NPort) or isinstance(node.element, NPort):
+            if self._outputs(element) != self._outputs(node.element) or (
+                len(node.inputs) != (element.inputs if isinstance(element, NPort) else 1)
+            ):
+                raise ValueError("Expected an element with the same ports")
+        node.element = element
+        self.invalidate(name)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Mark a node (all of them by default) and its descendants for evaluation."""
+        if name is None:
+            for node in self._nodes.values():
+                node.states = None
+            return
+        stack = [self._node(name)]
+        while stack:
+            node = stack.pop()
+            if node.states is not None:
+                node.states = None
+                stack.extend(self._nodes[child] for child in node.children)
+
+    def _noise_floor(self, temp: float) -> float:
+        return K_BOLTZMANN * temp * self.signal_bandwidth * 1000
+
+    def evaluate(self) -> None:
+        """Evaluate the dirty nodes in topological order."""
+        inputs = (
+            self.input_freq,
+            self.available_input_power,
+            self.signal_bandwidth,
+            self.T_receiver,
+        )
+        if inputs != self._inputs:
+            self.invalidate()
+            self._inputs = inputs
+        source = self._nodes[INPUT]
+        if source.states is None:
+            source.states = [
+                _PortState(
+                    10 ** (self.available_input_power / 10),
+                    {(INPUT, 0): float(sqrt(self._noise_floor(self.T_receiver)))},
+                    0.0,
+                    self.input_freq if self.input_freq is not None else Hz(0),
+                )
+            ]
+        for name in self._order:
+            node = self._nodes[name]
+            if node.states is None:
+                incoming = [self._nodes[s].states[p] for s, p in node.inputs]
+                node.states = self._advance(name, node.element, incoming)
+                self.evaluated_nodes += 1
+
+    def _advance(
+        self, name: str, elt: Element, incoming: List[_PortState]
+    ) -> List[_PortState]:
+        if isinstance(elt, NPort):
+            temp = elt.temp if elt.temp is not None else 290.0
+            linear = 10 ** (elt.port_gains() / 10)
+            # Available noise theorem: kTB at the outputs when all inputs are at T.
+            # Independent origins of the noise of the network (columns) with
+            # their amplitude at each output (rows).
+            floor = self._noise_floor(temp)
+            if elt.coherent:
+                amplitudes = sqrt(linear)
+                correlation = np.eye(elt.outputs) - amplitudes.T @ amplitudes
+                values, vectors = np.linalg.eigh(correlation)
+                sources = vectors * sqrt(floor * np.maximum(values, 0.0))
+            else:
+                sources = np.diag(sqrt(floor * np.maximum(1 - linear.sum(0), 0.0)))
+            states = []
+            for port, gains in enumerate(linear.T):
+                noise: Dict[Tuple[str, int], float] = {}
+                if elt.coherent:
+                    signal = sum(sqrt(g * s.signal) for g, s in zip(gains, incoming)) ** 2
+                    for g, s in zip(gains, incoming):
+                        for origin, a in s.noise.items():
+                            noise[origin] = noise.get(origin, 0.0) + float(sqrt(g)) * a
+                else:
+                    signal = sum(g * s.signal for g, s in zip(gains, incoming))
+                    for g, s in zip(gains, incoming):
+                        for origin, a in s.noise.items():
+                            noise[origin] = noise.get(origin, 0.0) + g * a * a
+                    noise = {origin: float(sqrt(p)) for origin, p in noise.items()}
+                for origin, a in enumerate(sources[port]):
+                    if a != 0:
+                        noise[(name, origin)] = float(a)
+                im3 = sum(sqrt(g) * s.im3 for g, s in zip(gains, incoming))
+                states.append(_PortState(float(signal), noise, float(im3), incoming[0].freq))
+            return states
+
+        (state,) = incoming
+        g = 10 ** (elt.gain / 10)
+        signal = g * state.signal
+        noise = {origin: float(sqrt(g)) * a for origin, a in state.noise.items()}
+        added = g * self._noise_floor(290.0) * (10 ** (elt.nf / 10) - 1)
+        if added > 0:
+            noise[(name, 0)] = float(sqrt(added))
+        im3 = state.im3 * sqrt(g)
+        if elt.oip3 is not None:
+            im3 += signal**1.5 / 10 ** (elt.oip3 / 10)
+        freq = state.freq
+        if isinstance(elt, Modulator):
+            if elt.converter_type == ConverterType.Down:
+                freq = Hz_t(freq - elt.lo)
+            else:
+                freq = Hz_t(freq + elt.lo)
+        return [_PortState(float(signal), noise, float(im3), freq)]
+
+    def result(self, name: str, port: int = 0) -> NodeResult:
+        """Results at an output port of a node, evaluating the graph if needed."""
+        node = self._node(name)
+        self.evaluate()
+        if not 0 <= port < len(node.states):
+            raise ValueError("Unexpected output port {} of {}".format(port, name))
+        state = node.states[port]
+        p_in = 10 ** (self.available_input_power / 10)
+        gain = _to_dB(state.signal / p_in)
+        noise = state.noise_power
+        snr_linear = state.signal / noise
+        # Noise factor giving the same SNR in a linear budget:
+        # SNR = P_in / (k (T_receiver + 290 (F - 1)) B)
+        t_total = p_in / (snr_linear * self._noise_floor(1.0))
+        f = 1 + (t_total - self.T_receiver) / 290.0
+        oip3 = dBm(float("inf"))
+        if state.im3 > 0:
+            oip3 = dBm(_to_dB(state.signal**1.5 / state.im3))
+        return NodeResult(
+            output_freq=state.freq,
+            output_power=dBm(_to_dB(state.signal)),
+            noise_power=dBm(_to_dB(noise)),
+            transducer_gain=dB(gain),
+            nf=dB(_to_dB(f)),
+            snr=dB(_to_dB(snr_linear)),
+            oip3=oip3,
+            iip3=dBm(oip3 - gain),
+        )
+
+    def results(self) -> Dict[Tuple[str, int], NodeResult]:
+        """Results at every output port, keyed by (node, port)."""
+        self.evaluate()
+        return {
+            (name, port): self.result(name, port)
+            for name in self._order
+            for port in range(len(self._nodes[name].states))
+        }
@@ -0,0 +1,150 @@
+import numpy as np
+from typing import Optional
+from .core import Budget
+from .utils import Hz_t
+
+
+class BlockerAnalysis:
+    """
+    Intermodulation products generated by interfering tones along a cascade.
+
+    Arrays indexed by stage have the stage as first axis, followed by the
+    scenario axes of the tones given to `blocker_analysis`.
+    Powers are referred to the budget input (dBm), like `Budget.snr`.
+    """
+
+    def __init__(
+        self,
+        im3_freq: np.ndarray,
+        im3_in_band: np.ndarray,
+        im2_freq: np.ndarray,
+        im2_in_band: np.ndarray,
+        tone_in_band: np.ndarray,
+        im3_power: np.ndarray,
+        im2_power: np.ndarray,
+        cochannel_power: np.ndarray,
+        interference_power: np.ndarray,
+        sinr: np.ndarray,
+        sinr_degradation: np.ndarray,
+        transducer_gain: np.ndarray,
+    ):
+        self.im3_freq: np.ndarray = im3_freq
+        self.im3_in_band: np.ndarray = im3_in_band
+        self.im2_freq: np.ndarray = im2_freq
+        self.im2_in_band: np.ndarray = im2_in_band
+        self.tone_in_band: np.ndarray = tone_in_band
+        self.im3_power: np.ndarray = im3_power
+        self.im2_power: np.ndarray = im2_power
+        self.cochannel_power: np.ndarray = cochannel_power
+        self.interference_power: np.ndarray = interference_power
+        self.sinr: np.ndarray = sinr
+        self.sinr_degradation: np.ndarray = sinr_degradation
+        self.transducer_gain: np.ndarray = transducer_gain
+
+    def output_referred(self, power: np.ndarray) -> np.ndarray:
+        """Convert an input referred per stage power (dBm) to the stage output."""
+        return power + self.transducer_gain
+
+
+def _to_dBm(linear_mW: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore"):
+        return 10 * np.log10(linear_mW)
+
+
+def blocker_analysis(
+    budget: Budget,
+    tone_freq: np.ndarray,
+    tone_power: np.ndarray,
+    signal_freq: Optional[Hz_t] = None,
+    signal_bandwidth: Optional[Hz_t] = None,
+) -> BlockerAnalysis:
+    """
+    Predict the distortion generated at every stage by interfering tones.
+
+    tone_freq, tone_power: frequencies (Hz) and powers (dBm) of the tones at the
+    budget input. The last axis enumerates the tones of one scenario, leading
+    axes enumerate scenarios, e.g. shape (n_scenarios, n_tones).
+
+    Third order products 2f1-f2 and second order products f1+f2, |f1-f2| are
+    computed for every pair of tones. Those falling within the signal band
+    (centered on the input frequency) are summed in power and referred to the
+    input with the cascaded IIP3 and IIP2 of each stage:
+        P_IM3 = 2.P1 + P2 - 2.IIP3
+        P_IM2 = P1 + P2 - IIP2
+    Tones falling themselves in the signal band are counted as co-channel
+    interference. See https://markimicrowave.com/technical-resources/tools/ip3-intermodulation-calculator/
+    """
+    if not budget.with_oip:
+        raise ValueError("Blocker analysis requires a budget computed with OIP")
+    if signal_freq is None:
+        signal_freq = budget.input_freq
+    if signal_freq is None:
+        raise ValueError("Expected a signal frequency or a budget input frequency")
+    if signal_bandwidth is None:
+        signal_bandwidth = budget.signal_bandwidth
+
+    freq, power = np.broadcast_arrays(
+        np.asarray(tone_freq, dtype=float), np.asarray(tone_power, dtype=float)
+    )
+    if freq.ndim == 0:
+        raise ValueError("Expected at least one tone per scenario")
+    n_tones = freq.shape[-1]
+    scenario_shape = freq.shape[:-1]
+    half_band = signal_bandwidth / 2
+
+    def in_band(f: np.ndarray) -> np.ndarray:
+        return np.abs(f - signal_freq) <= half_band
+
+    power_mW = 10 ** (power / 10)
+    fi = freq[..., :, None]
+    fj = freq[..., None, :]
+    pi = power_mW[..., :, None]
+    pj = power_mW[..., None, :]
+
+    # Third order products 2fi-fj, i != j
+    distinct = ~np.eye(n_tones, dtype=bool)
+    im3_freq = 2 * fi - fj
+    im3_in_band = in_band(im3_freq) & distinct
+    im3_sum = np.sum(np.where(im3_in_band, pi * pi * pj, 0.0), axis=(-2, -1))
+
+    # Second order products fi+fj and |fi-fj|, i < j
+    upper = np.triu(np.ones((n_tones, n_tones), dtype=bool), k=1)
+    im2_freq = np.stack([fi + fj, np.abs(fi - fj)], axis=-3)
+    im2_in_band = in_band(im2_freq) & upper
+    im2_sum = np.sum(np.where(im2_in_band, (pi * pj)[..., None, :, :], 0.0), axis=(-3, -2, -1))
+
+    tone_in_band = in_band(freq)
+    cochannel = np.sum(np.where(tone_in_band, power_mW, 0.0), axis=-1)
+
+    stage_shape = (len(budget.elements),) + (1,) * len(scenario_shape)
+    iip3 = np.asarray(budget.iip3, dtype=float).reshape(stage_shape)
+    iip2 = np.asarray(budget.iip2, dtype=float).reshape(stage_shape)
+    snr = np.asarray(budget.snr, dtype=float).reshape(stage_shape)
+    transducer_gain = np.asarray(budget.transducer_gain, dtype=float).reshape(
+        stage_shape
+    )
+
+    im3_mW = im3_sum * 10 ** (-2 * iip3 / 10)
+    im2_mW = im2_sum * 10 ** (-iip2 / 10)
+    cochannel_mW = np.broadcast_to(cochannel, im3_mW.shape)
+    interference_mW = im3_mW + im2_mW + cochannel_mW
+
+    # Input referred noise of each stage, consistent with Budget.snr
+    noise_mW = 10 ** ((budget.available_input_power - snr) / 10)
+    signal_mW = 10 ** (budget.available_input_power / 10)
+    sinr = 10 * np.log10(signal_mW / (noise_mW + interference_mW))
+
+    return BlockerAnalysis(
+        im3_freq=im3_freq,
+        im3_in_band=im3_in_band,
+        im2_freq=im2_freq,
+        im2_in_band=im2_in_band,
+        tone_in_band=tone_in_band,
+        im3_power=_to_dBm(im3_mW),
+        im2_power=_to_dBm(im2_mW),
+        cochannel_power=_to_dBm(cochannel_mW),
+        interference_power=_to_dBm(interference_mW),
+        sinr=sinr,
+        sinr_degradation=snr - sinr,
+        transducer_gain=transducer_gain,
+    )
@@ -0,0 +1,123 @@
+import csv
+from typing import List, Sequence
+import numpy as np
+from .utils import Hz_t, dB_t
+
+
+class ModcodTable:
+    """
+    Modulation and coding schemes with the SNR they require (dB) and their
+    spectral efficiency (bit/s/Hz of signal bandwidth).
+
+    The SNR is the one of `Budget.snr`, i.e. measured in the signal bandwidth;
+    it equals Es/N0 when the signal bandwidth is the symbol rate.
+    For each SNR the most efficient scheme whose threshold is met is selected.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        thresholds: Sequence[dB_t],
+        efficiencies: Sequence[float],
+    ):
+        if not (len(names) == len(thresholds) == len(efficiencies)):
+            raise ValueError("Expected as many names, thresholds and efficiencies")
+        if len(names) == 0:
+            raise ValueError("Expected at least one MODCOD")
+        order = np.argsort(np.asarray(thresholds, dtype=float), kind="stable")
+        self.names: List[str] = [names[i] for i in order]
+        self.thresholds: np.ndarray = np.asarray(thresholds, dtype=float)[order]
+        self.efficiencies: np.ndarray = np.asarray(efficiencies, dtype=float)[order]
+        # Index of the best scheme among the ones up to each threshold, so that a
+        # higher SNR never selects a less efficient scheme.
+        best = np.maximum.accumulate(self.efficiencies)
+        self._best: np.ndarray = np.searchsorted(best, best, side="left")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ModcodTable":
+        """Load a table from a CSV file with `name`, `threshold` and `efficiency` columns."""
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        return cls(
+            names=[row["name"] for row in rows],
+            thresholds=[float(row["threshold"]) for row in rows],
+            efficiencies=[float(row["efficiency"]) for row in rows],
+        )
+
+    def select(self, snr: dB_t, margin: dB_t = dB_t(0)) -> np.ndarray:
+        """Index of the selected scheme for each SNR, -1 when none closes the link."""
+        snr = np.asarray(snr, dtype=float)
+        i = np.searchsorted(self.thresholds, snr - margin, side="right") - 1
+        return np.where(i >= 0, self._best[np.maximum(i, 0)], -1)
+
+    def efficiency(self, snr: dB_t, margin: dB_t = dB_t(0)) -> np.ndarray:
+        """Spectral efficiency (bit/s/Hz), 0 when no scheme closes the link."""
+        i = self.select(snr, margin)
+        return np.where(i >= 0, self.efficiencies[np.maximum(i, 0)], 0.0)
+
+    def throughput(
+        self, snr: dB_t, signal_bandwidth: Hz_t, margin: dB_t = dB_t(0)
+    ) -> np.ndarray:
+        """Achievable bit rate (bit/s)."""
+        return self.efficiency(snr, margin) * np.asarray(signal_bandwidth, dtype=float)
+
+    def margin(self, snr: dB_t, margin: dB_t = dB_t(0)) -> np.ndarray:
+        """Excess SNR (dB) over the threshold of the selected scheme, NaN when none."""
+        i = self.select(snr, margin)
+        return np.where(
+            i >= 0, np.asarray(snr, dtype=float) - self.thresholds[np.maximum(i, 0)], np.nan
+        )
+
+
+def data_volume(throughput: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """
+    Total number of bits transferred over a time series (s), by trapezoidal
+    integration of the throughput (bit/s) along its last axis.
+    """
+    r = np.asarray(throughput, dtype=float)
+    dt = np.diff(np.asarray(times, dtype=float))
+    return np.sum((r[..., 1:] + r[..., :-1]) / 2 * dt, axis=-1)
+
+
+# DVB-S2 normal frames, ideal Es/N0 on AWGN channel (ETSI EN 302 307-1 table 13)
+_DVB_S2 = [
+    ("QPSK 1/4", -2.35, 0.490243),
+    ("QPSK 1/3", -1.24, 0.656448),
+    ("QPSK 2/5", -0.30, 0.789412),
+    ("QPSK 1/2", 1.00, 0.988858),
+    ("QPSK 3/5", 2.23, 1.188304),
+    ("QPSK 2/3", 3.10, 1.322253),
+    ("QPSK 3/4", 4.03, 1.487473),
+    ("QPSK 4/5", 4.68, 1.587196),
+    ("QPSK 5/6", 5.18, 1.654663),
+    ("QPSK 8/9", 6.20, 1.766451),
+    ("QPSK 9/10", 6.42, 1.788612),
+    ("8PSK 3/5", 5.50, 1.779991),
+    ("8PSK 2/3", 6.62, 1.980636),
+    ("8PSK 3/4", 7.91, 2.228124),
+    ("8PSK 5/6", 9.35, 2.478562),
+    ("8PSK 8/9", 10.69, 2.646012),
+    ("8PSK 9/10", 10.98, 2.679207),
+    ("16APSK 2/3", 8.97, 2.637201),
+    ("16APSK 3/4", 10.21, 2.966728),
+    ("16APSK 4/5", 11.03, 3.165623),
+    ("16APSK 5/6", 11.61, 3.300184),
+    ("16APSK 8/9", 12.89, 3.523143),
+    ("16APSK 9/10", 13.13, 3.567342),
+    ("32APSK 3/4", 12.73, 3.703295),
+    ("32APSK 4/5", 13.64, 3.951571),
+    ("32APSK 5/6", 14.28, 4.119540),
+    ("32APSK 8/9", 15.69, 4.397854),
+    ("32APSK 9/10", 16.05, 4.453027),
+]
+DVB_S2 = ModcodTable(*zip(*_DVB_S2))
+
+# LoRa spreading factors, demodulator SNR floor and SF/2^SF bit/s/Hz at coding rate 4/5
+LORA = ModcodTable(
+    names=["SF{}".format(sf) for sf in range(12, 6, -1)],
+    thresholds=[-20.0, -17.5, -15.0, -12.5, -10.0, -7.5],
+    efficiencies=[sf / 2**sf * 4 / 5 for sf in range(12, 6, -1)],
+)
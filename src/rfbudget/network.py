@@ -0,0 +1,172 @@
+from typing import Any, Optional, Tuple
+import numpy as np
+from .core import Budget, K_BOLTZMANN
+from .utils import dBm_t, m_t, m
+
+
+class SparseMatrix:
+    """Coordinate (COO) storage of the non-empty entries of a matrix"""
+
+    def __init__(
+        self,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        values: np.ndarray,
+        shape: Tuple[int, int],
+    ):
+        self.rows: np.ndarray = rows
+        self.cols: np.ndarray = cols
+        self.values: np.ndarray = values
+        self.shape: Tuple[int, int] = shape
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def to_dense(self, fill: float = float("-inf")) -> np.ndarray:
+        dense = np.full(self.shape, fill)
+        dense[self.rows, self.cols] = self.values
+        return dense
+
+
+class GridIndex:
+    """
+    Uniform grid buckets over 2-D points (m) answering fixed radius queries.
+    With a cell size equal to the radius, only the 3x3 neighbouring cells of a
+    query point need to be visited.
+    """
+
+    def __init__(self, points: np.ndarray, cell_size: m_t):
+        self.points: np.ndarray = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.cell_size: m_t = cell_size
+        cells = np.floor(self.points / cell_size).astype(np.int64)
+        self._origin = cells.min(axis=0) - 1 if len(cells) else np.zeros(2, np.int64)
+        self._height = int(cells[:, 1].max() - self._origin[1] + 2) if len(cells) else 1
+        keys = self._key(cells)
+        self._order = np.argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+
+    def _key(self, cells: np.ndarray) -> np.ndarray:
+        shifted = cells - self._origin
+        return shifted[:, 0] * self._height + shifted[:, 1]
+
+    def query_pairs(
+        self, centers: np.ndarray, radius: m_t
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        All (center, point) pairs closer than radius (radius <= cell size).
+        Return the center indices, the point indices and their distances.
+        """
+        if radius > self.cell_size:
+            raise ValueError("Expected a radius smaller than the cell size")
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        cells = np.floor(centers / self.cell_size).astype(np.int64)
+        center_idx, point_pos = [], []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                neighbours = cells + np.array([dx, dy])
+                shifted = neighbours - self._origin
+                valid = (shifted[:, 1] >= 0) & (shifted[:, 1] < self._height)
+                keys = np.where(valid, self._key(neighbours), -1)
+                lo = np.searchsorted(self._keys, keys, side="left")
+                hi = np.searchsorted(self._keys, keys, side="right")
+                counts = np.where(valid, hi - lo, 0)
+                total = int(counts.sum())
+                # Expand the [lo, hi) ranges without a Python loop
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                center_idx.append(np.repeat(np.arange(len(centers)), counts))
+                point_pos.append(np.repeat(lo, counts) + offsets)
+        ci = np.concatenate(center_idx)
+        pi = self._order[np.concatenate(point_pos)]
+        distance = np.hypot(*(centers[ci] - self.points[pi]).T)
+        close = distance <= radius
+        return ci[close], pi[close], distance[close]
+
+
+class NetworkResult:
+    """
+    Received power of every transmitter at every receiver within the
+    interference radius, and the resulting SINR of each receiver.
+    Powers are referred to the input of the receive chain.
+    """
+
+    def __init__(
+        self,
+        received_power: SparseMatrix,
+        serving: np.ndarray,
+        signal_power: np.ndarray,
+        interference_power: np.ndarray,
+        noise_power: dBm_t,
+        sinr: np.ndarray,
+    ):
+        self.received_power: SparseMatrix = received_power
+        self.serving: np.ndarray = serving
+        self.signal_power: np.ndarray = signal_power
+        self.interference_power: np.ndarray = interference_power
+        self.noise_power: dBm_t = noise_power
+        self.sinr: np.ndarray = sinr
+
+
+def _to_dBm(linear_mW: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore"):
+        return 10 * np.log10(linear_mW)
+
+
+def evaluate_network(
+    tx_positions: np.ndarray,
+    rx_positions: np.ndarray,
+    tx_power: dBm_t,
+    receiver: Budget,
+    path_loss: Any,
+    interference_radius: m_t,
+    serving: Optional[np.ndarray] = None,
+    min_distance: m_t = m(1),
+) -> NetworkResult:
+    """
+    Per receiver SINR of a network of transmitters and receivers.
+
+    tx_positions, rx_positions: planar coordinates (m) with shape (n, 2)
+    tx_power: EIRP of each transmitter (dBm), scalar or shape (n_tx,)
+    receiver: budget of the receive chain, its cascaded noise figure and
+        bandwidth give the noise floor
+    path_loss: propagation model evaluated with `loss_at_distance`
+        (e.g. `FreeSpacePathLossFriis`, `OkumuraHataPathLoss`)
+    interference_radius: pairs further apart are ignored
+    serving: index of the serving transmitter of each receiver, defaults to
+        the strongest one. Every other transmitter in range interferes.
+    """
+    tx_positions = np.asarray(tx_positions, dtype=float).reshape(-1, 2)
+    rx_positions = np.asarray(rx_positions, dtype=float).reshape(-1, 2)
+    n_tx, n_rx = len(tx_positions), len(rx_positions)
+    tx_power = np.broadcast_to(np.asarray(tx_power, dtype=float), n_tx)
+
+    index = GridIndex(rx_positions, interference_radius)
+    tx_idx, rx_idx, distance = index.query_pairs(tx_positions, interference_radius)
+    loss = path_loss.loss_at_distance(np.maximum(distance, min_distance))
+    power = tx_power[tx_idx] - loss
+    power_mW = 10 ** (power / 10)
+
+    total_mW = np.zeros(n_rx)
+    np.add.at(total_mW, rx_idx, power_mW)
+    if serving is None:
+        best = np.full(n_rx, -np.inf)
+        np.maximum.at(best, rx_idx, power)
+        strongest = power == best[rx_idx]
+        serving = np.full(n_rx, -1)
+        serving[rx_idx[strongest]] = tx_idx[strongest]
+    else:
+        serving = np.asarray(serving)
+    is_serving = tx_idx == serving[rx_idx]
+    signal_mW = np.zeros(n_rx)
+    np.add.at(signal_mW, rx_idx[is_serving], power_mW[is_serving])
+    interference_mW = np.maximum(total_mW - signal_mW, 0)
+
+    noise_temp = receiver.total_noise_temp[-1]
+    noise_mW = K_BOLTZMANN * noise_temp * receiver.signal_bandwidth * 1000
+    return NetworkResult(
+        received_power=SparseMatrix(tx_idx, rx_idx, power, (n_tx, n_rx)),
+        serving=serving,
+        signal_power=_to_dBm(signal_mW),
+        interference_power=_to_dBm(interference_mW),
+        noise_power=dBm_t(float(10 * np.log10(noise_mW))),
+        sinr=_to_dBm(signal_mW / (noise_mW + interference_mW)),
+    )
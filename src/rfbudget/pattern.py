@@ -0,0 +1,205 @@
+import os
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .utils import dB_t
+
+# dBi gain of a half-wave dipole, the reference of dBd values
+DIPOLE_GAIN = 2.15
+
+
+class AntennaPattern:
+    """
+    Gain (dBi) of an antenna versus azimuth and elevation (degrees) relative to
+    its boresight. Azimuth is clockwise in [0, 360), elevation in [-90, 90].
+
+    The given samples may be irregular; they are resampled once on a regular
+    grid of `resolution` degrees so that `gain_at` reduces to an index
+    computation and a bilinear interpolation over arrays of any shape.
+    """
+
+    def __init__(
+        self,
+        azimuth: np.ndarray,
+        elevation: np.ndarray,
+        gain: np.ndarray,
+        resolution: float = 1.0,
+        name: str = "",
+    ):
+        azimuth = np.asarray(azimuth, dtype=float) % 360
+        elevation = np.asarray(elevation, dtype=float)
+        gain = np.asarray(gain, dtype=float)
+        if gain.shape != (azimuth.size, elevation.size):
+            raise ValueError("Expected a gain of shape (azimuths, elevations)")
+        if resolution <= 0:
+            raise ValueError("Expected a positive resolution")
+        self.name: str = name
+        self.resolution: float = resolution
+        az_order = np.argsort(azimuth, kind="stable")
+        el_order = np.argsort(elevation, kind="stable")
+        azimuth, elevation = azimuth[az_order], elevation[el_order]
+        gain = gain[az_order][:, el_order]
+
+        # Regular grids spanning [0, 360] and [-90, 90], with steps close to
+        # the resolution when it does not divide them
+        self.azimuth: np.ndarray = np.linspace(0, 360, max(int(round(360 / resolution)), 1) + 1)
+        self.elevation: np.ndarray = np.linspace(
+            -90, 90, max(int(round(180 / resolution)), 1) + 1
+        )
+        # Resampling along the azimuth wraps around 360 degrees
+        by_azimuth = np.empty((self.azimuth.size, elevation.size))
+        for j in range(elevation.size):
+            by_azimuth[:, j] = np.interp(self.azimuth, azimuth, gain[:, j], period=360)
+        self.gain: np.ndarray = np.empty((self.azimuth.size, self.elevation.size))
+        for i in range(self.azimuth.size):
+            self.gain[i] = np.interp(self.elevation, elevation, by_azimuth[i])
+        self._az_step: float = float(self.azimuth[1] - self.azimuth[0])
+        self._el_step: float = float(self.elevation[1] - self.elevation[0])
+
+    @property
+    def peak_gain(self) -> dB_t:
+        return dB_t(float(self.gain.max()))
+
+    def gain_at(self, azimuth: np.ndarray, elevation: np.ndarray) -> np.ndarray:
+        """Interpolated gain (dBi) towards directions relative to the boresight."""
+        azimuth, elevation = np.broadcast_arrays(
+            np.asarray(azimuth, dtype=float), np.asarray(elevation, dtype=float)
+        )
+        x = (azimuth % 360) / self._az_step
+        y = (np.clip(elevation, -90, 90) + 90) / self._el_step
+        i = np.minimum(x.astype(int), self.azimuth.size - 2)
+        j = np.minimum(y.astype(int), self.elevation.size - 2)
+        dx, dy = x - i, y - j
+        g = self.gain
+        return (
+            g[i, j] * (1 - dx) * (1 - dy)
+            + g[i + 1, j] * dx * (1 - dy)
+            + g[i, j + 1] * (1 - dx) * dy
+            + g[i + 1, j + 1] * dx * dy
+        )
+
+    def __call__(self, azimuth: np.ndarray, elevation: np.ndarray) -> np.ndarray:
+        return self.gain_at(azimuth, elevation)
+
+    @classmethod
+    def isotropic(cls, gain: dB_t = dB_t(0)) -> "AntennaPattern":
+        return cls(np.array([0.0]), np.array([0.0]), np.array([[float(gain)]]), name="Isotropic")
+
+    @classmethod
+    def from_cuts(
+        cls,
+        peak_gain: dB_t,
+        azimuth: np.ndarray,
+        horizontal: np.ndarray,
+        elevation: np.ndarray,
+        vertical: np.ndarray,
+        max_attenuation: Optional[dB_t] = None,
+        resolution: float = 1.0,
+        name: str = "",
+    ) -> "AntennaPattern":
+        """
+        Pattern from its horizontal and vertical cuts given as attenuations (dB)
+        relative to the peak gain. The attenuation of a direction is the sum of
+        both cuts, limited to max_attenuation (the largest attenuation of the cuts
+        by default).
+        """
+        horizontal = np.asarray(horizontal, dtype=float)
+        vertical = np.asarray(vertical, dtype=float)
+        if max_attenuation is None:
+            max_attenuation = dB_t(float(max(horizontal.max(), vertical.max())))
+        attenuation = np.minimum(horizontal[:, None] + vertical[None, :], max_attenuation)
+        return cls(azimuth, elevation, peak_gain - attenuation, resolution, name)
+
+    @classmethod
+    def three_gpp(
+        cls,
+        peak_gain: dB_t = dB_t(8),
+        beamwidth_azimuth: float = 65,
+        beamwidth_elevation: float = 65,
+        front_to_back: dB_t = dB_t(30),
+        side_lobe_level: dB_t = dB_t(30),
+        tilt: float = 0,
+        resolution: float = 1.0,
+    ) -> "AntennaPattern":
+        """
+        Parametric sector antenna of 3GPP TR 38.901 (table 7.3-1):
+        A(φ, θ) = min(12 (φ/φ3dB)² limited to Am + 12 ((θ + tilt)/θ3dB)² limited
+        to SLAv, Am), with Am the front to back ratio and a downward tilt (degrees).
+        """
+        azimuth = np.arange(0, 360, resolution)
+        phi = (azimuth + 180) % 360 - 180
+        elevation = np.linspace(-90, 90, int(round(180 / resolution)) + 1)
+        horizontal = np.minimum(12 * (phi / beamwidth_azimuth) ** 2, front_to_back)
+        vertical = np.minimum(
+            12 * ((elevation + tilt) / beamwidth_elevation) ** 2, side_lobe_level
+        )
+        return cls.from_cuts(
+            peak_gain, azimuth, horizontal, elevation, vertical,
+            max_attenuation=front_to_back, resolution=resolution, name="3GPP",
+        )
+
+    @classmethod
+    def from_msi(cls, path: str, resolution: float = 1.0) -> "AntennaPattern":
+        """Pattern of a MSI/Planet file, parsed once per file (see `load_msi`)."""
+        return load_msi(path, resolution)
+
+
+_msi_cache: Dict[Tuple[str, int, int, float], AntennaPattern] = {}
+
+
+def _read_cut(lines: List[str], start: int, count: int) -> np.ndarray:
+    values = [line.split()[:2] for line in lines[start : start + count]]
+    if len(values) != count:
+        raise ValueError("Truncated MSI pattern")
+    return np.array([[float(a), float(v)] for a, v in values])
+
+
+def load_msi(path: str, resolution: float = 1.0) -> AntennaPattern:
+    """
+    Parse a MSI/Planet pattern file: a header of `KEYWORD value` lines (NAME,
+    GAIN in dBi or dBd, ...) then HORIZONTAL and VERTICAL sections of
+    `angle attenuation` lines. Vertical angles are measured downward from the
+    horizon. Patterns are cached until the file is modified.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size, resolution)
+    if key in _msi_cache:
+        return _msi_cache[key]
+    with open(path, errors="replace") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    name = os.path.splitext(os.path.basename(path))[0]
+    peak_gain = 0.0
+    cuts: Dict[str, np.ndarray] = {}
+    i = 0
+    while i < len(lines):
+        words = lines[i].split()
+        keyword = words[0].upper()
+        if keyword in ("HORIZONTAL", "VERTICAL"):
+            count = int(words[1])
+            cuts[keyword] = _read_cut(lines, i + 1, count)
+            i += count + 1
+            continue
+        if keyword == "NAME" and len(words) > 1:
+            name = " ".join(words[1:])
+        elif keyword == "GAIN" and len(words) > 1:
+            peak_gain = float(words[1])
+            if len(words) > 2 and words[2].lower() == "dbd":
+                peak_gain += DIPOLE_GAIN
+        i += 1
+    if "HORIZONTAL" not in cuts or "VERTICAL" not in cuts:
+        raise ValueError("Expected HORIZONTAL and VERTICAL sections in {}".format(path))
+    h, v = cuts["HORIZONTAL"], cuts["VERTICAL"]
+    # Front half of the vertical cut: downward angle in [-90, 90] is -elevation
+    down = (v[:, 0] + 180) % 360 - 180
+    front = np.abs(down) <= 90
+    pattern = AntennaPattern.from_cuts(
+        dB_t(peak_gain),
+        h[:, 0],
+        h[:, 1],
+        -down[front],
+        v[front, 1],
+        resolution=resolution,
+        name=name,
+    )
+    _msi_cache[key] = pattern
+    return pattern
@@ -1,6 +1,14 @@
 import math
-from typing import Optional
-from .utils import m_t, deg_t, EARTH_RADIUS, to_radians
+import numpy as np
+from typing import List, Optional
+from .utils import (
+    m_t,
+    deg_t,
+    EARTH_RADIUS,
+    EARTH_MU,
+    EARTH_ROTATION_RATE,
+    to_radians,
+)
 
 
 def distance_max(elevation: deg_t, orbit_radius: m_t, r: Optional[m_t] = None) -> m_t:
@@ -20,6 +28,26 @@ def distance_max(elevation: deg_t, orbit_radius: m_t, r: Optional[m_t] = None) -
     )
 
 
+def great_circle_distance(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+    r: Optional[m_t] = None,
+) -> np.ndarray:
+    """
+    Haversine distance (m) between points given in degrees, element-wise.
+    """
+    if r is None:
+        r = EARTH_RADIUS
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = np.radians(np.asarray(lon2) - np.asarray(lon1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * r * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
 class Orbit:
     def __init__(
         self,
@@ -27,7 +55,17 @@ class Orbit:
         perigee: Optional[m_t] = None,
         inclination: Optional[deg_t] = None,
         planet_radius: Optional[m_t] = None,
+        raan: deg_t = deg_t(0),
+        arg_perigee: deg_t = deg_t(0),
+        mean_anomaly: deg_t = deg_t(0),
+        mu: float = EARTH_MU,
     ):
+        """
+        raan: right ascension of the ascending node
+        arg_perigee: argument of perigee
+        mean_anomaly: mean anomaly at time 0
+        mu: standard gravitational parameter of the planet (m³/s²)
+        """
         if perigee is None:
             perigee = apogee
         if planet_radius is None:
@@ -45,6 +83,124 @@ class Orbit:
         )
         self.mean_altitude: m_t = m_t((self.apogee + self.perigee) / 2)
         self.mean_radius: m_t = m_t(planet_radius + self.mean_altitude)
+        self.raan: deg_t = raan
+        self.arg_perigee: deg_t = arg_perigee
+        self.mean_anomaly: deg_t = mean_anomaly
+        self.mean_motion: float = math.sqrt(mu / self.semi_major_axis**3)  # rad/s
 
     def slant_range(self, elevation: deg_t) -> m_t:
         return distance_max(elevation, self.mean_radius, self.planet_radius)
+
+    def position(self, times: np.ndarray) -> np.ndarray:
+        """Inertial position (m) at times (s), shape times.shape + (3,)"""
+        return propagate([self], times)[0]
+
+
+def kepler_position(
+    a: np.ndarray,
+    e: np.ndarray,
+    inclination: np.ndarray,
+    raan: np.ndarray,
+    arg_perigee: np.ndarray,
+    mean_anomaly: np.ndarray,
+) -> np.ndarray:
+    """
+    Inertial position (m) from Keplerian elements (angles in radians),
+    element-wise on broadcast arrays. Result has a trailing axis of size 3.
+    """
+    # Kepler's equation M = E - e.sin(E) by Newton iterations
+    ecc_anomaly = np.array(mean_anomaly, dtype=float)
+    for _ in range(12):
+        ecc_anomaly = ecc_anomaly - (
+            ecc_anomaly - e * np.sin(ecc_anomaly) - mean_anomaly
+        ) / (1 - e * np.cos(ecc_anomaly))
+    xp = a * (np.cos(ecc_anomaly) - e)
+    yp = a * np.sqrt(1 - e**2) * np.sin(ecc_anomaly)
+    co, so = np.cos(raan), np.sin(raan)
+    ci, si = np.cos(inclination), np.sin(inclination)
+    cw, sw = np.cos(arg_perigee), np.sin(arg_perigee)
+    return np.stack(
+        [
+            (co * cw - so * sw * ci) * xp + (-co * sw - so * cw * ci) * yp,
+            (so * cw + co * sw * ci) * xp + (-so * sw + co * cw * ci) * yp,
+            sw * si * xp + cw * si * yp,
+        ],
+        axis=-1,
+    )
+
+
+def orbit_elements(orbits: List[Orbit]) -> np.ndarray:
+    """
+    Elements of the orbits as an array of shape (n, 7): semi major axis,
+    eccentricity, inclination, raan, argument of perigee, mean anomaly at
+    time 0 (radians) and mean motion (rad/s).
+    """
+    return np.array(
+        [
+            [
+                o.semi_major_axis,
+                o.eccentricity,
+                math.radians(o.inclination or 0),
+                math.radians(o.raan),
+                math.radians(o.arg_perigee),
+                math.radians(o.mean_anomaly),
+                o.mean_motion,
+            ]
+            for o in orbits
+        ],
+        dtype=float,
+    ).reshape(-1, 7)
+
+
+def propagate(orbits: List[Orbit], times: np.ndarray) -> np.ndarray:
+    """
+    Two body propagation of many orbits over a time grid (s).
+    Inertial positions (m) with shape (orbits, times..., 3).
+    """
+    el = orbit_elements(orbits)
+    t = np.asarray(times, dtype=float)
+    expand = (slice(None),) + (None,) * t.ndim
+    a, e, inc, raan, argp, m0, n = (el[:, i][expand] for i in range(7))
+    return kepler_position(a, e, inc, raan, argp, m0 + n * t)
+
+
+def eci_to_ecef(positions: np.ndarray, times: np.ndarray, gmst0: float = 0) -> np.ndarray:
+    """
+    Rotate inertial positions (..., 3) at times (s) into the Earth fixed frame.
+    gmst0: Greenwich sidereal angle at time 0 (radians)
+    """
+    theta = gmst0 + EARTH_ROTATION_RATE * np.asarray(times, dtype=float)
+    c, s = np.cos(theta), np.sin(theta)
+    x, y, z = positions[..., 0], positions[..., 1], positions[..., 2]
+    return np.stack([c * x + s * y, -s * x + c * y, z], axis=-1)
+
+
+def geodetic_to_ecef(
+    lat: deg_t, lon: deg_t, altitude: m_t = m_t(0), r: Optional[m_t] = None
+) -> np.ndarray:
+    """Earth fixed position (m) of points on a spherical planet, shape (..., 3)"""
+    if r is None:
+        r = EARTH_RADIUS
+    phi = np.radians(lat)
+    lam = np.radians(lon)
+    rho = r + np.asarray(altitude, dtype=float)
+    return np.stack(
+        [
+            rho * np.cos(phi) * np.cos(lam),
+            rho * np.cos(phi) * np.sin(lam),
+            rho * np.sin(phi) * np.ones_like(lam),
+        ],
+        axis=-1,
+    )
+
+
+def look_angles(satellite: np.ndarray, station: np.ndarray) -> np.ndarray:
+    """
+    Elevation (°) and slant range (m) of satellites seen from stations, both
+    Earth fixed (..., 3) and broadcast against each other. Shape (2, ...).
+    """
+    rho = satellite - station
+    slant = np.linalg.norm(rho, axis=-1)
+    up = station / np.linalg.norm(station, axis=-1, keepdims=True)
+    elevation = np.degrees(np.arcsin(np.clip(np.sum(rho * up, axis=-1) / slant, -1, 1)))
+    return np.stack([elevation, slant])
@@ -0,0 +1,135 @@
+from typing import Any, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Labels of the level diagram metrics
+METRIC_LABELS = {
+    "output_power": "Output power (dBm)",
+    "transducer_gain": "Transducer gain (dB)",
+    "nf": "Noise figure (dB)",
+    "snr": "SNR (dB)",
+    "oip3": "OIP3 (dBm)",
+    "iip3": "IIP3 (dBm)",
+    "oip2": "OIP2 (dBm)",
+    "iip2": "IIP2 (dBm)",
+    "capacity": "Capacity (bps)",
+}
+
+
+def new_figure(figsize: Tuple[float, float] = (8, 6)) -> Any:
+    """Figure attached to an Agg canvas, rendered off-screen without pyplot."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def decimate(
+    x: np.ndarray, y: np.ndarray, max_points: int = 2000
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Min/max decimation of curves sharing the same abscissa: the last axis is
+    split in max_points/2 buckets keeping the lowest and highest sample of each,
+    so that peaks and nulls remain visible.
+    Return the decimated x with shape (curves, points) and y alike.
+    """
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    x = np.broadcast_to(np.asarray(x, dtype=float), y.shape)
+    n = y.shape[-1]
+    buckets = max_points // 2
+    if n <= max_points or buckets == 0:
+        return x, y
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    length = np.diff(edges).max()
+    # Pad the buckets to the same length with their last sample
+    index = np.minimum(edges[:-1, None] + np.arange(length), edges[1:, None] - 1)
+    blocks = np.where(np.isnan(y[:, index]), np.inf, y[:, index])
+    lo = index[np.arange(buckets), np.argmin(blocks, axis=-1)]
+    blocks = np.where(np.isnan(y[:, index]), -np.inf, y[:, index])
+    hi = index[np.arange(buckets), np.argmax(blocks, axis=-1)]
+    keep = np.sort(np.stack([lo, hi], axis=-1), axis=-1).reshape(y.shape[0], -1)
+    rows = np.arange(y.shape[0])[:, None]
+    return x[rows, keep], y[rows, keep]
+
+
+def _segments(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    y = np.where(np.isfinite(y), y, np.nan)
+    return np.stack([x, y], axis=-1)
+
+
+def _curves(result: Any, metric: str) -> np.ndarray:
+    """Values of a metric with shape (curves, stages), from a Budget, a BudgetResult or a Cascade."""
+    values = np.asarray(getattr(result, metric), dtype=float)
+    return values.reshape(values.shape[0], -1).T
+
+
+def plot_levels(
+    results: Sequence[Any],
+    metrics: Sequence[str] = ("output_power", "nf", "snr", "oip3"),
+    fig: Optional[Any] = None,
+    stage_names: Optional[List[str]] = None,
+    **line_options: Any,
+) -> Any:
+    """
+    Level diagrams of many budgets, one subplot per metric with the stage as
+    abscissa. Each subplot is a single LineCollection whatever the number of
+    budgets. Results are budgets, `BudgetResult`, `VariantResult` or `Cascade`
+    (each of their parameter points being a curve).
+    """
+    from matplotlib.collections import LineCollection
+
+    if fig is None:
+        fig = new_figure()
+    line_options.setdefault("linewidths", 1)
+    axes = fig.subplots(len(metrics), 1, sharex=True, squeeze=False)[:, 0]
+    for ax, metric in zip(axes, metrics):
+        curves = [_curves(r, metric) for r in results]
+        curves = [c for c in curves if c.size]
+        if not curves:
+            continue
+        y = np.concatenate(curves)
+        x = np.broadcast_to(np.arange(y.shape[1]), y.shape)
+        ax.add_collection(LineCollection(_segments(x, y), **line_options))
+        ax.autoscale_view()
+        ax.set_ylabel(METRIC_LABELS.get(metric, metric))
+        ax.grid(True)
+    if stage_names is not None:
+        axes[-1].set_xticks(np.arange(len(stage_names)))
+        axes[-1].set_xticklabels(stage_names, rotation=45, ha="right")
+    else:
+        axes[-1].set_xlabel("Stage")
+    return fig
+
+
+def plot_sweep(
+    x: np.ndarray,
+    y: np.ndarray,
+    ax: Optional[Any] = None,
+    max_points: int = 2000,
+    xlabel: str = "",
+    ylabel: str = "SNR (dB)",
+    **line_options: Any,
+) -> Any:
+    """
+    Curves of a sweep, e.g. SNR versus distance: y has shape (points,) or
+    (curves, points) along the shared x. Curves are decimated to max_points
+    and drawn as a single LineCollection. Return the axes.
+    """
+    from matplotlib.collections import LineCollection
+
+    if ax is None:
+        ax = new_figure().subplots()
+    xd, yd = decimate(x, y, max_points)
+    line_options.setdefault("linewidths", 1)
+    ax.add_collection(LineCollection(_segments(xd, yd), **line_options))
+    ax.autoscale_view()
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.grid(True)
+    return ax
+
+
+def save_figure(fig: Any, path: str, dpi: int = 100) -> None:
+    """Render a figure off-screen to a file (format from the extension)."""
+    fig.savefig(path, dpi=dpi)
@@ -1,7 +1,16 @@
+import numpy as np
 from numpy import log10
-from typing import Optional, Any
+from typing import List, Optional, Any, Tuple
+from .core import Budget, Cascade, Element, cascade, element_columns
+from .atmosphere import gaseous_attenuation, rain_attenuation
 from .elements import PathLoss
-from .utils import Hz_t, dBm_t, m_t, dB, MHz, km, m, Hz
+from .terrain import DigitalElevationModel, bullington_loss, deygout_loss
+from .utils import Hz_t, dB_t, dBm_t, m_t, deg_t, dB, MHz, km, m, Hz
+
+
+def free_space_path_loss(distance: m_t, freq: Hz_t) -> dB_t:
+    """Friis free space path loss (dB), element-wise on arrays."""
+    return 20 * log10(distance) + 20 * log10(freq) - 147.55
 
 
 class FreeSpacePathLossFriis(PathLoss):
@@ -15,17 +24,32 @@ class FreeSpacePathLossFriis(PathLoss):
         z_out: float = 50,
     ):
         self.distance: m_t = distance
-        loss = dB(20 * log10(distance) + 20 * log10(freq) - 147.55)
+        self.freq: Hz_t = freq
+        loss = dB(free_space_path_loss(distance, freq))
         PathLoss.__init__(
             self, name=name or "FPSL", loss=loss, oip3=oip3, z_in=z_in, z_out=z_out
         )
 
+    def loss_at_distance(self, distance: np.ndarray) -> np.ndarray:
+        """Loss (dB) of the same model at other distances, element-wise."""
+        return free_space_path_loss(np.asarray(distance, dtype=float), self.freq)
+
     def schemdraw(self, d: Any, options: dict) -> Any:
         from .visualizer import draw_element
 
         return draw_element(self, d, options)
 
 
+def radar_free_space_basic_loss(distance: m_t, sigma: float, freq: Hz_t) -> dB_t:
+    """Two way radar loss (dB) of ITU-R P.525, element-wise on arrays."""
+    return (
+        103.4
+        + 20 * log10(freq / MHz(1))
+        + 40 * log10(distance / km(1))
+        - 10 * log10(sigma)
+    )
+
+
 class RadarFreeSpaceBasicLoss(PathLoss):
     """
     https://www.itu.int/dms_pubrec/itu-r/rec/p/R-REC-P.525-2-199408-S!!PDF-E.pdf
@@ -48,22 +72,74 @@ class RadarFreeSpaceBasicLoss(PathLoss):
         """
         self.distance: m_t = distance
         self.sigma: float = sigma
-        loss = dB(
-            103.4
-            + 20 * log10(freq / MHz(1))
-            + 40 * log10(distance / km(1))
-            - 10 * log10(sigma)
-        )
+        self.freq: Hz_t = freq
+        loss = dB(radar_free_space_basic_loss(distance, sigma, freq))
         PathLoss.__init__(
             self, name=name or "FPSL", loss=loss, oip3=oip3, z_in=z_in, z_out=z_out
         )
 
+    def loss_at_distance(
+        self, distance: np.ndarray, sigma: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Loss (dB) of the same model at other distances (and cross-sections)."""
+        if sigma is None:
+            sigma = self.sigma
+        return radar_free_space_basic_loss(
+            np.asarray(distance, dtype=float), np.asarray(sigma, dtype=float), self.freq
+        )
+
     def schemdraw(self, d: Any, options: dict) -> Any:
         from .visualizer import draw_element
 
         return draw_element(self, d, options)
 
 
+def okumura_hata_path_loss(
+    distance: m_t,
+    freq: Hz_t,
+    base_height: m_t = m(30),
+    mobile_height: m_t = m(1),
+    environment: str = "small city",
+) -> dB_t:
+    """
+    Okumura-Hata path loss (dB), element-wise on arrays.
+    Unlike `OkumuraHataPathLoss`, the validity ranges are not checked.
+    """
+    f = freq / MHz(1)
+    d = distance / km(1)
+    hb = base_height / m(1)
+    hm = mobile_height / m(1)
+    # Compute ch, the Antenna height correction factor
+    if environment in [
+        OkumuraHataPathLoss.SMALL_CITY,
+        OkumuraHataPathLoss.MEDIUM_CITY,
+        OkumuraHataPathLoss.SUBURBAN,
+        OkumuraHataPathLoss.OPEN,
+    ]:
+        ch = 0.8 + (1.1 * log10(f) - 0.7) * hm - 1.56 * log10(f)
+    elif environment == OkumuraHataPathLoss.LARGE_CITY:
+        ch = np.where(
+            f <= 200,
+            8.29 * log10(1.54 * hm) ** 2 - 1.1,
+            3.2 * log10(11.75 * hm) ** 2 - 4.97,
+        )
+    else:
+        raise ValueError("Unexpected environment")
+    # Path loss in urban areas. Unit: decibel (dB)
+    loss = (
+        69.55
+        + 26.16 * log10(f)
+        - 13.82 * log10(hb)
+        - ch
+        + (44.9 - 6.55 * log10(hb)) * log10(d)
+    )
+    if environment == OkumuraHataPathLoss.SUBURBAN:
+        loss = loss - 2 * log10(f / 28) ** 2 - 5.4
+    elif environment == OkumuraHataPathLoss.OPEN:
+        loss = loss - 4.78 * log10(f) ** 2 + 18.33 * log10(f) - 40.94
+    return loss
+
+
 class OkumuraHataPathLoss(PathLoss):
     """See https://en.wikipedia.org/wiki/Hata_model"""
 
@@ -100,37 +176,15 @@ class OkumuraHataPathLoss(PathLoss):
             raise ValueError("Expected height of mobile station to be in 1-10m range")
         if d < 1 or d > 10:
             raise ValueError("Expected distance to be in 1-10km range")
-        # Compute ch, the Antenna height correction factor
-        if environment in [
-            OkumuraHataPathLoss.SMALL_CITY,
-            OkumuraHataPathLoss.MEDIUM_CITY,
-            OkumuraHataPathLoss.SUBURBAN,
-            OkumuraHataPathLoss.OPEN,
-        ]:
-            ch = 0.8 + (1.1 * log10(f) - 0.7) * hm - 1.56 * log10(f)
-        elif environment == OkumuraHataPathLoss.LARGE_CITY:
-            if f < 150:
-                raise ValueError("Expected frequency to be in 150MHz - 1.5GHz range")
-            elif f <= 200:
-                ch = 8.29 * log10(1.54 * hm) ** 2 - 1.1
-            elif f <= 1500:
-                ch = 3.2 * log10(11.75 * hm) ** 2 - 4.97
-            else:
-                raise ValueError("Expected frequency to be in 150MHz - 1.5GHz range")
-        else:
-            raise ValueError("Unexpected environment")
-        # Path loss in urban areas. Unit: decibel (dB)
+        if environment == OkumuraHataPathLoss.LARGE_CITY and (f < 150 or f > 1500):
+            raise ValueError("Expected frequency to be in 150MHz - 1.5GHz range")
         loss = dB(
-            69.55
-            + 26.16 * log10(f)
-            - 13.82 * log10(hb)
-            - ch
-            + (44.9 - 6.55 * log10(hb)) * log10(d)
+            float(
+                okumura_hata_path_loss(
+                    distance, freq, base_height, mobile_height, environment
+                )
+            )
         )
-        if environment == OkumuraHataPathLoss.SUBURBAN:
-            loss = dB(loss - 2 * log10(f / 28) ** 2 - 5.4)
-        elif environment == OkumuraHataPathLoss.OPEN:
-            loss = dB(loss - 4.78 * log10(f) ** 2 + 18.33 * log10(f) - 40.94)
         PathLoss.__init__(
             self,
             name=name or environment or "city",
@@ -140,12 +194,59 @@ class OkumuraHataPathLoss(PathLoss):
             z_out=z_out,
         )
 
+    def loss_at_distance(self, distance: np.ndarray) -> np.ndarray:
+        """Loss (dB) of the same model at other distances, element-wise."""
+        return okumura_hata_path_loss(
+            np.asarray(distance, dtype=float),
+            self.freq,
+            self.base_height,
+            self.mobile_height,
+            self.environment,
+        )
+
     def schemdraw(self, d: Any, options: dict) -> Any:
         from .visualizer import draw_element
 
         return draw_element(self, d, options)
 
 
+def cost_hata_path_loss(
+    distance: m_t,
+    freq: Hz_t,
+    base_height: m_t = m(30),
+    mobile_height: m_t = m(1),
+    environment: str = "medium city or suburban",
+) -> dB_t:
+    """
+    COST-231 Hata path loss (dB), element-wise on arrays.
+    Unlike `CostHataPathLoss`, the validity ranges are not checked.
+    """
+    f = freq / MHz(1)
+    d_km = distance / km(1)
+    hb = base_height / m(1)
+    hm = mobile_height / m(1)
+
+    # antenna height correction factor a(hm)
+    ch = (1.1 * log10(f) - 0.7) * hm - (1.56 * log10(f) - 0.8)
+
+    # Constant C
+    if environment == CostHataPathLoss.METROPOLITAN:
+        c = 3
+    elif environment == CostHataPathLoss.MEDIUM_CITY_SUBURBAN:
+        c = 0
+    else:
+        raise ValueError("Unexpected environment")
+
+    return (
+        46.3
+        + 33.9 * log10(f)
+        - 13.82 * log10(hb)
+        - ch
+        + (44.9 - 6.55 * log10(hb)) * log10(d_km)
+        + c
+    )
+
+
 class CostHataPathLoss(PathLoss):
     """See https://en.wikipedia.org/wiki/COST_Hata_model"""
 
@@ -185,24 +286,8 @@ class CostHataPathLoss(PathLoss):
         if d_km < 1 or d_km > 20:
             raise ValueError("Expected distance to be in 1-20km range")
 
-        # antenna height correction factor a(hm)
-        ch = (1.1 * log10(f) - 0.7) * hm - (1.56 * log10(f) - 0.8)
-
-        # Constant C
-        if environment == CostHataPathLoss.METROPOLITAN:
-            c = 3
-        elif environment == CostHataPathLoss.MEDIUM_CITY_SUBURBAN:
-            c = 0
-        else:
-            raise ValueError("Unexpected environment")
-
         loss = dB(
-            46.3
-            + 33.9 * log10(f)
-            - 13.82 * log10(hb)
-            - ch
-            + (44.9 - 6.55 * log10(hb)) * log10(d_km)
-            + c
+            cost_hata_path_loss(distance, freq, base_height, mobile_height, environment)
         )
 
         PathLoss.__init__(
@@ -214,7 +299,241 @@ class CostHataPathLoss(PathLoss):
             z_out=z_out,
         )
 
+    def loss_at_distance(self, distance: np.ndarray) -> np.ndarray:
+        """Loss (dB) of the same model at other distances, element-wise."""
+        return cost_hata_path_loss(
+            np.asarray(distance, dtype=float),
+            self.freq,
+            self.base_height,
+            self.mobile_height,
+            self.environment,
+        )
+
     def schemdraw(self, d: Any, options: dict) -> Any:
         from .visualizer import draw_element
 
         return draw_element(self, d, options)
+
+
+def terrain_path_loss(
+    dem: DigitalElevationModel,
+    tx_lat: deg_t,
+    tx_lon: deg_t,
+    rx_lat: deg_t,
+    rx_lon: deg_t,
+    freq: Hz_t,
+    tx_height: m_t = m(10),
+    rx_height: m_t = m(10),
+    method: str = "bullington",
+    samples: int = 256,
+    k_factor: float = 4 / 3,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Free space plus terrain diffraction loss for a batch of links.
+    Coordinates, frequencies and heights broadcast against each other.
+    Return the distance (m), the diffraction loss (dB) and the total loss (dB).
+    """
+    if method == TerrainPathLoss.BULLINGTON:
+        diffraction = bullington_loss
+    elif method == TerrainPathLoss.DEYGOUT:
+        diffraction = deygout_loss
+    else:
+        raise ValueError("Unexpected diffraction method")
+    distance, heights = dem.profiles(tx_lat, tx_lon, rx_lat, rx_lon, samples)
+    links = distance.shape[0]
+    freq = np.broadcast_to(np.asarray(freq, dtype=float), links)
+    tx_height = np.broadcast_to(np.asarray(tx_height, dtype=float), links)
+    rx_height = np.broadcast_to(np.asarray(rx_height, dtype=float), links)
+    diffraction_loss = diffraction(
+        distance, heights, tx_height, rx_height, freq, k_factor=k_factor
+    )
+    total = free_space_path_loss(distance[:, -1], freq) + diffraction_loss
+    return distance[:, -1], diffraction_loss, total
+
+
+class TerrainPathLoss(PathLoss):
+    """
+    Free space loss plus diffraction over the terrain profile between two sites.
+    See https://www.itu.int/rec/R-REC-P.526
+    """
+
+    BULLINGTON = "bullington"
+    DEYGOUT = "deygout"
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        *,
+        dem: DigitalElevationModel,
+        tx: Tuple[deg_t, deg_t],
+        rx: Tuple[deg_t, deg_t],
+        freq: Hz_t = Hz(0),
+        tx_height: m_t = m(10),
+        rx_height: m_t = m(10),
+        method: str = BULLINGTON,
+        samples: int = 256,
+        k_factor: float = 4 / 3,
+        oip3: Optional[dBm_t] = None,
+        z_in: float = 50,
+        z_out: float = 50,
+    ):
+        """
+        tx, rx: (latitude, longitude) of both sites in degrees
+        tx_height, rx_height: antenna heights above ground
+        k_factor: effective Earth radius factor
+        """
+        self.tx: Tuple[deg_t, deg_t] = tx
+        self.rx: Tuple[deg_t, deg_t] = rx
+        self.freq: Hz_t = freq
+        self.tx_height: m_t = tx_height
+        self.rx_height: m_t = rx_height
+        self.method: str = method
+        distance, diffraction_loss, loss = terrain_path_loss(
+            dem,
+            tx[0],
+            tx[1],
+            rx[0],
+            rx[1],
+            freq,
+            tx_height=tx_height,
+            rx_height=rx_height,
+            method=method,
+            samples=samples,
+            k_factor=k_factor,
+        )
+        self.distance: m_t = m_t(float(distance[0]))
+        self.diffraction_loss: dB_t = dB(float(diffraction_loss[0]))
+        PathLoss.__init__(
+            self,
+            name=name or "Terrain",
+            loss=dB(float(loss[0])),
+            oip3=oip3,
+            z_in=z_in,
+            z_out=z_out,
+        )
+
+
+class GaseousAttenuation(PathLoss):
+    """
+    Slant path absorption by oxygen and water vapour, ITU-R P.676 style.
+    See https://www.itu.int/rec/R-REC-P.676
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        freq: Hz_t = Hz(0),
+        elevation: deg_t = deg_t(90),
+        water_vapour_density: float = 7.5,
+        oip3: Optional[dBm_t] = None,
+        z_in: float = 50,
+        z_out: float = 50,
+    ):
+        """
+        water_vapour_density: surface water vapour density (g/m³)
+        """
+        self.freq: Hz_t = freq
+        self.elevation: deg_t = elevation
+        self.water_vapour_density: float = water_vapour_density
+        loss = dB(float(gaseous_attenuation(freq, elevation, water_vapour_density)))
+        PathLoss.__init__(
+            self, name=name or "Gases", loss=loss, oip3=oip3, z_in=z_in, z_out=z_out
+        )
+
+
+class RainAttenuation(PathLoss):
+    """
+    Slant path rain attenuation not exceeded for the given availability,
+    ITU-R P.838 and P.618 style.
+    See https://www.itu.int/rec/R-REC-P.618
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        freq: Hz_t = Hz(0),
+        elevation: deg_t = deg_t(90),
+        rain_rate: float = 0,
+        availability: float = 99.99,
+        latitude: deg_t = deg_t(45),
+        station_height: m_t = m(0),
+        rain_height: m_t = km(3),
+        polarization_tilt: deg_t = deg_t(45),
+        oip3: Optional[dBm_t] = None,
+        z_in: float = 50,
+        z_out: float = 50,
+    ):
+        """
+        rain_rate: rain rate exceeded 0.01% of an average year (mm/h)
+        availability: percentage of time the attenuation is not exceeded
+        polarization_tilt: 0° horizontal, 90° vertical, 45° circular
+        """
+        self.freq: Hz_t = freq
+        self.elevation: deg_t = elevation
+        self.rain_rate: float = rain_rate
+        self.availability: float = availability
+        self.latitude: deg_t = latitude
+        loss = dB(
+            float(
+                rain_attenuation(
+                    freq,
+                    elevation,
+                    rain_rate,
+                    availability=availability,
+                    latitude=latitude,
+                    station_height=station_height,
+                    rain_height=rain_height,
+                    polarization_tilt=polarization_tilt,
+                )
+            )
+        )
+        PathLoss.__init__(
+            self, name=name or "Rain", loss=loss, oip3=oip3, z_in=z_in, z_out=z_out
+        )
+
+
+def path_loss_stage(elements: List[Element]) -> int:
+    """Index of the single propagation model able to evaluate other distances."""
+    stages = [
+        stage for stage, elt in enumerate(elements) if hasattr(elt, "loss_at_distance")
+    ]
+    if len(stages) != 1:
+        raise ValueError("Expected exactly one distance dependent PathLoss element")
+    return stages[0]
+
+
+def sweep_path_loss(budget: Budget, loss: np.ndarray, stage: int) -> Cascade:
+    """
+    Evaluate the budget with the loss (dB) of a PathLoss stage replaced by an array.
+    Results have the stage as first axis followed by the axes of `loss`.
+    """
+    loss = np.asarray(loss, dtype=float)
+    gain, nf, oip3, iip2 = element_columns(budget.elements)
+    shape = (len(budget.elements),) + loss.shape
+    expand = (-1,) + (1,) * loss.ndim
+    gain = np.broadcast_to(gain.reshape(expand), shape).copy()
+    nf = np.broadcast_to(nf.reshape(expand), shape).copy()
+    gain[stage] = -loss
+    nf[stage] = loss
+    return cascade(
+        gain,
+        nf,
+        oip3=oip3.reshape(expand),
+        iip2=iip2.reshape(expand),
+        available_input_power=budget.available_input_power,
+        signal_bandwidth=budget.signal_bandwidth,
+        T_receiver=budget.T_receiver,
+    )
+
+
+def sweep_distance(
+    budget: Budget, distance: np.ndarray, stage: Optional[int] = None
+) -> Cascade:
+    """
+    Evaluate the budget for an array of distances of its propagation model,
+    without building one element and one budget per distance.
+    """
+    if stage is None:
+        stage = path_loss_stage(budget.elements)
+    loss = budget.elements[stage].loss_at_distance(distance)
+    return sweep_path_loss(budget, loss, stage)
@@ -0,0 +1,245 @@
+from typing import Optional, Tuple
+import numpy as np
+from .core import Budget
+from .propagation import path_loss_stage, sweep_path_loss
+from .utils import dB_t, m_t
+
+# Relative accuracy of the series of `detection_probability`
+_TOLERANCE = 1e-10
+
+
+class Swerling:
+    """Target fluctuation models"""
+
+    # Constant cross-section (Marcum)
+    SW0 = 0
+    # Rayleigh amplitude (chi-square with 2 degrees of freedom), constant over a dwell
+    SW1 = 1
+    # Rayleigh amplitude, independent from pulse to pulse
+    SW2 = 2
+    # Chi-square with 4 degrees of freedom, constant over a dwell
+    SW3 = 3
+    # Chi-square with 4 degrees of freedom, independent from pulse to pulse
+    SW4 = 4
+
+
+class Integration:
+    """Pulse integration before the detection threshold"""
+
+    # Pulses summed in phase: the SNR is multiplied by the number of pulses
+    Coherent = "Coherent"
+    # Square law detected pulses summed
+    Noncoherent = "Noncoherent"
+
+
+def _gamma_tail(n: np.ndarray, threshold: np.ndarray) -> np.ndarray:
+    """
+    Upper regularized incomplete gamma function Q(n, threshold) for integer n:
+    the probability that a sum of n unit mean exponential variables exceeds
+    the threshold, exp(-t) sum_{k<n} t^k / k!.
+    """
+    n, t = np.broadcast_arrays(np.asarray(n), np.asarray(threshold, dtype=float))
+    log_t = np.log(np.maximum(t, 1e-300))
+    log_term = -t  # log(t^k exp(-t) / k!)
+    total = np.zeros(t.shape)
+    for k in range(int(n.max())):
+        total += np.where(k < n, np.exp(log_term), 0.0)
+        log_term = log_term + log_t - np.log(k + 1)
+    return np.minimum(total, 1.0)
+
+
+def detection_threshold(pfa: np.ndarray, pulses: np.ndarray = 1) -> np.ndarray:
+    """
+    Threshold on the sum of `pulses` square law detected samples, normalized
+    to the noise power, giving a probability of false alarm `pfa`.
+    Solved by bisection element-wise on arrays.
+    """
+    pfa, n = np.broadcast_arrays(
+        np.asarray(pfa, dtype=float), np.asarray(pulses).astype(int)
+    )
+    if np.any((pfa <= 0) | (pfa >= 1)):
+        raise ValueError("Expected a probability of false alarm in (0, 1)")
+    if np.any(n < 1):
+        raise ValueError("Expected at least one pulse")
+    # Solved once per distinct (pfa, pulses) pair
+    pairs, inverse = np.unique(
+        np.stack([pfa.ravel(), n.ravel()]), axis=1, return_inverse=True
+    )
+    p, k = pairs[0], pairs[1].astype(int)
+    lo = np.zeros(p.shape)
+    hi = k - np.log(p) + 2 * np.sqrt(k * -np.log(p)) + 10
+    for _ in range(100):
+        mid = (lo + hi) / 2
+        above = _gamma_tail(k, mid) > p
+        lo = np.where(above, mid, lo)
+        hi = np.where(above, hi, mid)
+    return ((lo + hi) / 2)[inverse.ravel()].reshape(pfa.shape)
+
+
+def _mixture(swerling: int, n: np.ndarray, x: np.ndarray) -> Tuple[str, np.ndarray, np.ndarray]:
+    """
+    Distribution of the Poisson index of the noncentral sum: Poisson for a
+    constant target, negative binomial (r, mean/r) for fluctuating ones.
+    """
+    if swerling == Swerling.SW0:
+        return "poisson", np.ones(x.shape), n * x
+    elif swerling == Swerling.SW1:
+        return "nbinom", np.ones(x.shape), n * x
+    elif swerling == Swerling.SW2:
+        return "nbinom", n * 1.0, x
+    elif swerling == Swerling.SW3:
+        return "nbinom", np.full(x.shape, 2.0), n * x / 2
+    elif swerling == Swerling.SW4:
+        return "nbinom", 2.0 * n, x / 2
+    raise ValueError("Unexpected Swerling model: {}".format(swerling))
+
+
+def detection_probability(
+    snr: dB_t,
+    pfa: np.ndarray = 1e-6,
+    pulses: np.ndarray = 1,
+    swerling: int = Swerling.SW0,
+    integration: str = Integration.Noncoherent,
+) -> np.ndarray:
+    """
+    Probability of detection for a single pulse SNR (dB), element-wise on
+    arrays of SNR, probability of false alarm and number of pulses.
+
+    With noncoherent integration, the sum of the square law detected pulses
+    is a Poisson mixture of gamma variables: P_d = sum_k w_k Q(N + k, T), the
+    weights w_k being Poisson for a constant target and negative binomial for
+    Swerling targets. The series is summed for all the points at once until
+    its remainder is below 1e-10.
+    Coherent integration multiplies the SNR by the number of pulses before a
+    single pulse detection; it requires a target constant over the dwell.
+    """
+    x = 10 ** (np.asarray(snr, dtype=float) / 10)
+    x, pfa, n = np.broadcast_arrays(
+        x, np.asarray(pfa, dtype=float), np.asarray(pulses).astype(int)
+    )
+    if integration == Integration.Coherent:
+        if swerling in (Swerling.SW2, Swerling.SW4):
+            raise ValueError("Coherent integration expects a Swerling 0, 1 or 3 target")
+        x, n = x * n, np.ones(n.shape, dtype=int)
+    elif integration != Integration.Noncoherent:
+        raise ValueError("Unexpected integration: {}".format(integration))
+    t = detection_threshold(pfa, n)
+    kind, r, scale = _mixture(swerling, n, x)
+
+    # Log of the mixture weights, updated recursively
+    if kind == "poisson":
+        log_w = -scale
+        log_ratio = np.log(np.maximum(scale, 1e-300))
+    else:
+        log_w = -r * np.log1p(scale)
+        log_ratio = np.log(np.maximum(scale, 1e-300)) - np.log1p(scale)
+    # Q(n + k, t) and log of its next increment t^(n+k) exp(-t) / (n+k)!
+    q = _gamma_tail(n, t)
+    log_t = np.log(t)
+    log_term = -t + n * log_t - np.cumsum(np.log(np.arange(1, int(n.max()) + 1)))[n - 1]
+    pd = np.zeros(x.shape)
+    remaining = np.ones(x.shape)
+    k = 0
+    max_terms = 10 * (int(t.max()) + int(n.max())) + 1000
+    while k < max_terms:
+        w = np.exp(log_w)
+        pd += w * q
+        remaining = np.maximum(remaining - w, 0.0)
+        # Q increases with k: the remainder is between remaining*q and remaining
+        if np.all(remaining * (1 - q) < _TOLERANCE):
+            break
+        q = np.minimum(q + np.exp(log_term), 1.0)
+        log_term = log_term + log_t - np.log(n + k + 1)
+        if kind == "poisson":
+            log_w = log_w + log_ratio - np.log(k + 1)
+        else:
+            log_w = log_w + log_ratio + np.log((k + r) / (k + 1))
+        k += 1
+    return np.clip(pd + remaining * q, 0.0, 1.0)
+
+
+def required_snr(
+    pd: np.ndarray,
+    pfa: np.ndarray = 1e-6,
+    pulses: np.ndarray = 1,
+    swerling: int = Swerling.SW0,
+    integration: str = Integration.Noncoherent,
+) -> dB_t:
+    """Single pulse SNR (dB) giving a probability of detection, by bisection."""
+    pd, pfa, n = np.broadcast_arrays(
+        np.asarray(pd, dtype=float), np.asarray(pfa, dtype=float), np.asarray(pulses)
+    )
+    if np.any((pd <= 0) | (pd >= 1)):
+        raise ValueError("Expected a probability of detection in (0, 1)")
+    lo = np.full(pd.shape, -40.0)
+    hi = np.full(pd.shape, 60.0)
+    for _ in range(40):
+        mid = (lo + hi) / 2
+        enough = detection_probability(mid, pfa, n, swerling, integration) >= pd
+        lo = np.where(enough, lo, mid)
+        hi = np.where(enough, mid, hi)
+    return dB_t(hi)
+
+
+def radar_snr(
+    budget: Budget,
+    distance: m_t,
+    sigma: Optional[np.ndarray] = None,
+    stage: Optional[int] = None,
+) -> dB_t:
+    """
+    Single pulse SNR (dB) at the output of a budget whose radar loss model is
+    evaluated at arrays of distances and cross-sections (broadcast together).
+    """
+    if stage is None:
+        stage = path_loss_stage(budget.elements)
+    loss = budget.elements[stage].loss_at_distance(distance, sigma)
+    return dB_t(sweep_path_loss(budget, loss, stage).snr[-1])
+
+
+def detection_probability_vs_range(
+    budget: Budget,
+    distance: m_t,
+    sigma: Optional[np.ndarray] = None,
+    pfa: np.ndarray = 1e-6,
+    pulses: np.ndarray = 1,
+    swerling: int = Swerling.SW0,
+    integration: str = Integration.Noncoherent,
+    stage: Optional[int] = None,
+) -> np.ndarray:
+    """Probability of detection of a target at arrays of distances."""
+    snr = radar_snr(budget, distance, sigma, stage)
+    return detection_probability(snr, pfa, pulses, swerling, integration)
+
+
+def max_detection_range(
+    budget: Budget,
+    pd: np.ndarray = 0.9,
+    pfa: np.ndarray = 1e-6,
+    pulses: np.ndarray = 1,
+    swerling: int = Swerling.SW0,
+    integration: str = Integration.Noncoherent,
+    sigma: Optional[np.ndarray] = None,
+    max_distance: m_t = m_t(1e8),
+    stage: Optional[int] = None,
+) -> m_t:
+    """
+    Largest distance where the probability of detection reaches `pd`,
+    element-wise on arrays of pd, pfa, pulses and cross-sections: the required
+    SNR is solved once, then the distance by bisection on its logarithm.
+    0 when pd is not reached at 1 m, max_distance when reached beyond it.
+    """
+    target = required_snr(pd, pfa, pulses, swerling, integration)
+    if sigma is not None:
+        target, sigma = np.broadcast_arrays(target, np.asarray(sigma, dtype=float))
+    lo = np.zeros(np.shape(target))
+    hi = np.full(np.shape(target), np.log10(float(max_distance)))
+    reached_far = radar_snr(budget, 10**hi, sigma, stage) >= target
+    reached_near = radar_snr(budget, 10**lo, sigma, stage) >= target
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        reached = radar_snr(budget, 10**mid, sigma, stage) >= target
+        lo = np.where(reached, mid, lo)
+        hi = np.where(reached, hi, mid)
+    distance = np.where(reached_far, float(max_distance), 10**lo)
+    return m_t(np.where(reached_near, distance, 0.0))
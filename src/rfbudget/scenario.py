@@ -0,0 +1,298 @@
+import csv
+import json
+import os
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+import numpy as np
+from .cable import cable_type
+from .core import Cascade, cascade
+from .propagation import free_space_path_loss
+from .utils import loss_temp_to_nf
+
+Columns = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+Value = Union[float, str]
+
+
+def _two_ports(params: Dict[str, np.ndarray]) -> Columns:
+    gain = params.get("gain", 0.0)
+    nf = params.get("nf", 0.0)
+    oip3 = params.get("oip3")
+    if oip3 is None:
+        iip3 = params.get("iip3")
+        oip3 = np.inf if iip3 is None else iip3 + gain
+    iip2 = params.get("iip2")
+    if iip2 is None:
+        oip2 = params.get("oip2")
+        iip2 = np.inf if oip2 is None else oip2 - gain
+    return gain, nf, oip3, iip2
+
+
+def _lossy(loss: np.ndarray, params: Dict[str, np.ndarray]) -> Columns:
+    temp = params.get("temp")
+    nf = loss if temp is None else loss_temp_to_nf(loss, temp)
+    return -loss, nf, params.get("oip3", np.inf), np.inf
+
+
+def _loss(params: Dict[str, np.ndarray]) -> Columns:
+    return _lossy(params.get("loss", 0.0), params)
+
+
+def _cable(params: Dict[str, np.ndarray]) -> Columns:
+    if "cable_type" in params:
+        if np.any(np.asarray(params["freq"]) <= 0):
+            raise ValueError("Expected a positive frequency with a cable type")
+        loss_per_m = cable_type(params["cable_type"]).loss_per_m(params["freq"])
+    else:
+        loss_per_m = params.get("loss_per_m", 0.0)
+    return _lossy(params.get("length", 0.0) * loss_per_m, params)
+
+
+def _free_space(params: Dict[str, np.ndarray]) -> Columns:
+    return _lossy(free_space_path_loss(params["distance"], params["freq"]), params)
+
+
+# Element types of a scenario and the functions computing their stage columns
+STAGE_KINDS: Dict[str, Callable[[Dict[str, np.ndarray]], Columns]] = {
+    "Antenna": _two_ports,
+    "TwoPortsElement": _two_ports,
+    "Amplifier": _two_ports,
+    "Modulator": _two_ports,
+    "Filter": _two_ports,
+    "BandpassFilter": _two_ports,
+    "ButterworthBandpassFilter": _two_ports,
+    "Loss": _loss,
+    "PathLoss": _loss,
+    "Cable": _cable,
+    "FreeSpacePathLossFriis": _free_space,
+}
+
+_TWO_PORTS = frozenset(("gain", "nf", "oip3", "iip3", "iip2", "oip2"))
+_LOSSY = frozenset(("temp", "oip3"))
+
+# Parameters read by the functions of STAGE_KINDS, any other one is an error
+STAGE_PARAMETERS: Dict[str, FrozenSet[str]] = {
+    **{kind: _TWO_PORTS for kind, fn in STAGE_KINDS.items() if fn is _two_ports},
+    "Loss": _LOSSY | {"loss"},
+    "PathLoss": _LOSSY | {"loss"},
+    "Cable": _LOSSY | {"length", "loss_per_m", "cable_type", "freq"},
+    "FreeSpacePathLossFriis": _LOSSY | {"distance", "freq"},
+}
+
+# Parameters given as text rather than numbers or axes
+TEXT_PARAMETERS = ("cable_type",)
+
+
+class Stage:
+    """One element of a scenario chain, parameters are numbers or `$axis` references"""
+
+    def __init__(self, name: str, kind: str, params: Dict[str, Value]):
+        if kind not in STAGE_KINDS:
+            raise ValueError("Unexpected element type: {}".format(kind))
+        unknown = sorted(set(params) - STAGE_PARAMETERS[kind])
+        if unknown:
+            raise ValueError(
+                "Unexpected parameters of {} {}: {}".format(kind, name, ", ".join(unknown))
+            )
+        if "cable_type" in params:
+            if "freq" not in params:
+                raise ValueError("Expected a frequency with a cable type")
+            if "loss_per_m" in params:
+                raise ValueError("Expected either loss_per_m or a cable type")
+            cable_type(params["cable_type"])
+        self.name: str = name
+        self.kind: str = kind
+        self.params: Dict[str, Value] = params
+
+
+def _axis_name(value: Value) -> Optional[str]:
+    if isinstance(value, str) and value.startswith("$"):
+        return value[1:]
+    return None
+
+
+class EvaluationPlan:
+    """
+    Columnar form of a family of budgets: a program of stages whose parameters
+    are constants or axes, and the axes combined as a cartesian product or
+    zipped together. Variants are numbered and evaluated by slices, without
+    building `Element` or `Budget` objects.
+    """
+
+    PRODUCT = "product"
+    ZIP = "zip"
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        axes: Optional[Dict[str, np.ndarray]] = None,
+        combine: str = PRODUCT,
+        available_input_power: Value = 0.0,
+        signal_bandwidth: Value = 1.0,
+        T_receiver: Value = 290.0,
+    ):
+        if combine not in (self.PRODUCT, self.ZIP):
+            raise ValueError("Expected combine to be 'product' or 'zip'")
+        self.stages: List[Stage] = stages
+        self.axes: Dict[str, np.ndarray] = {
+            name: np.atleast_1d(np.asarray(values, dtype=float))
+            for name, values in (axes or {}).items()
+        }
+        self.combine: str = combine
+        self.available_input_power: Value = available_input_power
+        self.signal_bandwidth: Value = signal_bandwidth
+        self.T_receiver: Value = T_receiver
+        if combine == self.ZIP and len({len(v) for v in self.axes.values()}) > 1:
+            raise ValueError("Expected zipped axes of the same length")
+        values = [v for stage in stages for v in stage.params.values()]
+        values += [available_input_power, signal_bandwidth, T_receiver]
+        for value in values:
+            axis = _axis_name(value)
+            if axis is not None and axis not in self.axes:
+                raise ValueError("Unknown axis: {}".format(axis))
+
+    @property
+    def names(self) -> List[str]:
+        return [stage.name for stage in self.stages]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of the variant grid, one dimension per axis for a product."""
+        lengths = tuple(len(v) for v in self.axes.values())
+        if self.combine == self.ZIP:
+            return lengths[:1]
+        return lengths
+
+    def __len__(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    def axis_values(self, start: int = 0, stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Value of every axis for the variants in [start, stop)."""
+        index = np.arange(start, len(self) if stop is None else min(stop, len(self)))
+        if self.combine == self.ZIP:
+            return {name: v[index] for name, v in self.axes.items()}
+        positions = np.unravel_index(index, self.shape) if self.axes else ()
+        return {name: v[i] for (name, v), i in zip(self.axes.items(), positions)}
+
+    def _resolve(self, value: Value, axes: Dict[str, np.ndarray]) -> Any:
+        axis = _axis_name(value)
+        if axis is not None:
+            return axes[axis]
+        if isinstance(value, str):
+            return value
+        return float(value)
+
+    def columns(self, start: int = 0, stop: Optional[int] = None) -> Columns:
+        """Gain, noise figure, OIP3 and IIP2 with shape (stages, variants)."""
+        axes = self.axis_values(start, stop)
+        n = len(next(iter(axes.values()))) if axes else 1
+        out = np.empty((4, len(self.stages), n))
+        for i, stage in enumerate(self.stages):
+            params = {k: self._resolve(v, axes) for k, v in stage.params.items()}
+            for j, column in enumerate(STAGE_KINDS[stage.kind](params)):
+                out[j, i] = column
+        return out[0], out[1], out[2], out[3]
+
+    def evaluate(self, start: int = 0, stop: Optional[int] = None) -> Cascade:
+        """Cascade of the variants in [start, stop), stage first then variants."""
+        axes = self.axis_values(start, stop)
+        gain, nf, oip3, iip2 = self.columns(start, stop)
+        return cascade(
+            gain,
+            nf,
+            oip3=oip3,
+            iip2=iip2,
+            available_input_power=self._resolve(self.available_input_power, axes),
+            signal_bandwidth=self._resolve(self.signal_bandwidth, axes),
+            T_receiver=self._resolve(self.T_receiver, axes),
+        )
+
+
+def _axis(spec: Any) -> np.ndarray:
+    if isinstance(spec, dict):
+        if "num" in spec:
+            return np.linspace(spec["start"], spec["stop"], int(spec["num"]))
+        return np.arange(spec["start"], spec["stop"], spec.get("step", 1))
+    return np.atleast_1d(np.asarray(spec, dtype=float))
+
+
+def _read_csv(path: str) -> List[Dict[str, str]]:
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _parse(value: Any) -> Value:
+    if isinstance(value, str):
+        value = value.strip()
+        return value if value.startswith("$") else float(value)
+    return value
+
+
+def compile_scenario(spec: Dict[str, Any], base_dir: str = ".") -> EvaluationPlan:
+    """
+    Compile a scenario description into an evaluation plan.
+
+    chain: list of elements with a `type` (or a `template`), an optional
+        `name` and their parameters, numbers or `$axis` references (the
+        `cable_type` of a Cable is a name of `CABLES`). Parameters that the
+        type does not use (see STAGE_PARAMETERS) are rejected.
+    templates: named elements shared by the chain, overridden by its entries
+    axes: name -> list of values or {start, stop, num} / {start, stop, step}
+    variants: CSV file whose columns are axes, one row per variant (zipped)
+    combine: "product" (default, or "zip" with variants) of the axes
+    available_input_power, signal_bandwidth, T_receiver: numbers or `$axis`
+    """
+    templates = spec.get("templates", {})
+    stages = []
+    for i, entry in enumerate(spec["chain"]):
+        entry = dict(entry)
+        template = entry.pop("template", None)
+        if template:
+            if template not in templates:
+                raise ValueError("Unknown template: {}".format(template))
+            entry = {**templates[template], **entry}
+        kind = entry.pop("type", None)
+        name = entry.pop("name", None) or template or kind or "Stage{}".format(i)
+        params = {
+            k: v.strip() if k in TEXT_PARAMETERS and isinstance(v, str) else _parse(v)
+            for k, v in entry.items()
+            if v not in (None, "")
+        }
+        stages.append(Stage(name, kind, params))
+
+    axes = {name: _axis(values) for name, values in spec.get("axes", {}).items()}
+    combine = spec.get("combine", EvaluationPlan.PRODUCT)
+    if "variants" in spec:
+        rows = _read_csv(os.path.join(base_dir, spec["variants"]))
+        for column in rows[0] if rows else []:
+            axes[column] = np.array([float(row[column]) for row in rows])
+        combine = spec.get("combine", EvaluationPlan.ZIP)
+    return EvaluationPlan(
+        stages,
+        axes,
+        combine=combine,
+        available_input_power=_parse(spec.get("available_input_power", 0.0)),
+        signal_bandwidth=_parse(spec.get("signal_bandwidth", 1.0)),
+        T_receiver=_parse(spec.get("T_receiver", 290.0)),
+    )
+
+
+def load_scenario(path: str) -> EvaluationPlan:
+    """
+    Load a scenario from a JSON or YAML (requires PyYAML) file, or a chain
+    from a CSV file with one row per element and a `type` column.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    base_dir = os.path.dirname(path)
+    if ext == ".csv":
+        return compile_scenario({"chain": _read_csv(path)}, base_dir)
+    with open(path) as f:
+        if ext in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Loading YAML scenarios requires PyYAML")
+            spec = yaml.safe_load(f)
+        elif ext == ".json":
+            spec = json.load(f)
+        else:
+            raise ValueError("Unexpected scenario file extension: {}".format(ext))
+    return compile_scenario(spec, base_dir)
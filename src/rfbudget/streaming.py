@@ -0,0 +1,114 @@
+import json
+import os
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+import numpy as np
+
+DEFAULT_METRICS = ("output_power", "nf", "snr")
+PROGRESS_FILE = "progress.json"
+
+
+def _stage_index(stages: Optional[Sequence[int]], n_stages: int) -> np.ndarray:
+    if stages is None:
+        return np.arange(n_stages)
+    return np.arange(n_stages)[list(stages)]
+
+
+def iter_sweep(
+    plan: Any,
+    chunk_size: int = 1 << 20,
+    metrics: Sequence[str] = DEFAULT_METRICS,
+    stages: Optional[Sequence[int]] = None,
+    dtype: type = np.float32,
+    start: int = 0,
+) -> Iterator[Tuple[int, int, Dict[str, np.ndarray]]]:
+    """
+    Evaluate a plan (e.g. an `EvaluationPlan`) chunk by chunk.
+    Yield (start, stop, results) where results maps each metric of `Cascade`
+    to an array of shape (selected stages, stop - start).
+    stages: indices of the stages to keep, e.g. [-1] for the last one only.
+    """
+    total = len(plan)
+    for lo in range(start, total, chunk_size):
+        hi = min(lo + chunk_size, total)
+        result = plan.evaluate(lo, hi)
+        index = None
+        chunk = {}
+        for name in metrics:
+            values = getattr(result, name)
+            if index is None:
+                index = _stage_index(stages, values.shape[0])
+            chunk[name] = np.broadcast_to(values[index], (len(index), hi - lo)).astype(dtype)
+        yield lo, hi, chunk
+
+
+class StreamedSweep:
+    """Results of a streamed sweep, memory mapped `.npy` arrays of shape (stages, points)"""
+
+    def __init__(self, directory: str, arrays: Dict[str, np.ndarray], completed: int):
+        self.directory: str = directory
+        self.arrays: Dict[str, np.ndarray] = arrays
+        self.completed: int = completed
+
+    def __getitem__(self, metric: str) -> np.ndarray:
+        return self.arrays[metric]
+
+
+def _write_progress(path: str, progress: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(progress, f)
+    os.replace(tmp, path)
+
+
+def stream_sweep(
+    plan: Any,
+    output_dir: str,
+    chunk_size: int = 1 << 20,
+    metrics: Sequence[str] = DEFAULT_METRICS,
+    stages: Optional[Sequence[int]] = None,
+    dtype: type = np.float32,
+    resume: bool = True,
+) -> StreamedSweep:
+    """
+    Evaluate a plan chunk by chunk into one memory mapped `<metric>.npy` file
+    per metric in `output_dir`, so that results never need to fit in memory.
+    The number of completed points is recorded in `progress.json` after each
+    chunk; with `resume` an interrupted sweep restarts from there.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    total = len(plan)
+    n_stages = len(plan.stages)
+    selected = _stage_index(stages, n_stages)
+    config = {
+        "total": total,
+        "metrics": list(metrics),
+        "stages": selected.tolist(),
+        "dtype": np.dtype(dtype).str,
+    }
+    progress_path = os.path.join(output_dir, PROGRESS_FILE)
+    completed = 0
+    if resume and os.path.exists(progress_path):
+        with open(progress_path) as f:
+            progress = json.load(f)
+        if {k: progress.get(k) for k in config} != config:
+            raise ValueError("Expected the sweep in {} to match the plan".format(output_dir))
+        completed = progress["completed"]
+
+    mode = "r+" if completed else "w+"
+    arrays = {
+        name: np.lib.format.open_memmap(
+            os.path.join(output_dir, name + ".npy"),
+            mode=mode,
+            dtype=dtype,
+            shape=(len(selected), total),
+        )
+        for name in metrics
+    }
+    for lo, hi, chunk in iter_sweep(plan, chunk_size, metrics, selected, dtype, completed):
+        for name, values in chunk.items():
+            arrays[name][:, lo:hi] = values
+        for array in arrays.values():
+            array.flush()
+        completed = hi
+        _write_progress(progress_path, dict(config, completed=completed))
+    return StreamedSweep(output_dir, arrays, completed)
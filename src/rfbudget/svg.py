@@ -0,0 +1,221 @@
+from html import escape
+from typing import Any, Dict, List, Optional
+from .core import Element
+
+# Native SVG block diagrams, drawn from constant symbol templates without
+# schemdraw nor matplotlib. Symbols are laid out in cells of CELL_WIDTH with
+# the signal line at LINE_Y.
+CELL_WIDTH = 80
+SYMBOL_WIDTH = 50
+LINE_Y = 90
+HEIGHT = 170
+STROKE = 'stroke="black" stroke-width="1.5"'
+
+_BOX = '<rect x="13" y="{top}" width="24" height="24" fill="{{fill}}" {stroke}/>'.format(
+    top=LINE_Y - 12, stroke=STROKE
+)
+_WAVE = '<path d="M13,{y} q3,-5 6,0 t6,0 t6,0 t6,0" fill="none" {stroke}/>'
+
+SYMBOLS: Dict[str, str] = {
+    "antenna": (
+        '<path d="M25,{y} V{top} M25,{top} L13,{tip} M25,{top} L37,{tip} M13,{tip} H37" '
+        'fill="none" {stroke}/>'
+    ).format(y=LINE_Y, top=LINE_Y - 24, tip=LINE_Y - 40, stroke=STROKE),
+    "amplifier": (
+        '<polygon points="5,{a} 5,{b} 45,{y}" fill="lightblue" {stroke}/>'
+    ).format(a=LINE_Y - 20, b=LINE_Y + 20, y=LINE_Y, stroke=STROKE),
+    "pathloss": _BOX.format(fill="#eeeeff"),
+    "loss": _BOX.format(fill="#ffeeee"),
+    "box": _BOX.format(fill="white"),
+    "filter": (
+        '<rect x="5" y="{top}" width="40" height="40" fill="thistle" {stroke}/>'
+        + _WAVE.format(y=LINE_Y, stroke=STROKE)
+    ).format(top=LINE_Y - 20, stroke=STROKE),
+    "bandpass": (
+        '<rect x="5" y="{top}" width="40" height="40" fill="thistle" {stroke}/>'
+        + _WAVE.format(y=LINE_Y - 10, stroke=STROKE)
+        + _WAVE.format(y=LINE_Y, stroke=STROKE)
+        + _WAVE.format(y=LINE_Y + 10, stroke=STROKE)
+        + '<path d="M22,{a} l6,-6 M22,{b} l6,-6" {stroke}/>'
+    ).format(
+        top=LINE_Y - 20, a=LINE_Y - 7, b=LINE_Y + 13, stroke=STROKE
+    ),
+    "mixer": (
+        '<circle cx="25" cy="{y}" r="16" fill="navajowhite" {stroke}/>'
+        '<path d="M14,{a} L36,{b} M14,{b} L36,{a} M25,{c} V{d}" fill="none" {stroke}/>'
+        '<circle cx="25" cy="{o}" r="10" fill="navajowhite" {stroke}/>'
+        '<path d="M18,{o} q3.5,-7 7,0 t7,0" fill="none" {stroke}/>'
+        '<text x="39" y="{o}" font-size="10" dominant-baseline="middle">LO</text>'
+    ).format(
+        y=LINE_Y,
+        a=LINE_Y - 11,
+        b=LINE_Y + 11,
+        c=LINE_Y + 16,
+        d=LINE_Y + 42,
+        o=LINE_Y + 52,
+        stroke=STROKE,
+    ),
+}
+
+_HEADER = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" '
+    'viewBox="0 0 {w} {h}" font-family="sans-serif">'
+)
+
+
+def symbol_name(elt: Element) -> str:
+    from .elements import Antenna, Amplifier, Loss, PathLoss, Modulator, Filter, BandpassFilter
+
+    if isinstance(elt, Antenna):
+        return "antenna"
+    elif isinstance(elt, Amplifier):
+        return "amplifier"
+    elif isinstance(elt, PathLoss):
+        return "pathloss"
+    elif isinstance(elt, Loss):
+        return "loss"
+    elif isinstance(elt, Modulator):
+        return "mixer"
+    elif isinstance(elt, BandpassFilter):
+        return "bandpass"
+    elif isinstance(elt, Filter):
+        return "filter"
+    return "box"
+
+
+def model_label(elt: Element) -> str:
+    """Inputs of a propagation model shown above its symbol."""
+    from .propagation import (
+        FreeSpacePathLossFriis,
+        RadarFreeSpaceBasicLoss,
+        OkumuraHataPathLoss,
+        CostHataPathLoss,
+    )
+
+    if isinstance(elt, FreeSpacePathLossFriis):
+        return "d={0:.2f}m\n".format(elt.distance)
+    elif isinstance(elt, RadarFreeSpaceBasicLoss):
+        return "d={0:.2f}m\nσ={1:.2f}m\n".format(elt.distance, elt.sigma)
+    elif isinstance(elt, (OkumuraHataPathLoss, CostHataPathLoss)):
+        return "d={0:.2f}m\nh_b={1:.2f}m\nh_m={2:.2f}m\n".format(
+            elt.distance, elt.base_height, elt.mobile_height
+        )
+    return ""
+
+
+def attribute_label(elt: Element, options: dict, lbl: Optional[str] = None) -> str:
+    """Text shown above a symbol according to the `with_*` options."""
+    lbl = "" if lbl is None else str(lbl)
+    if options.get("with_gain") and elt.gain is not None:
+        lbl += "gain={0:.2f}dB\n".format(elt.gain)
+    if options.get("with_nf") and elt.nf:
+        lbl += "NF={0:.2f}dB\n".format(elt.nf)
+    if options.get("with_iip") and elt.iip3:
+        lbl += "IIP3={0:.2f}dB\n".format(elt.iip3)
+    if options.get("with_oip") and elt.oip3:
+        lbl += "OIP3={0:.2f}dB\n".format(elt.oip3)
+    return lbl
+
+
+def _set_defaults(options: Optional[dict]) -> dict:
+    options = dict(options or {})
+    options.setdefault("simplified", True)
+    options.setdefault("with_gain", not options["simplified"])
+    options.setdefault("with_nf", not options["simplified"])
+    options.setdefault("with_iip", not options["simplified"])
+    options.setdefault("with_oip", not options["simplified"])
+    options.setdefault("label-font-size", 12)
+    options.setdefault("attr-font-size", 10)
+    return options
+
+
+def _element_svg(elt: Element, options: dict) -> List[str]:
+    """Symbol and labels of an element in cell coordinates."""
+    symbol = symbol_name(elt)
+    parts = [SYMBOLS[symbol]]
+    name_y = LINE_Y + (78 if symbol == "mixer" else 40)
+    parts.append(
+        '<text x="25" y="{}" font-size="{}" text-anchor="middle">{}</text>'.format(
+            name_y, options["label-font-size"], escape(elt.name)
+        )
+    )
+    lines = attribute_label(elt, options, model_label(elt)).splitlines()
+    size = options["attr-font-size"]
+    for i, line in enumerate(reversed(lines)):
+        parts.append(
+            '<text x="25" y="{}" font-size="{}" text-anchor="middle">{}</text>'.format(
+                LINE_Y - 46 - i * (size + 2), size, escape(line)
+            )
+        )
+    return parts
+
+
+def into_svg(
+    elements: List[Element], options: Optional[dict] = None, as_html_table: bool = False
+) -> str:
+    """
+    Block diagram of a chain as SVG text, with the symbols of `into_schemdraw`.
+    With as_html_table, one `<td>` holding a standalone SVG per element.
+    """
+    from .elements import PathLoss, Antenna
+
+    options = _set_defaults(options)
+    if as_html_table:
+        return "".join(
+            "<td>{}{}</svg></td>".format(
+                _HEADER.format(w=SYMBOL_WIDTH, h=HEIGHT), "".join(_element_svg(elt, options))
+            )
+            for elt in elements
+        )
+    parts = []
+    wire = SYMBOL_WIDTH + 5
+    for i, elt in enumerate(elements):
+        x = i * CELL_WIDTH
+        parts.append('<g transform="translate({},0)">'.format(x))
+        parts.extend(_element_svg(elt, options))
+        parts.append("</g>")
+        last = i == len(elements) - 1
+        if last and isinstance(elt, Antenna):
+            continue
+        # Path losses are not wired, as in the schemdraw diagrams
+        nxt = None if last else elements[i + 1]
+        if isinstance(elt, PathLoss) or isinstance(nxt, PathLoss):
+            continue
+        start = x + (37 if symbol_name(elt) in ("pathloss", "loss", "box") else 45)
+        if symbol_name(elt) == "antenna":
+            start = x + 25
+        end = x + CELL_WIDTH + (
+            13 if nxt is not None and symbol_name(nxt) in ("pathloss", "loss", "box") else 5
+        )
+        if nxt is not None and symbol_name(nxt) == "antenna":
+            end = x + CELL_WIDTH + 25
+        if last:
+            end = start + wire // 2
+            parts.append(
+                '<path d="M{0},{1} L{2},{1}" {3}/><polygon points="{2},{4} {2},{5} {6},{1}"/>'.format(
+                    start, LINE_Y, end, STROKE, LINE_Y - 4, LINE_Y + 4, end + 8
+                )
+            )
+        else:
+            parts.append('<path d="M{0},{1} L{2},{1}" {3}/>'.format(start, LINE_Y, end, STROKE))
+    width = max(len(elements) * CELL_WIDTH, 1)
+    return _HEADER.format(w=width, h=HEIGHT) + "".join(parts) + "</svg>"
+
+
+def render_schematic(
+    elements: List[Element],
+    options: Optional[dict] = None,
+    as_html_table: bool = False,
+    renderer: str = "schemdraw",
+) -> Any:
+    """
+    Block diagram of a chain with the selected renderer: "schemdraw" returns a
+    schemdraw Drawing (or HTML cells), "svg" returns SVG text from `into_svg`.
+    """
+    if renderer == "svg":
+        return into_svg(elements, options, as_html_table=as_html_table)
+    elif renderer == "schemdraw":
+        from .visualizer import into_schemdraw
+
+        return into_schemdraw(elements, options, as_html_table=as_html_table)
+    raise ValueError("Unexpected renderer: {}".format(renderer))
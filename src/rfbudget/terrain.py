@@ -0,0 +1,224 @@
+import os
+from collections import OrderedDict
+from typing import Optional, Tuple
+import numpy as np
+from .physics import great_circle_distance
+from .utils import Hz_t, m_t, EARTH_RADIUS, SPEED_OF_LIGHT
+
+SRTM_VOID = -32768
+
+
+class DigitalElevationModel:
+    """
+    Elevation data read from a directory of SRTM `.hgt` tiles.
+
+    Each tile covers one degree square and is named after its south-west
+    corner (e.g. N45E006.hgt). Tiles are big-endian int16 rasters (1201x1201 or
+    3601x3601) memory mapped on first use and kept in a LRU cache.
+    Missing tiles and voids read as `fill` (sea level by default).
+    """
+
+    def __init__(self, directory: str, cache_size: int = 16, fill: m_t = m_t(0)):
+        self.directory: str = directory
+        self.cache_size: int = cache_size
+        self.fill: m_t = fill
+        self._tiles: "OrderedDict[Tuple[int, int], Optional[np.ndarray]]" = OrderedDict()
+
+    @staticmethod
+    def tile_name(lat: int, lon: int) -> str:
+        return "{}{:02d}{}{:03d}.hgt".format(
+            "N" if lat >= 0 else "S", abs(lat), "E" if lon >= 0 else "W", abs(lon)
+        )
+
+    def tile(self, lat: int, lon: int) -> Optional[np.ndarray]:
+        key = (lat, lon)
+        if key in self._tiles:
+            self._tiles.move_to_end(key)
+            return self._tiles[key]
+        path = os.path.join(self.directory, self.tile_name(lat, lon))
+        data = None
+        if os.path.exists(path):
+            n = int(round(np.sqrt(os.path.getsize(path) // 2)))
+            data = np.memmap(path, dtype=">i2", mode="r", shape=(n, n))
+        self._tiles[key] = data
+        if len(self._tiles) > self.cache_size:
+            self._tiles.popitem(last=False)
+        return data
+
+    def elevation(self, lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+        """Bilinear interpolated elevation (m) at points given in degrees."""
+        lat, lon = np.broadcast_arrays(
+            np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+        )
+        out = np.full(lat.shape, float(self.fill))
+        tile_lat = np.floor(lat).astype(int)
+        tile_lon = np.floor(lon).astype(int)
+        keys = (tile_lat + 90) * 360 + (tile_lon + 180)
+        for key in np.unique(keys):
+            sel = keys == key
+            lat_i = int(key // 360) - 90
+            lon_i = int(key % 360) - 180
+            data = self.tile(lat_i, lon_i)
+            if data is None:
+                continue
+            n = data.shape[0]
+            # Row 0 is the northern edge, column 0 the western edge
+            y = (lat_i + 1 - lat[sel]) * (n - 1)
+            x = (lon[sel] - lon_i) * (n - 1)
+            y0 = np.clip(np.floor(y).astype(int), 0, n - 2)
+            x0 = np.clip(np.floor(x).astype(int), 0, n - 2)
+            fy = y - y0
+            fx = x - x0
+            h = [
+                data[y0 + dy, x0 + dx].astype(float)
+                for dy, dx in ((0, 0), (0, 1), (1, 0), (1, 1))
+            ]
+            h = [np.where(v == SRTM_VOID, float(self.fill), v) for v in h]
+            out[sel] = (
+                h[0] * (1 - fy) * (1 - fx)
+                + h[1] * (1 - fy) * fx
+                + h[2] * fy * (1 - fx)
+                + h[3] * fy * fx
+            )
+        return out
+
+    def profiles(
+        self,
+        tx_lat: np.ndarray,
+        tx_lon: np.ndarray,
+        rx_lat: np.ndarray,
+        rx_lon: np.ndarray,
+        samples: int = 256,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Terrain profiles between pairs of points, sampled linearly in latitude
+        and longitude (fine for terrestrial links up to a few hundred km).
+        Return the distance from the transmitter and the elevation of each
+        sample, both with shape (links, samples).
+        """
+        tx_lat, tx_lon, rx_lat, rx_lon = (
+            np.atleast_1d(np.asarray(v, dtype=float))
+            for v in np.broadcast_arrays(tx_lat, tx_lon, rx_lat, rx_lon)
+        )
+        t = np.linspace(0, 1, samples)
+        lat = tx_lat[:, None] + t * (rx_lat - tx_lat)[:, None]
+        lon = tx_lon[:, None] + t * (rx_lon - tx_lon)[:, None]
+        distance = great_circle_distance(tx_lat, tx_lon, rx_lat, rx_lon)
+        return distance[:, None] * t, self.elevation(lat, lon)
+
+
+def knife_edge_loss(v: np.ndarray) -> np.ndarray:
+    """
+    Diffraction loss J(v) of a single knife edge, see ITU-R P.526 eq. 31.
+    """
+    v = np.asarray(v, dtype=float)
+    with np.errstate(invalid="ignore"):
+        j = 6.9 + 20 * np.log10(np.sqrt((v - 0.1) ** 2 + 1) + v - 0.1)
+    return np.where(v > -0.78, j, 0.0)
+
+
+def _earth_bulge(distance: np.ndarray, heights: np.ndarray, k_factor: float) -> np.ndarray:
+    d = distance[:, -1:]
+    return heights + distance * (d - distance) / (2 * k_factor * EARTH_RADIUS)
+
+
+def bullington_loss(
+    distance: np.ndarray,
+    heights: np.ndarray,
+    tx_height: m_t,
+    rx_height: m_t,
+    freq: Hz_t,
+    k_factor: float = 4 / 3,
+) -> np.ndarray:
+    """
+    Bullington diffraction loss (dB) over terrain profiles of shape (links, samples),
+    see ITU-R P.526-15 section 4.5.1.
+    tx_height, rx_height: antenna heights above ground at both ends.
+    """
+    lam = SPEED_OF_LIGHT / np.asarray(freq, dtype=float).reshape(-1, 1)
+    links = distance.shape[0]
+    if distance.shape[1] < 3:
+        return np.zeros(links)
+    h = _earth_bulge(distance, heights, k_factor)
+    d = distance[:, -1:]
+    hts = heights[:, :1] + np.asarray(tx_height, dtype=float).reshape(-1, 1)
+    hrs = heights[:, -1:] + np.asarray(rx_height, dtype=float).reshape(-1, 1)
+    di = distance[:, 1:-1]
+    hi = h[:, 1:-1]
+
+    stim = np.max((hi - hts) / di, axis=1, keepdims=True)
+    str_ = (hrs - hts) / d
+    # Line of sight: highest diffraction parameter along the path
+    v = (hi - (hts * (d - di) + hrs * di) / d) * np.sqrt(2 * d / (lam * di * (d - di)))
+    vmax = np.max(v, axis=1, keepdims=True)
+    # Transhorizon: equivalent knife edge at the intersection of both slopes
+    srim = np.max((hi - hrs) / (d - di), axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        db = (hrs - hts + srim * d) / (stim + srim)
+        vb = (hts + stim * db - (hts * (d - db) + hrs * db) / d) * np.sqrt(
+            2 * d / (lam * db * (d - db))
+        )
+    luc = knife_edge_loss(np.where(stim < str_, vmax, vb))[:, 0]
+    return luc + (1 - np.exp(-luc / 6)) * (10 + 0.02 * d[:, 0] / 1000)
+
+
+def _max_v(
+    distance: np.ndarray,
+    h: np.ndarray,
+    ia: np.ndarray,
+    ib: np.ndarray,
+    ha: np.ndarray,
+    hb: np.ndarray,
+    lam: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Highest diffraction parameter strictly between samples ia and ib of each link."""
+    rows = np.arange(distance.shape[0])
+    idx = np.arange(distance.shape[1])
+    inside = (idx > ia[:, None]) & (idx < ib[:, None])
+    da = distance[rows, ia][:, None]
+    db = distance[rows, ib][:, None]
+    d1 = distance - da
+    d2 = db - distance
+    with np.errstate(divide="ignore", invalid="ignore"):
+        line = (ha[:, None] * d2 + hb[:, None] * d1) / (db - da)
+        v = (h - line) * np.sqrt(2 * (db - da) / (lam * d1 * d2))
+    v = np.where(inside, v, -np.inf)
+    imax = np.argmax(v, axis=1)
+    return v[rows, imax], imax
+
+
+def deygout_loss(
+    distance: np.ndarray,
+    heights: np.ndarray,
+    tx_height: m_t,
+    rx_height: m_t,
+    freq: Hz_t,
+    k_factor: float = 4 / 3,
+) -> np.ndarray:
+    """
+    Deygout diffraction loss (dB) limited to three edges: the main edge and
+    the highest secondary edge on each side, with the empirical correction of
+    ITU-R P.526-10 section 4.5.1.
+    """
+    links, samples = distance.shape
+    if samples < 3:
+        return np.zeros(links)
+    lam = SPEED_OF_LIGHT / np.asarray(freq, dtype=float).reshape(-1, 1)
+    lam = np.broadcast_to(lam, (links, 1))
+    h = _earth_bulge(distance, heights, k_factor)
+    hts = heights[:, 0] + np.broadcast_to(np.asarray(tx_height, dtype=float), links)
+    hrs = heights[:, -1] + np.broadcast_to(np.asarray(rx_height, dtype=float), links)
+    rows = np.arange(links)
+    first = np.zeros(links, dtype=int)
+    last = np.full(links, samples - 1)
+
+    vp, p = _max_v(distance, h, first, last, hts, hrs, lam)
+    hp = h[rows, p]
+    vt, _ = _max_v(distance, h, first, p, hts, hp, lam)
+    vr, _ = _max_v(distance, h, p, last, hp, hrs, lam)
+    jp = knife_edge_loss(vp)
+    t = 1 - np.exp(-jp / 6)
+    c = 8 + 0.04 * distance[:, -1] / 1000
+    return jp + np.where(
+        vp > -0.78, t * (knife_edge_loss(vt) + knife_edge_loss(vr) + c), 0.0
+    )
@@ -0,0 +1,107 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .core import Budget, Cascade, Element, cascade, element_columns
+from .elements import Filter, Loss, PathLoss
+from .utils import kelvin_t, loss_temp_to_nf
+
+# Direction of the worst value of the metrics of a cascade
+WORST: Dict[str, str] = {
+    "output_power": "min",
+    "transducer_gain": "min",
+    "nf": "max",
+    "snr": "min",
+    "capacity": "min",
+    "total_noise_temp": "max",
+    "oip3": "min",
+    "iip3": "min",
+    "oip2": "min",
+    "iip2": "min",
+}
+
+
+class Corner:
+    """Worst value of a metric over a temperature sweep and its temperature"""
+
+    def __init__(self, metric: str, value: float, temp: kelvin_t):
+        self.metric: str = metric
+        self.value: float = value
+        self.temp: kelvin_t = temp
+
+    def __repr__(self) -> str:
+        return "Corner({}={:.2f} at {:.2f} K)".format(self.metric, self.value, self.temp)
+
+
+def element_columns_at(
+    elements: List[Element], temp: kelvin_t
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gain, noise figure, OIP3 and IIP2 of the elements at physical temperatures
+    (K), with the stage as first axis followed by the axes of `temp`.
+    Lossy stages (except propagation) have their loss drifting by `loss_tc` and
+    their noise figure at the physical temperature. Filters without gain are
+    passive: their loss (-gain) is fixed and their noise figure is the one of
+    the loss at the physical temperature. Amplifiers and mixers drift by
+    `gain_tc` and `nf_tc`.
+    """
+    t = np.asarray(temp, dtype=float)
+    gain, nf, oip3, iip2 = element_columns(elements)
+    expand = (-1,) + (1,) * t.ndim
+    shape = (len(elements),) + t.shape
+    gain = np.broadcast_to(gain.reshape(expand), shape).copy()
+    nf = np.broadcast_to(nf.reshape(expand), shape).copy()
+    for stage, elt in enumerate(elements):
+        if isinstance(elt, Loss) and not isinstance(elt, PathLoss):
+            loss = elt.loss * (1 + elt.loss_tc * (t - elt.temp_ref))
+            gain[stage] = -loss
+            nf[stage] = loss_temp_to_nf(loss, t)
+        elif isinstance(elt, Filter) and elt.gain <= 0:
+            nf[stage] = loss_temp_to_nf(-elt.gain, t)
+        elif getattr(elt, "gain_tc", 0) or getattr(elt, "nf_tc", 0):
+            gain[stage] += elt.gain_tc * (t - elt.temp_ref)
+            nf[stage] = np.maximum(nf[stage] + elt.nf_tc * (t - elt.temp_ref), 0.0)
+    return gain, nf, oip3.reshape(expand), iip2.reshape(expand)
+
+
+def temperature_sweep(
+    budget: Budget, temp: kelvin_t, T_receiver: Optional[kelvin_t] = None
+) -> Cascade:
+    """
+    Evaluate the budget over an array of physical temperatures (K) in one
+    vectorized pass. T_receiver defaults to the one of the budget and may be
+    an array broadcast against `temp`, e.g. `temp` itself.
+    Results have the stage as first axis followed by the axes of `temp`.
+    """
+    gain, nf, oip3, iip2 = element_columns_at(budget.elements, temp)
+    if T_receiver is None:
+        T_receiver = budget.T_receiver
+    return cascade(
+        gain,
+        nf,
+        oip3=oip3 if budget.with_oip else None,
+        iip2=iip2 if budget.with_oip else None,
+        available_input_power=budget.available_input_power,
+        signal_bandwidth=budget.signal_bandwidth,
+        T_receiver=T_receiver,
+    )
+
+
+def worst_case(
+    budget: Budget,
+    temp: kelvin_t,
+    metrics: Sequence[str] = ("snr", "nf", "transducer_gain", "oip3"),
+    T_receiver: Optional[kelvin_t] = None,
+    stage: int = -1,
+) -> Dict[str, Corner]:
+    """Worst value of each metric at the output of a stage over a 1-D temperature grid."""
+    temp = np.asarray(temp, dtype=float)
+    if temp.ndim != 1 or temp.size == 0:
+        raise ValueError("Expected a 1-D temperature grid")
+    result = temperature_sweep(budget, temp, T_receiver)
+    corners = {}
+    for metric in metrics:
+        if metric not in WORST:
+            raise ValueError("Unexpected metric: {}".format(metric))
+        values = np.broadcast_to(getattr(result, metric)[stage], temp.shape)
+        i = int(np.argmin(values) if WORST[metric] == "min" else np.argmax(values))
+        corners[metric] = Corner(metric, float(values[i]), kelvin_t(float(temp[i])))
+    return corners
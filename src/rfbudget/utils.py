@@ -1,5 +1,5 @@
 import math
-from numpy import log10
+from numpy import log10, ndim
 from typing import NewType
 
 # Define "Unit Tags"
@@ -89,7 +89,7 @@ def nf_to_temp(nf: dB_t, t0: kelvin_t = kelvin_t(290.0)) -> kelvin_t:
 
 
 def temp_to_nf(t: kelvin_t, t0: kelvin_t = kelvin_t(290.0)) -> dB_t:
-    if t == 0:
+    if ndim(t) == 0 and t == 0:
         return dB_t(0)
     return dB_t(10 * log10(1 + t / t0))
 
@@ -103,4 +103,9 @@ def loss_temp_to_nf(loss_dB: dB_t, tp: kelvin_t, t0: kelvin_t = kelvin_t(290.0))
     return temp_to_nf(te, t0)
 
 
+# Reference temperature of datasheet values (25 °C)
+REFERENCE_TEMPERATURE = kelvin_t(298.15)
 EARTH_RADIUS = km(6378.166)
+EARTH_MU = 3.986004418e14  # standard gravitational parameter (m³/s²)
+EARTH_ROTATION_RATE = 7.2921159e-5  # rad/s
+SPEED_OF_LIGHT = 299792458.0  # m/s
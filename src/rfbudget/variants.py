@@ -0,0 +1,191 @@
+from typing import Dict, List, Optional
+from numpy import log10, log2, sqrt
+from .cache import element_hash
+from .core import Element, K_BOLTZMANN
+from .elements import ConverterType, Modulator
+from .utils import Hz_t, dBm_t, kelvin_t, dBm, Hz, kelvin, nf_to_temp
+
+
+class CascadeNode:
+    """Cumulative state of the cascade at the output of one stage of the tree"""
+
+    def __init__(self, element: Optional[Element], parent: Optional["CascadeNode"]):
+        self.element: Optional[Element] = element
+        self.parent: Optional["CascadeNode"] = parent
+        self.children: Dict[str, "CascadeNode"] = {}
+        self.power: float = 0.0
+        self.gain: float = 0.0  # transducer gain
+        self.f: float = 1.0
+        self.inv_oip3: float = 0.0  # 1/OIP3 in 1/mW
+        self.iip2_sum: float = 0.0  # sum(sqrt(G_before / IIP2_i))
+        self.freq: Hz_t = Hz(0)
+        self.results: Optional[tuple] = None  # values of STAGE_FIELDS
+
+
+class VariantResult:
+    """Results of one chain of a `VariantSet`, as the lists of a `Budget`"""
+
+    def __init__(self, elements: List[Element]):
+        self.elements: List[Element] = elements
+        self.output_freq: List[Hz_t] = []
+        self.output_power: List[dBm_t] = []
+        self.transducer_gain: List[float] = []
+        self.f: List[float] = []
+        self.nf: List[float] = []
+        self.iip2: List[dBm_t] = []
+        self.oip2: List[dBm_t] = []
+        self.iip3: List[dBm_t] = []
+        self.oip3: List[dBm_t] = []
+        self.snr: List[float] = []
+        self.capacity: List[float] = []
+        self.total_noise_temp: List[kelvin_t] = []
+        self.receiver_thermal_noise_dBm: Optional[dBm_t] = None
+
+
+def _to_dBm(linear: float) -> dBm_t:
+    return dBm(float("inf")) if linear == 0 else dBm(float(-10 * log10(linear)))
+
+
+def advance(
+    node: CascadeNode,
+    parent: CascadeNode,
+    overrides: Optional[Dict[str, Optional[float]]] = None,
+) -> None:
+    """
+    Cumulative state at the output of `node.element` given the state at its input.
+    overrides: values of gain, nf, oip3 or iip2 used instead of the ones of the element.
+    """
+    elt = node.element
+    overrides = overrides or {}
+    gain = overrides.get("gain", elt.gain)
+    nf = overrides.get("nf", elt.nf)
+    oip3 = overrides.get("oip3", elt.oip3)
+    iip2 = overrides.get("iip2", getattr(elt, "iip2", None))
+    g = 10 ** (gain / 10)
+    g_before = 10 ** (parent.gain / 10)
+    node.power = parent.power + gain
+    node.gain = parent.gain + gain
+    # Friis formula, the first stage starts from a noise factor of 1
+    node.f = parent.f + (10 ** (nf / 10) - 1) / g_before
+    if oip3 is None:
+        oip3 = float("inf")
+    node.inv_oip3 = parent.inv_oip3 / g + 10 ** (-oip3 / 10)
+    node.iip2_sum = parent.iip2_sum
+    if iip2 is not None:
+        node.iip2_sum += sqrt(g_before / 10 ** (iip2 / 10))
+    node.freq = parent.freq
+    if isinstance(elt, Modulator):
+        if elt.converter_type == ConverterType.Down:
+            node.freq = Hz_t(parent.freq - elt.lo)
+        else:
+            node.freq = Hz_t(parent.freq + elt.lo)
+
+
+# Per stage results computed from the cumulative state, as in `Budget`
+STAGE_FIELDS = (
+    "output_freq",
+    "output_power",
+    "transducer_gain",
+    "f",
+    "nf",
+    "snr",
+    "capacity",
+    "total_noise_temp",
+    "oip3",
+    "iip3",
+    "iip2",
+    "oip2",
+)
+
+
+def stage_results(
+    node: CascadeNode, T_receiver: kelvin_t, signal_bandwidth: Hz_t
+) -> tuple:
+    """Values of STAGE_FIELDS at the output of a node."""
+    nf = float(10 * log10(node.f))
+    t_total = T_receiver + nf_to_temp(nf)
+    total_noise_dBm = 10 * log10(K_BOLTZMANN * t_total * signal_bandwidth * 1000)
+    snr = float(node.power - total_noise_dBm - node.gain)
+    oip3 = _to_dBm(node.inv_oip3)
+    iip2 = _to_dBm(node.iip2_sum**2)
+    return (
+        node.freq,
+        dBm(float(node.power)),
+        float(node.gain),
+        float(node.f),
+        nf,
+        snr,
+        float(signal_bandwidth * log2(1 + 10 ** (snr / 10))),
+        kelvin(float(t_total)),
+        oip3,
+        dBm(oip3 - node.gain),
+        iip2,
+        dBm(iip2 + node.gain),
+    )
+
+
+class VariantSet:
+    """
+    Many element chains evaluated together. Chains are arranged in a prefix
+    tree of identical elements (same `element_hash`) so that the cumulative
+    state of a shared prefix is computed once for all the chains using it.
+    """
+
+    def __init__(
+        self,
+        chains: List[List[Element]],
+        input_freq: Optional[Hz_t] = None,
+        available_input_power: dBm_t = dBm(0),
+        signal_bandwidth: Hz_t = Hz(1),
+        T_receiver: kelvin_t = kelvin(290),
+    ):
+        self.chains: List[List[Element]] = chains
+        self.input_freq: Optional[Hz_t] = input_freq
+        self.available_input_power: dBm_t = available_input_power
+        self.signal_bandwidth: Hz_t = signal_bandwidth
+        self.T_receiver: kelvin_t = T_receiver
+        self._root = CascadeNode(None, None)
+        self._leaves: List[List[CascadeNode]] = []
+        self.stage_count: int = 0  # distinct stages of the tree
+        hashes: Dict[int, str] = {}
+        for chain in chains:
+            node = self._root
+            path = []
+            for elt in chain:
+                key = hashes.get(id(elt))
+                if key is None:
+                    key = hashes[id(elt)] = element_hash(elt)
+                if key not in node.children:
+                    node.children[key] = CascadeNode(elt, node)
+                    self.stage_count += 1
+                node = node.children[key]
+                path.append(node)
+            self._leaves.append(path)
+
+    def __len__(self) -> int:
+        return len(self.chains)
+
+    def evaluate(self) -> List[VariantResult]:
+        """Evaluate every stage of the tree once, then gather the results of each chain."""
+        self._root.power = self.available_input_power
+        self._root.freq = self.input_freq if self.input_freq is not None else Hz(0)
+        stack = [self._root]
+        while stack:
+            parent = stack.pop()
+            for node in parent.children.values():
+                advance(node, parent)
+                node.results = stage_results(node, self.T_receiver, self.signal_bandwidth)
+                stack.append(node)
+
+        noise_dBm = dBm(
+            float(10 * log10(K_BOLTZMANN * self.T_receiver * self.signal_bandwidth * 1000))
+        )
+        results = []
+        for chain, path in zip(self.chains, self._leaves):
+            r = VariantResult(chain)
+            r.receiver_thermal_noise_dBm = noise_dBm
+            for node in path:
+                for name, value in zip(STAGE_FIELDS, node.results):
+                    getattr(r, name).append(value)
+            results.append(r)
+        return results
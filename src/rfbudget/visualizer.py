@@ -3,6 +3,7 @@ from typing import List, Optional, Any
 import schemdraw
 from schemdraw import dsp
 from .core import Element
+from .svg import attribute_label
 from .elements import (
     Antenna,
     Amplifier,
@@ -23,18 +24,7 @@ from .propagation import (
 def schemdraw_label(
     elt: Element, options: dict, b: Any, lbl: Optional[str] = None
 ) -> Any:
-    if lbl is None:
-        lbl = ""
-    else:
-        lbl = str(lbl)
-    if options.get("with_gain") and elt.gain is not None:
-        lbl += "gain={0:.2f}dB\n".format(elt.gain)
-    if options.get("with_nf") and elt.nf:
-        lbl += "NF={0:.2f}dB\n".format(elt.nf)
-    if options.get("with_iip") and elt.iip3:
-        lbl += "IIP3={0:.2f}dB\n".format(elt.iip3)
-    if options.get("with_oip") and elt.oip3:
-        lbl += "OIP3={0:.2f}dB\n".format(elt.oip3)
+    lbl = attribute_label(elt, options, lbl)
     return b.label(lbl, "top", ofst=(-0.2, 0.6), fontsize=options.get("attr-font-size", 6))
 
 
@@ -0,0 +1,38 @@
+from rfbudget import (
+    GaseousAttenuation,
+    RainAttenuation,
+    gaseous_attenuation,
+    rain_attenuation,
+    rain_coefficients,
+    GHz,
+    degree,
+)
+from pytest import approx
+import numpy as np
+
+
+def test_p838_coefficients():
+    # ITU-R P.838-3 Table 5 values at 12GHz and 20GHz, horizontal polarization
+    k, alpha = rain_coefficients(np.array([GHz(12), GHz(20)]), polarization_tilt=0)
+    assert k == approx([0.02386, 0.09164], rel=1e-3)
+    assert alpha == approx([1.1825, 1.0568], rel=1e-3)
+
+
+def test_rain_attenuation_bulk():
+    elevation = np.linspace(10, 80, 8)
+    availability = np.array([[99.0], [99.9], [99.99]])
+    a = rain_attenuation(GHz(20), elevation, 42, availability)
+    assert a.shape == (3, 8)
+    # Higher availability and lower elevation both mean more attenuation
+    assert np.all(np.diff(a, axis=0) > 0)
+    assert np.all(np.diff(a, axis=1) < 0)
+    rain = RainAttenuation(freq=GHz(20), elevation=degree(30), rain_rate=42)
+    assert -rain.gain == approx(rain_attenuation(GHz(20), 30, 42, 99.99))
+
+
+def test_gaseous_attenuation():
+    # Water vapour line at 22.235GHz
+    a = gaseous_attenuation(np.array([GHz(12), GHz(22.235), GHz(30)]), degree(90))
+    assert a[1] > a[0] and a[1] > a[2]
+    gases = GaseousAttenuation(freq=GHz(12), elevation=degree(30))
+    assert -gases.gain == approx(2 * a[0])
@@ -0,0 +1,53 @@
+from rfbudget import (
+    FreeSpacePathLossFriis,
+    Modulation,
+    bit_error_rate,
+    ber_vs_distance,
+    ber_vs_input_power,
+    budget,
+    erfc,
+    packet_error_rate,
+    MHz,
+    kHz,
+    km,
+)
+from pytest import approx
+import math
+import numpy as np
+
+
+def test_erfc():
+    x = np.linspace(-4, 6, 201)
+    assert erfc(x) == approx([math.erfc(v) for v in x], rel=2e-7, abs=1e-12)
+
+
+def test_bit_error_rate():
+    assert bit_error_rate(9.6, Modulation.BPSK) == approx(1e-5, rel=0.05)
+    assert bit_error_rate(9.6, Modulation.QPSK) == bit_error_rate(9.6, Modulation.BPSK)
+    assert bit_error_rate(4, Modulation.QAM, 4) == approx(bit_error_rate(4, Modulation.BPSK))
+    gamma = 10 ** 0.8
+    assert bit_error_rate(8, Modulation.NoncoherentFSK) == approx(0.5 * math.exp(-gamma / 2))
+    assert bit_error_rate(8, Modulation.DBPSK) == approx(0.5 * math.exp(-gamma))
+    # Higher orders need more Eb/N0 for PSK and QAM, less for FSK
+    assert bit_error_rate(10, Modulation.PSK, 8) > bit_error_rate(10, Modulation.PSK, 4)
+    assert bit_error_rate(10, Modulation.QAM, 64) > bit_error_rate(10, Modulation.QAM, 16)
+    assert bit_error_rate(8, Modulation.NoncoherentFSK, 4) < bit_error_rate(
+        8, Modulation.NoncoherentFSK, 2
+    )
+
+
+def test_packet_error_rate():
+    assert packet_error_rate(1e-9, 1000) == approx(1e-6, rel=1e-6)
+    assert packet_error_rate(0.5, 8) == approx(1 - 0.5**8)
+
+
+def test_ber_sweeps():
+    link = budget(
+        elements=[FreeSpacePathLossFriis(distance=km(1), freq=MHz(433))],
+        available_input_power=0,
+        signal_bandwidth=kHz(10),
+    )
+    ber = ber_vs_distance(link, km(np.array([100, 300, 1000, 3000])), 10000, Modulation.BPSK)
+    assert np.all(np.diff(ber) > 0)
+    at_input = ber_vs_input_power(link, np.array([-40.0]), 10000, Modulation.BPSK)
+    assert at_input[0] == approx(ber[0])
@@ -1,5 +1,7 @@
-from rfbudget import Cable, m, dB, watt_to_dBW
-from pytest import approx
+from rfbudget import CABLES, Cable, CableType, MHz, cable_loss, loss_temp_to_nf
+from rfbudget import m, dB, watt_to_dBW
+from pytest import approx, raises
+import numpy as np
 
 def test_cable_loss():
     # 10m cable with 0.05 dB/m loss should have 0.5 dB total loss (gain = -0.5 dB)
@@ -15,3 +17,26 @@ def test_watt_to_dBW():
     assert watt_to_dBW(10) == 10
     assert watt_to_dBW(100) == 20
     assert watt_to_dBW(5) == approx(6.9897, 0.0001)
+
+
+def test_cable_types():
+    lmr400 = CABLES["LMR-400"]
+    # 3.9 dB/100ft at 900 MHz
+    assert lmr400.loss_at(MHz(900), 100 * 0.3048) == approx(3.9, abs=0.05)
+    c = Cable(length=m(30), cable_type="LMR-400", freq=MHz(900), temp=350)
+    assert c.gain == approx(-float(lmr400.loss_at(MHz(900), 30)))
+    assert c.nf == approx(loss_temp_to_nf(-c.gain, 350))
+    freq = np.linspace(MHz(100), MHz(3000), 50)
+    assert c.loss_at(freq).shape == (50,)
+    assert np.all(np.diff(c.loss_at(freq)) > 0)
+    assert c.nf_at(freq, temp=290) == approx(c.loss_at(freq))
+    rg58 = CABLES["RG-58"]
+    assert rg58.loss_per_m(MHz(100)) == approx(0.161)
+    table = CableType.from_table("T", [MHz(100), MHz(400)], [10, 20])
+    assert table.loss_per_m(MHz(200)) == approx(np.sqrt(2) / 10)
+    runs = cable_loss(["LMR-400", "RG-58", "LMR-400"], [10, 20, 30], freq)
+    assert runs.shape == (3, 50)
+    assert runs[2] == approx(3 * runs[0])
+    assert Cable(length=m(10), loss_per_m=dB(0.05)).loss_at(freq) == approx(0.5)
+    with raises(ValueError):
+        Cable(length=m(10), cable_type="LMR-400")
@@ -0,0 +1,71 @@
+from rfbudget import (
+    Amplifier,
+    FreeSpacePathLossFriis,
+    Loss,
+    ResultCache,
+    budget,
+    budget_hash,
+    element_hash,
+    MHz,
+    km,
+)
+from concurrent.futures import ThreadPoolExecutor
+from pytest import approx
+import numpy as np
+
+
+def test_element_hash():
+    a = FreeSpacePathLossFriis(distance=km(10), freq=MHz(433))
+    assert element_hash(a) == element_hash(FreeSpacePathLossFriis(distance=km(10), freq=MHz(433)))
+    assert element_hash(a) != element_hash(FreeSpacePathLossFriis(distance=km(11), freq=MHz(433)))
+    assert element_hash(Loss(loss=3)) != element_hash(Amplifier(gain=-3, nf=3))
+    assert element_hash(np.float64(1.0)) == element_hash(1)
+
+
+def test_budget_cache(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+    elements = [Amplifier(gain=20, nf=2, oip3=30), Loss(loss=3)]
+    first = budget(elements=elements, signal_bandwidth=MHz(1), cache=cache)
+    assert len(cache) == 1
+    second = budget(elements=elements, signal_bandwidth=MHz(1), cache=cache)
+    assert second.snr == approx(first.snr)
+    assert second.oip3 == approx(first.oip3)
+    assert second.receiver_thermal_noise_dBm == approx(first.receiver_thermal_noise_dBm)
+    assert len(cache) == 1
+    budget(elements=elements, signal_bandwidth=MHz(2), cache=cache)
+    assert len(cache) == 2
+    assert budget_hash(first) == budget_hash(second)
+
+    # Reopening keeps entries of the same version
+    assert len(ResultCache(str(tmp_path / "cache.sqlite"))) == 2
+
+
+def test_cache_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), max_size=1)
+    cache.put("a", {"snr": [1.0]})
+    cache.put("b", {"snr": [2.0]})
+    assert cache.get("a") is None
+    assert len(cache) <= 1
+    cache.max_size = 10**6
+    cache.put("c", {"snr": [float("inf")]})
+    assert cache.get("c") == {"snr": [float("inf")]}
+    # Reads are recorded in memory and keep the entry on the next write
+    cache = ResultCache(str(tmp_path / "lru.sqlite"), max_size=30)
+    cache.put("a", {"snr": [1.0]})
+    cache.put("b", {"snr": [2.0]})
+    assert cache.get("a") == {"snr": [1.0]}
+    cache.put("c", {"snr": [3.0]})
+    assert cache.get("b") is None and cache.get("a") is not None
+
+
+def test_cache_shared_between_threads(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+
+    def evaluate(gain):
+        elements = [Amplifier(gain=gain % 4, nf=2), Loss(loss=3)]
+        return budget(elements=elements, signal_bandwidth=MHz(1), cache=cache).snr
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        snrs = list(pool.map(evaluate, range(16)))
+    assert len(cache) == 4
+    assert snrs[4] == approx(snrs[0])
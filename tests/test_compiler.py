@@ -0,0 +1,71 @@
+from rfbudget import (
+    Amplifier,
+    Antenna,
+    ConverterType,
+    FreeSpacePathLossFriis,
+    Loss,
+    Modulator,
+    budget,
+    MHz,
+    km,
+)
+from pytest import approx, raises
+import numpy as np
+
+
+def make_budget(distance=km(10), lna_gain=20, power=10):
+    return budget(
+        elements=[
+            Antenna(gain=3),
+            FreeSpacePathLossFriis(distance=distance, freq=MHz(868)),
+            Amplifier(gain=lna_gain, nf=1.5, oip3=25, iip2=40),
+            Loss(loss=2),
+            Modulator(gain=-7, nf=7, oip3=15, lo=MHz(800), converter_type=ConverterType.Down),
+        ],
+        input_freq=MHz(868),
+        available_input_power=power,
+        signal_bandwidth=MHz(1),
+    )
+
+
+def test_compiled_budget_matches_budget():
+    b = make_budget()
+    fn = b.compile({"path": (1, "loss"), "lna_gain": (2, "gain")})
+    assert fn.output_freq == approx(b.output_freq)
+    distance = km(np.array([1, 10, 100]))
+    gains = np.array([10.0, 20.0, 30.0])
+    loss = b.elements[1].loss_at_distance(distance)
+    result = fn(path=loss, lna_gain=gains, available_input_power=np.array([0.0, 10, 20]))
+    assert result.snr.shape == (5, 3)
+    for i in range(3):
+        ref = make_budget(distance[i], gains[i], 10.0 * i)
+        for name in ("output_power", "transducer_gain", "nf", "snr", "oip3", "iip3", "iip2", "capacity"):
+            assert getattr(result, name)[:, i] == approx(getattr(ref, name)), name
+    assert result.receiver_thermal_noise_dBm == approx(b.receiver_thermal_noise_dBm)
+
+
+def test_compiled_budget_folds_constants():
+    b = make_budget()
+    fn = b.compile()
+    # Without free parameters only the input power terms remain
+    assert "10 **" not in fn.source.split("p0 =")[0]
+    assert fn().snr == approx(b.snr)
+    with raises(ValueError):
+        fn(unknown=1)
+    with raises(ValueError):
+        b.compile({"x": (9, "gain")})
+    for name in ("_rf_v0", "lambda", "available_input_power"):
+        with raises(ValueError):
+            b.compile({name: (2, "gain")})
+    # Two free parameters writing the gain of the same stage
+    with raises(ValueError):
+        b.compile({"loss": (3, "loss"), "gain": (-2, "gain")})
+
+
+def test_compiled_budget_parameter_names():
+    b = make_budget()
+    # Names of temporaries and helpers of the generated code are free to use
+    fn = b.compile({"p0": (2, "gain"), "log10": (2, "nf"), "inf": (0, "oip3")})
+    result = fn(p0=20.0, log10=b.elements[2].nf, inf=b.elements[0].oip3)
+    assert result.snr == approx(b.snr)
+    assert result.nf == approx(b.nf)
@@ -0,0 +1,32 @@
+from rfbudget import Amplifier, CompressionModel, budget, power_sweep
+from pytest import approx
+import numpy as np
+
+
+def test_rapp_p1db_psat():
+    a = Amplifier(gain=20, psat=30, smoothness=2)
+    # x = (10^0.2 - 1)^(1/2), OP1dB = Psat + 10.log10(x) - 1
+    assert a.op1db == approx(30 + 10 * np.log10((10**0.2 - 1) ** 0.5) - 1, abs=1e-9)
+    b = Amplifier(gain=20, op1db=a.op1db, smoothness=2)
+    assert b.psat == approx(30, abs=1e-9)
+
+
+def test_power_sweep_single_stage():
+    a = Amplifier(gain=20, op1db=10, compression=CompressionModel.Rapp, smoothness=3)
+    b = budget(elements=[a], available_input_power=-50, signal_bandwidth=1000)
+    sweep = power_sweep(b, np.arange(-60, 10, 0.01))
+    assert sweep.output_power[0, 0] == approx(-40, abs=0.01)
+    assert sweep.output_p1db[0] == approx(10, abs=0.01)
+    assert sweep.input_p1db[0] == approx(-9, abs=0.01)
+    assert sweep.output_power[0, -1] < a.psat
+    assert sweep.dynamic_range[0] == approx(-9 - sweep.noise_floor[0], abs=0.01)
+
+
+def test_power_sweep_limiter_cascade():
+    a1 = Amplifier(gain=10, psat=0, compression=CompressionModel.SoftLimiter)
+    a2 = Amplifier(gain=10)
+    b = budget(elements=[a1, a2])
+    sweep = power_sweep(b, np.linspace(-30, 0, 301))
+    # Second stage is linear, the chain clips at 0 + 10dBm
+    assert sweep.output_power[1].max() == approx(10)
+    assert sweep.input_p1db[1] == approx(-9, abs=0.01)
@@ -0,0 +1,50 @@
+from rfbudget import (
+    Orbit,
+    FreeSpacePathLossFriis,
+    budget,
+    eci_to_ecef,
+    geodetic_to_ecef,
+    look_angles,
+    propagate,
+    visibility,
+    km,
+    MHz,
+    kHz,
+)
+from pytest import approx
+import numpy as np
+
+
+def test_visibility_matches_brute_force():
+    rng = np.random.default_rng(3)
+    orbits = [
+        Orbit(
+            apogee=km(rng.uniform(500, 1200)),
+            perigee=km(500),
+            inclination=rng.uniform(0, 100),
+            raan=rng.uniform(0, 360),
+            mean_anomaly=rng.uniform(0, 360),
+        )
+        for _ in range(20)
+    ]
+    lat = np.array([48.0, -10.0, 70.0])
+    lon = np.array([2.0, 120.0, -40.0])
+    times = np.arange(0, 3 * 3600, 10.0)
+    link = budget(
+        elements=[FreeSpacePathLossFriis(distance=km(1000), freq=MHz(437))],
+        available_input_power=30,
+        signal_bandwidth=kHz(10),
+    )
+    v = visibility(orbits, lat, lon, times, elevation_mask=10, coarse_step=30, budget=link)
+
+    stations = geodetic_to_ecef(lat, lon)
+    sat = eci_to_ecef(propagate(orbits, times), times)
+    el, slant = look_angles(sat[:, None, :, :], stations[None, :, None, :])
+    s, g, t = np.nonzero(el >= 10)
+    assert list(v.satellite) == list(s)
+    assert list(v.station) == list(g)
+    assert list(v.time_index) == list(t)
+    assert v.slant_range == approx(slant[s, g, t])
+    assert v.snr[0] == approx(30 - link.elements[0].loss_at_distance(v.slant_range[0]) - link.receiver_thermal_noise_dBm, abs=0.1)
+    assert len(v.windows) > 0
+    assert np.all(v.windows.duration >= 0)
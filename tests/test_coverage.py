@@ -0,0 +1,65 @@
+from rfbudget import (
+    Amplifier,
+    Antenna,
+    FreeSpacePathLossFriis,
+    GeoGrid,
+    budget,
+    cascade,
+    coverage_map,
+    element_columns,
+    great_circle_distance,
+    sweep_distance,
+    MHz,
+    kHz,
+    km,
+)
+from pytest import approx
+import numpy as np
+
+
+def link(distance):
+    return budget(
+        elements=[
+            Antenna(gain=3),
+            FreeSpacePathLossFriis(distance=distance, freq=MHz(433)),
+            Antenna(gain=3),
+            Amplifier(gain=20, nf=2, oip3=30),
+        ],
+        input_freq=MHz(433),
+        available_input_power=10,
+        signal_bandwidth=kHz(12.5),
+    )
+
+
+def test_cascade_matches_budget():
+    b = link(km(5))
+    r = cascade(
+        *element_columns(b.elements),
+        available_input_power=b.available_input_power,
+        signal_bandwidth=b.signal_bandwidth,
+    )
+    assert r.output_power == approx(b.output_power)
+    assert r.nf == approx(b.nf)
+    assert r.snr == approx(b.snr)
+    assert r.oip3 == approx(b.oip3)
+
+
+def test_sweep_distance():
+    r = sweep_distance(link(km(1)), np.array([km(2), km(7)]))
+    assert r.snr[-1, 1] == approx(link(km(7)).snr[-1])
+    assert r.nf[-1, 0] == approx(link(km(2)).nf[-1])
+
+
+def test_coverage_map(tmp_path):
+    grid = GeoGrid(45.0, 45.2, 6.0, 6.3, rows=40, cols=50)
+    b = link(km(1))
+    cov = coverage_map(
+        b, grid, 45.1, 6.15, output_dir=str(tmp_path), tile_size=16, snr_threshold=20
+    )
+    lat, lon = grid.coordinates(slice(3, 4), slice(7, 8))
+    d = great_circle_distance(45.1, 6.15, lat[0, 0], lon[0, 0])
+    assert cov.snr[3, 7] == approx(link(d).snr[-1], abs=1e-3)
+    assert cov.received_power[3, 7] == approx(link(d).output_power[-1], abs=1e-3)
+    on_disk = np.load(str(tmp_path / "snr.npy"))
+    assert on_disk[3, 7] == cov.snr[3, 7]
+    assert np.array_equal(cov.mask, cov.snr >= 20)
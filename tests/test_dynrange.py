@@ -0,0 +1,57 @@
+from rfbudget import (
+    Amplifier,
+    Loss,
+    budget,
+    cascade,
+    dynamic_range,
+    element_columns,
+    MHz,
+)
+from pytest import approx
+import numpy as np
+
+
+def _budget():
+    return budget(
+        elements=[
+            Loss(name="Filter", loss=2),
+            Amplifier(name="LNA", gain=20, nf=1, oip3=30, op1db=18),
+            Amplifier(name="Driver", gain=10, nf=5, oip3=35, op1db=22),
+        ],
+        signal_bandwidth=MHz(1),
+        available_input_power=-40,
+    )
+
+
+def test_budget_dynamic_range(capsys):
+    b = _budget()
+    dr = b.dynamic_range(min_snr=10)
+    floor = b.receiver_thermal_noise_dBm + b.nf[-1]
+    assert dr.noise_floor[-1] == approx(floor)
+    assert dr.mds[-1] == approx(floor + 10)
+    assert dr.sfdr3[-1] == approx(2 / 3 * (b.iip3[-1] - floor))
+    # LNA input P1dB is 18 - 18 dB
+    assert dr.ip1db[1] == approx(0.0)
+    assert dr.ip1db[2] < dr.ip1db[1]
+    assert dr.blocking_headroom[1] == approx(40.0)
+    assert "SFDR3" in b.to_html(options={"simplified": False})
+    assert "SFDR3" not in b.to_html()
+    b.print()
+    assert "MDS:" in capsys.readouterr().out
+
+
+def test_vectorized_dynamic_range():
+    b = _budget()
+    bandwidth = np.array([MHz(1), MHz(10), MHz(100)])
+    dr = dynamic_range(b, bandwidth)
+    assert dr.noise_floor.shape == (3, 3)
+    assert dr.noise_floor[-1, 1] - dr.noise_floor[-1, 0] == approx(10)
+    assert dr.sfdr3[-1, 0] - dr.sfdr3[-1, 1] == approx(20 / 3)
+    # Configurations from a vectorized cascade: LNA gains along the last axis
+    gain, nf, oip3, iip2 = element_columns(b.elements)
+    gain = np.repeat(gain[:, None], 4, axis=1)
+    gain[1] = [10, 15, 20, 25]
+    result = cascade(gain, nf[:, None], oip3[:, None], iip2[:, None], -40, MHz(1))
+    dr = dynamic_range(result, bandwidth[:, None], op1db=[np.inf, 18, 22])
+    assert dr.sfdr3.shape == (3, 3, 4)
+    assert dr.sfdr3[-1, 0, 2] == approx(b.dynamic_range().sfdr3[-1])
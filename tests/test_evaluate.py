@@ -0,0 +1,46 @@
+from rfbudget import (
+    Amplifier,
+    BudgetInputs,
+    FreeSpacePathLossFriis,
+    Loss,
+    budget,
+    evaluate,
+    MHz,
+    km,
+)
+from concurrent.futures import ThreadPoolExecutor
+from pytest import approx, raises
+
+
+def test_evaluate_matches_budget():
+    elements = [
+        FreeSpacePathLossFriis(distance=km(2), freq=MHz(868)).freeze(),
+        Amplifier(gain=20, nf=2, oip3=30).freeze(),
+        Loss(loss=3).freeze(),
+    ]
+    inputs = BudgetInputs(available_input_power=14, signal_bandwidth=MHz(1))
+    result = evaluate(elements, inputs)
+    b = budget(elements=elements, available_input_power=14, signal_bandwidth=MHz(1))
+    assert result.snr == approx(tuple(b.snr))
+    assert result.oip3 == approx(tuple(b.oip3))
+    assert b.T_receiver == 290
+    with raises(AttributeError):
+        result.snr = ()
+    with raises(AttributeError):
+        elements[1].gain = 10
+
+    # Shared frozen elements evaluated from a thread pool
+    powers = [float(p) for p in range(-20, 20)]
+    with ThreadPoolExecutor(4) as pool:
+        results = list(
+            pool.map(lambda p: evaluate(elements, inputs._replace(available_input_power=p)), powers)
+        )
+    assert [r.output_power[-1] - p for r, p in zip(results, powers)] == approx(
+        [result.output_power[-1] - 14] * len(powers)
+    )
+
+
+def test_budget_default_elements_not_shared():
+    a = budget()
+    a.elements.append(Loss(loss=1))
+    assert budget().elements == []
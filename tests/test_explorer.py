@@ -0,0 +1,99 @@
+from rfbudget import (
+    Amplifier,
+    Antenna,
+    BudgetExplorer,
+    FreeSpacePathLossFriis,
+    Loss,
+    budget,
+    icon_html,
+    MHz,
+    km,
+)
+from pytest import approx, raises
+import threading
+import rfbudget.explorer as explorer_module
+
+
+def make_budget():
+    return budget(
+        elements=[Antenna(gain=3), FreeSpacePathLossFriis(distance=km(1), freq=MHz(868))]
+        + [Amplifier(gain=10, nf=2, oip3=30) if i % 2 else Loss(loss=3) for i in range(20)],
+        available_input_power=14,
+        signal_bandwidth=MHz(1),
+    )
+
+
+def test_incremental_recompute():
+    b = make_budget()
+    explorer = BudgetExplorer(b, debounce=0)
+    explorer.recomputed_stages = 0
+    changed = explorer.flush()
+    assert changed == {}
+    explorer.set(19, "gain", 15)
+    assert explorer.recomputed_stages == 3
+    ref = make_budget()
+    ref.elements[19].gain = 15
+    ref.elements[19].iip3 = ref.elements[19].oip3 - 15
+    ref.update()
+    for name in ("output_power", "nf", "snr", "oip3", "iip3"):
+        assert getattr(b, name) == approx(getattr(ref, name))
+    explorer.set(1, "loss", 100)
+    assert b.snr[-1] == approx(ref.snr[-1] - (100 - ref.elements[1].nf))
+    assert 'id="rfbudget-snr-21"' in explorer.to_html()
+    # The elements are left unchanged
+    assert b.elements[19].gain == 10 and explorer.value(19, "gain") == 15
+    assert explorer.value(1, "loss") == 100
+    with raises(ValueError):
+        explorer.set(22, "gain", 1)
+
+
+def test_debounced_changes():
+    b = make_budget()
+    done = threading.Event()
+    cells = {}
+
+    def on_change(changed):
+        cells.update(changed)
+        done.set()
+
+    explorer = BudgetExplorer(b, debounce=0.05, on_change=on_change)
+    explorer.recomputed_stages = 0
+    for gain in range(10, 20):
+        explorer.set(5, "gain", gain)
+    assert done.wait(2)
+    # Ten slider events, a single recomputation of the stages from 5
+    assert explorer.recomputed_stages == 17
+    assert explorer.value(5, "gain") == 19
+    assert ("snr", 21) in cells and ("snr", 4) not in cells
+
+
+def test_frozen_elements_and_errors():
+    b = make_budget()
+    for elt in b.elements:
+        elt.freeze()
+    hot = Loss(loss=3, temp=1000)
+    b.elements[2] = hot
+    b.update()
+    errors = []
+    done = threading.Event()
+    explorer = BudgetExplorer(b, debounce=0.01, on_error=lambda e: (errors.append(e), done.set()))
+    explorer.set(3, "gain", 12)
+    explorer.flush()
+    assert b.elements[3].gain == 10 and b.snr[-1] != approx(make_budget().snr[-1])
+    # A lossy element at 1000 K keeps the noise figure of its temperature
+    nf = list(b.nf)
+    explorer.set(2, "loss", 3)
+    explorer.flush()
+    assert b.nf == approx(nf)
+    # Errors of the timer thread are reported
+    explorer.on_change = lambda changed: 1 / 0
+    explorer.set(3, "gain", 13)
+    assert done.wait(2)
+    assert "ZeroDivisionError" in errors[0] and explorer.error == errors[0]
+
+
+def test_icon_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(explorer_module, "ICON_CACHE_SIZE", 3)
+    for i in range(10):
+        icon_html(Amplifier(name="A{}".format(i), gain=10), {"renderer": "svg"})
+    assert len(explorer_module._icons) <= 3
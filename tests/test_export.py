@@ -0,0 +1,56 @@
+from rfbudget import (
+    Amplifier,
+    Loss,
+    budget,
+    diagram_hash,
+    export_schematics,
+    MHz,
+)
+
+
+def test_export_schematics(tmp_path):
+    a = budget(elements=[Loss(name="Cable", loss=2), Amplifier(name="LNA", gain=20, nf=1)])
+    b = budget(
+        elements=[Loss(name="Cable", loss=2), Amplifier(name="LNA", gain=20, nf=1)],
+        signal_bandwidth=MHz(1),
+    )
+    c = [Amplifier(name="PA", gain=30, nf=5)]
+    assert diagram_hash(a.elements) == diagram_hash(b.elements)
+    jobs = [
+        (a, tmp_path / "a.svg"),
+        (b, tmp_path / "b.svg"),
+        (c, tmp_path / "c.svg"),
+        (c, tmp_path / "missing" / "d.svg"),
+    ]
+    results = export_schematics(jobs, renderer="svg", workers=2)
+    assert [r.ok for r in results] == [True, True, True, False]
+    assert results[0].rendered and not results[1].rendered
+    assert (tmp_path / "a.svg").read_text() == (tmp_path / "b.svg").read_text()
+    assert "LNA" in (tmp_path / "a.svg").read_text()
+    # c.svg was rendered but the copy to a missing directory failed
+    assert (tmp_path / "c.svg").exists() and "No such file" in results[3].error
+    assert all(r.seconds >= 0 for r in results)
+
+
+def test_export_schemdraw(tmp_path):
+    a = budget(elements=[Amplifier(name="LNA", gain=20, nf=1)])
+    (result,) = export_schematics([(a, tmp_path / "a.svg")], workers=1)
+    assert result.ok, result.error
+    assert (tmp_path / "a.svg").read_text().lstrip().startswith("<")
+
+
+def test_export_in_process(tmp_path):
+    import matplotlib
+
+    backend = matplotlib.get_backend()
+    matplotlib.use("pdf")
+    try:
+        a = budget(elements=[Amplifier(name="LNA", gain=20, nf=1)])
+        jobs = [(a, tmp_path / "a.svg"), ([Loss(loss=1)], tmp_path / "missing" / "b.svg")]
+        ok, failed = export_schematics(jobs, workers=0)
+        # The backend of the caller is left unchanged
+        assert matplotlib.get_backend() == "pdf"
+    finally:
+        matplotlib.use(backend)
+    assert ok.ok and ok.rendered
+    assert not failed.ok and not failed.rendered
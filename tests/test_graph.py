@@ -0,0 +1,91 @@
+from rfbudget import (
+    Amplifier,
+    BudgetGraph,
+    Combiner,
+    Loss,
+    Splitter,
+    budget,
+    MHz,
+)
+from pytest import approx, raises
+
+
+def test_linear_graph_matches_budget():
+    elements = [Loss(loss=2), Amplifier(gain=20, nf=1, oip3=30), Amplifier(gain=10, nf=6, oip3=35)]
+    b = budget(elements=elements, signal_bandwidth=MHz(1), available_input_power=-80)
+    g = BudgetGraph(available_input_power=-80, signal_bandwidth=MHz(1))
+    previous = "input"
+    for i, elt in enumerate(elements):
+        previous = g.add("s{}".format(i), elt, previous)
+    r = g.result("s2")
+    assert r.transducer_gain == approx(b.transducer_gain[-1])
+    assert r.nf == approx(b.nf[-1])
+    assert r.snr == approx(b.snr[-1])
+    assert r.oip3 == approx(b.oip3[-1])
+
+
+def test_splitter_combiner():
+    g = BudgetGraph(available_input_power=-60, signal_bandwidth=MHz(1))
+    g.add("lna", Amplifier(gain=20, nf=1))
+    g.add("split", Splitter(outputs=2), "lna")
+    g.add("a", Amplifier(gain=10, nf=3), ("split", 0))
+    g.add("b", Amplifier(gain=10, nf=3), ("split", 1))
+    g.add("combine", Combiner(inputs=2), ["a", "b"])
+    lna, a, out = g.result("lna"), g.result("a"), g.result("combine")
+    # In phase signals add in amplitude, so does the noise of the shared LNA
+    assert out.output_power == approx(a.output_power + 3.0103, abs=1e-3)
+    assert a.snr < out.snr < lna.snr
+    assert lna.nf < out.nf < a.nf
+    # Splitting then combining gives back the SNR of the chain
+    g3 = BudgetGraph(available_input_power=-60, signal_bandwidth=MHz(1))
+    g3.add("lna", Amplifier(gain=30, nf=3))
+    g3.add("split", Splitter(outputs=2), "lna")
+    g3.add("combine", Combiner(inputs=2), [("split", 0), ("split", 1)])
+    # The noise of the splitter reaches its outputs in opposite phases
+    assert g3.result("combine").output_power == approx(g3.result("lna").output_power)
+    assert g3.result("combine").snr == approx(g3.result("lna").snr, abs=1e-9)
+    assert g3.result("combine").nf == approx(g3.result("lna").nf, abs=1e-9)
+    # An ideal splitter halves the SNR when the input noise is at 290 K
+    g2 = BudgetGraph(available_input_power=-60, signal_bandwidth=MHz(1))
+    g2.add("split", Splitter(outputs=2))
+    assert g2.result("split", 1).nf == approx(3.0103, abs=1e-3)
+    with raises(ValueError):
+        g.add("bad", Combiner(inputs=2), "lna")
+
+
+def test_balanced_amplifier():
+    g = BudgetGraph(available_input_power=-90, signal_bandwidth=MHz(1))
+    g.add("split", Splitter(outputs=2))
+    g.add("a", Amplifier(gain=20, nf=3, oip3=30), ("split", 0))
+    g.add("b", Amplifier(gain=20, nf=3, oip3=30), ("split", 1))
+    g.add("combine", Combiner(inputs=2), ["a", "b"])
+    ref = budget(
+        elements=[Amplifier(gain=20, nf=3, oip3=30)],
+        available_input_power=-90,
+        signal_bandwidth=MHz(1),
+    )
+    out = g.result("combine")
+    assert out.transducer_gain == approx(20)
+    assert out.nf == approx(3, abs=1e-9)
+    assert out.snr == approx(ref.snr[-1], abs=1e-9)
+    # Each amplifier handles half the power
+    assert out.oip3 == approx(33.0103, abs=1e-3)
+
+
+def test_cached_states():
+    g = BudgetGraph(available_input_power=-60, signal_bandwidth=MHz(1))
+    g.add("lna", Amplifier(gain=20, nf=1))
+    g.add("split", Splitter(outputs=8, insertion_loss=1), "lna")
+    for i in range(8):
+        g.add("rx{}".format(i), Amplifier(gain=30, nf=5), ("split", i))
+    g.results()
+    assert g.evaluated_nodes == 10
+    g.replace("rx3", Amplifier(gain=30, nf=8))
+    g.evaluate()
+    assert g.evaluated_nodes == 11
+    assert g.result("rx3").nf > g.result("rx2").nf
+    g.replace("lna", Amplifier(gain=25, nf=1))
+    g.evaluate()
+    assert g.evaluated_nodes == 21
+    g.available_input_power = -70
+    assert g.result("rx0").output_power == approx(-70 + 25 - 10 * 0.90309 - 1 + 30)
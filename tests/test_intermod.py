@@ -0,0 +1,35 @@
+from rfbudget import Amplifier, Modulator, budget, blocker_analysis, MHz, kHz
+from pytest import approx
+import numpy as np
+
+
+def test_iip2_2_amp():
+    # 1/sqrt(IIP2) = sqrt(1/IIP2_1) + sqrt(G1/IIP2_2) = 0.01 + 0.1
+    a1 = Amplifier(gain=10, iip2=40, name="A1")
+    a2 = Amplifier(gain=20, iip2=30, name="A2")
+    b = budget(elements=[a1, a2])
+    assert b.iip2[0] == approx(40, 0.01)
+    assert b.iip2[-1] == approx(-20 * np.log10(0.11), 0.01)
+    assert b.oip2[-1] == approx(b.iip2[-1] + 30, 0.01)
+    mixer = Modulator(gain=-7, nf=7, iip2=30)
+    assert mixer.iip2 == 30 and mixer.oip2 == 23
+
+
+def test_two_tones_im3_in_band():
+    # 2f1 - f2 falls on the carrier: P_IM3 = 2 * -30 + -30 - IIP3 = -90dBm
+    lna = Amplifier(gain=20, nf=2, iip3=0, name="LNA")
+    b = budget(
+        elements=[lna],
+        input_freq=MHz(100),
+        available_input_power=-80,
+        signal_bandwidth=kHz(100),
+    )
+    freqs = np.array([[MHz(101), MHz(102)], [MHz(110), MHz(130)]])
+    powers = np.full(freqs.shape, -30.0)
+    r = blocker_analysis(b, freqs, powers)
+    assert r.im3_in_band[0].sum() == 1
+    assert r.im3_power[0, 0] == approx(-90, abs=1e-6)
+    assert r.im3_power[0, 1] == -np.inf
+    assert r.sinr[0, 1] == approx(b.snr[0])
+    assert r.sinr_degradation[0, 0] > 0
+    assert r.output_referred(r.im3_power)[0, 0] == approx(-70, abs=1e-6)
@@ -0,0 +1,31 @@
+from rfbudget import DVB_S2, LORA, ModcodTable, data_volume, MHz
+from pytest import approx
+import numpy as np
+
+
+def test_dvb_s2_selection():
+    snr = np.array([-5.0, -2.35, 6.5, 11.0, 30.0])
+    names = [DVB_S2.names[i] if i >= 0 else None for i in DVB_S2.select(snr)]
+    # 8PSK 3/5 is less efficient than QPSK 9/10 reached at a lower SNR
+    assert names == [None, "QPSK 1/4", "QPSK 9/10", "16APSK 3/4", "32APSK 9/10"]
+    assert DVB_S2.throughput(snr, MHz(1))[0] == 0
+    assert DVB_S2.throughput(snr, MHz(1))[-1] == approx(4.453027e6)
+    assert DVB_S2.efficiency(snr, margin=3)[-2] == DVB_S2.efficiency(8.0)
+    assert DVB_S2.margin(snr)[2] == approx(6.5 - 6.42)
+
+
+def test_efficiency_is_monotonic():
+    snr = np.linspace(-30, 20, 100001)
+    for table in (DVB_S2, LORA):
+        assert np.all(np.diff(table.efficiency(snr)) >= 0)
+
+
+def test_lora_and_volume(tmp_path):
+    assert LORA.names[LORA.select(-12.0)] == "SF9"
+    path = tmp_path / "table.csv"
+    path.write_text("name,threshold,efficiency\nB,3,2\nA,0,1\n")
+    table = ModcodTable.from_csv(str(path))
+    assert table.names == ["A", "B"]
+    times = np.arange(0, 11.0)
+    rate = table.throughput(np.full(11, 5.0), 1000)
+    assert data_volume(rate, times) == approx(20000)
@@ -0,0 +1,42 @@
+from rfbudget import (
+    Amplifier,
+    FreeSpacePathLossFriis,
+    GridIndex,
+    budget,
+    evaluate_network,
+    MHz,
+    kHz,
+    km,
+)
+from pytest import approx
+import numpy as np
+
+
+def test_grid_index_matches_brute_force():
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0, 10000, (500, 2))
+    centers = rng.uniform(0, 10000, (50, 2))
+    ci, pi, d = GridIndex(points, 1500).query_pairs(centers, 1500)
+    dense = np.hypot(*(centers[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+    expected = set(zip(*np.nonzero(dense <= 1500)))
+    assert set(zip(ci, pi)) == expected
+    assert d == approx(dense[ci, pi])
+
+
+def test_network_sinr():
+    rx_chain = budget(
+        elements=[Amplifier(gain=20, nf=3)], signal_bandwidth=kHz(200)
+    )
+    model = FreeSpacePathLossFriis(distance=km(1), freq=MHz(900))
+    tx = np.array([[0, 0], [km(4), 0], [km(100), 0]])
+    rx = np.array([[km(1), 0], [km(3.5), 0]])
+    r = evaluate_network(tx, rx, 30, rx_chain, model, interference_radius=km(10))
+    # Third transmitter is out of range
+    assert len(r.received_power) == 4
+    dense = r.received_power.to_dense()
+    assert dense[0, 0] == approx(30 - model.loss_at_distance(km(1)))
+    assert dense[2, 0] == -np.inf
+    assert list(r.serving) == [0, 1]
+    noise = 10 ** (r.noise_power / 10)
+    expected = 10 * np.log10(10 ** (dense[0, 0] / 10) / (noise + 10 ** (dense[1, 0] / 10)))
+    assert r.sinr[0] == approx(expected)
@@ -1,5 +1,7 @@
-from rfbudget import Orbit, km, degree
+from rfbudget import Orbit, eci_to_ecef, geodetic_to_ecef, look_angles, km, degree
 from pytest import approx
+import numpy as np
+
 
 def test_orbit_amsat_xls():
     """
@@ -14,4 +16,17 @@ def test_orbit_amsat_xls():
     assert o.mean_radius == approx(km(7178.17), 0.01)
     assert o.eccentricity == approx(0.000697, abs=0.000001)
     assert o.planet_radius == approx(km(6378.166), 0.1)
-    assert o.slant_range(degree(5)) == approx(km(2783.88), 0.1)
\ No newline at end of file
+    assert o.slant_range(degree(5)) == approx(km(2783.88), 0.1)
+
+
+def test_circular_orbit_zenith_pass():
+    o = Orbit(apogee=km(800))
+    # Half a period later the satellite is on the other side of the Earth
+    period = 2 * np.pi / o.mean_motion
+    pos = o.position(np.array([0, period / 2]))
+    assert pos[0] == approx([o.semi_major_axis, 0, 0])
+    assert pos[1] == approx([-o.semi_major_axis, 0, 0], abs=1)
+    station = geodetic_to_ecef(degree(0), degree(0))
+    el, rng = look_angles(eci_to_ecef(pos[0], 0), station)
+    assert el == approx(90)
+    assert rng == approx(km(800))
@@ -0,0 +1,59 @@
+from rfbudget import Antenna, AntennaPattern, DIPOLE_GAIN, load_msi
+from pytest import approx
+import numpy as np
+
+MSI = """NAME Test sector
+FREQUENCY 900
+GAIN 15 dBd
+TILT ELECTRICAL
+HORIZONTAL 4
+0 0
+90 10
+180 25
+270 10
+VERTICAL 4
+0 0
+90 20
+180 25
+270 20
+"""
+
+
+def test_three_gpp():
+    p = AntennaPattern.three_gpp(peak_gain=8, beamwidth_azimuth=65, beamwidth_elevation=10)
+    assert p.gain_at(0, 0) == approx(8)
+    assert p.gain_at(32.5, 0) == approx(5, abs=0.05)
+    assert p.gain_at(-32.5, 0) == approx(p.gain_at(327.5, 0))
+    assert p.gain_at(180, 0) == approx(8 - 30)
+    az, el = np.meshgrid(np.linspace(-180, 180, 1000), np.linspace(-90, 90, 500))
+    g = p(az, el)
+    assert g.shape == az.shape and g.max() <= 8 + 1e-9 and g.min() >= 8 - 30 - 1e-9
+    # Resolutions not dividing 360 degrees still wrap around the boresight
+    coarse = AntennaPattern.three_gpp(peak_gain=8, resolution=7)
+    assert coarse.azimuth[-1] == 360
+    assert coarse.gain_at(359.9, 0) <= 8
+    assert coarse.gain_at(359.9, 0) == approx(coarse.gain_at(-0.1, 0))
+
+
+def test_msi(tmp_path):
+    path = tmp_path / "sector.msi"
+    path.write_text(MSI)
+    p = load_msi(str(path))
+    assert p.name == "Test sector"
+    assert load_msi(str(path)) is p
+    assert p.peak_gain == approx(15 + DIPOLE_GAIN)
+    assert p.gain_at(45, 0) == approx(15 + DIPOLE_GAIN - 5)
+    # Downward angles are negative elevations
+    assert p.gain_at(0, -45) == approx(15 + DIPOLE_GAIN - 10)
+    assert p.gain_at(np.array([0, 90]), 0) == approx([15 + DIPOLE_GAIN, 5 + DIPOLE_GAIN])
+
+
+def test_antenna_pattern():
+    p = AntennaPattern.three_gpp(peak_gain=8)
+    a = Antenna(pattern=p, azimuth=32.5)
+    assert a.gain == approx(5, abs=0.05)
+    a.point(0, 0)
+    assert a.gain == approx(8)
+    assert a.gain_towards(np.zeros(3), 0) == approx([8] * 3)
+    assert Antenna(gain=3).gain_towards(np.zeros((2, 2)), 0).shape == (2, 2)
+    assert AntennaPattern.isotropic(2).gain_at(123, -45) == approx(2)
@@ -0,0 +1,43 @@
+from rfbudget import (
+    Amplifier,
+    FreeSpacePathLossFriis,
+    Loss,
+    budget,
+    decimate,
+    plot_levels,
+    plot_sweep,
+    save_figure,
+    sweep_distance,
+    MHz,
+    km,
+)
+import numpy as np
+
+
+def test_decimate_keeps_extrema():
+    x = np.arange(100000.0)
+    y = np.sin(x / 1000) + np.where(x == 54321, 10, 0)
+    xd, yd = decimate(x, np.stack([y, -y]), max_points=1000)
+    assert xd.shape == (2, 1000)
+    assert yd[0].max() == y.max() and yd[1].min() == -y.max()
+    assert np.all(np.diff(xd[0]) >= 0)
+
+
+def test_plots(tmp_path):
+    link = budget(
+        elements=[
+            FreeSpacePathLossFriis(distance=km(1), freq=MHz(868)),
+            Loss(loss=2),
+            Amplifier(gain=20, nf=2, oip3=30),
+        ],
+        signal_bandwidth=MHz(1),
+    )
+    distance = km(np.linspace(1, 50, 200))
+    sweep = sweep_distance(link, distance)
+    fig = plot_levels([link, sweep], stage_names=["FSPL", "Loss", "LNA"])
+    assert len(fig.axes) == 4
+    assert len(fig.axes[0].collections[0].get_segments()) == 201
+    save_figure(fig, str(tmp_path / "levels.png"))
+    ax = plot_sweep(distance, sweep.snr[-1], xlabel="Distance (m)")
+    save_figure(ax.figure, str(tmp_path / "sweep.svg"))
+    assert (tmp_path / "levels.png").stat().st_size > 0
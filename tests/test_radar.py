@@ -0,0 +1,58 @@
+from rfbudget import (
+    Amplifier,
+    RadarFreeSpaceBasicLoss,
+    Swerling,
+    Integration,
+    budget,
+    detection_probability,
+    detection_probability_vs_range,
+    detection_threshold,
+    max_detection_range,
+    radar_snr,
+    required_snr,
+    GHz,
+    km,
+)
+from pytest import approx
+import numpy as np
+
+
+def test_threshold_and_pd():
+    assert detection_threshold(1e-6) == approx(-np.log(1e-6))
+    # Swerling 1 single pulse: Pd = Pfa^(1 / (1 + SNR))
+    snr = np.array([10.0, 20.0])
+    expected = 1e-6 ** (1 / (1 + 10 ** (snr / 10)))
+    assert detection_probability(snr, 1e-6, 1, Swerling.SW1) == approx(expected, rel=1e-6)
+    # Noise only
+    assert detection_probability(-300, 1e-4, 5) == approx(1e-4, rel=1e-3)
+
+
+def test_required_snr():
+    # Reference values of the Swerling curves, Pd = 0.9 and Pfa = 1e-6
+    assert required_snr(0.9, 1e-6, 1, Swerling.SW0) == approx(13.2, abs=0.1)
+    assert required_snr(0.9, 1e-6, 1, Swerling.SW1) == approx(21.1, abs=0.1)
+    n = np.array([1, 10])
+    snr = required_snr(0.9, 1e-6, n, Swerling.SW2)
+    assert snr[1] < snr[0] - 10
+    coherent = required_snr(0.9, 1e-6, 10, Swerling.SW0, Integration.Coherent)
+    assert coherent == approx(13.2 - 10, abs=0.1)
+
+
+def test_detection_range():
+    radar = budget(
+        elements=[
+            Amplifier(name="Tx", gain=30, nf=0),
+            RadarFreeSpaceBasicLoss(distance=km(10), sigma=1, freq=GHz(10)),
+            Amplifier(name="LNA", gain=20, nf=2),
+        ],
+        available_input_power=30,
+        signal_bandwidth=1e6,
+    )
+    distance = np.array([km(1), km(10), km(100)])
+    pd = detection_probability_vs_range(radar, distance, pfa=1e-6, swerling=Swerling.SW1)
+    assert np.all(np.diff(pd) < 0)
+    sigma = np.array([1.0, 16.0])
+    r = max_detection_range(radar, 0.9, 1e-6, 1, Swerling.SW1, sigma=sigma)
+    # The range grows as the fourth root of the cross-section
+    assert r[1] == approx(2 * r[0], rel=1e-6)
+    assert radar_snr(radar, r[0]) == approx(required_snr(0.9, 1e-6, 1, Swerling.SW1), abs=1e-6)
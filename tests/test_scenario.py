@@ -0,0 +1,105 @@
+from rfbudget import (
+    Amplifier,
+    Antenna,
+    Cable,
+    FreeSpacePathLossFriis,
+    Loss,
+    budget,
+    compile_scenario,
+    free_space_path_loss,
+    load_scenario,
+    MHz,
+    km,
+)
+from pytest import approx, raises
+import json
+
+
+def test_scenario_matches_budget(tmp_path):
+    spec = {
+        "available_input_power": "$power",
+        "signal_bandwidth": 1e6,
+        "templates": {"lna": {"type": "Amplifier", "gain": 20, "nf": 2, "oip3": 30}},
+        "chain": [
+            {"type": "Antenna", "gain": 3},
+            {"type": "FreeSpacePathLossFriis", "distance": "$distance", "freq": 433e6},
+            {"type": "Loss", "loss": 2, "temp": 300},
+            {"template": "lna", "name": "LNA", "gain": "$gain"},
+        ],
+        "axes": {"distance": [1e3, 1e4, 1e5], "gain": {"start": 10, "stop": 30, "num": 3}, "power": [0, 10]},
+    }
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(spec))
+    plan = load_scenario(str(path))
+    assert len(plan) == 18
+    assert plan.names[-1] == "LNA"
+    result = plan.evaluate()
+    axes = plan.axis_values()
+    for i in (0, 7, 17):
+        b = budget(
+            elements=[
+                Antenna(gain=3),
+                FreeSpacePathLossFriis(distance=axes["distance"][i], freq=MHz(433)),
+                Loss(loss=2, temp=300),
+                Amplifier(gain=axes["gain"][i], nf=2, oip3=30),
+            ],
+            available_input_power=axes["power"][i],
+            signal_bandwidth=MHz(1),
+        )
+        assert result.snr[:, i] == approx(b.snr)
+        assert result.oip3[:, i] == approx(b.oip3)
+    # Slices evaluate the same variants
+    assert plan.evaluate(5, 9).nf == approx(result.nf[:, 5:9])
+
+
+def test_csv_chain_and_variants(tmp_path):
+    (tmp_path / "chain.csv").write_text(
+        "type,name,gain,nf,loss\nAntenna,Ant,2,,\nLoss,Cable,,,3\nAmplifier,LNA,20,1,\n"
+    )
+    plan = load_scenario(str(tmp_path / "chain.csv"))
+    b = budget(elements=[Antenna(gain=2), Loss(loss=3), Amplifier(gain=20, nf=1)])
+    assert plan.evaluate().nf[:, 0] == approx(b.nf)
+
+    (tmp_path / "variants.csv").write_text("distance,loss\n1000,1\n2000,2\n")
+    plan = compile_scenario(
+        {
+            "variants": "variants.csv",
+            "chain": [
+                {"type": "FreeSpacePathLossFriis", "distance": "$distance", "freq": 1e9},
+                {"type": "Loss", "loss": "$loss"},
+            ],
+        },
+        str(tmp_path),
+    )
+    assert len(plan) == 2
+    assert plan.evaluate().transducer_gain[-1] == approx(
+        [-free_space_path_loss(km(d), 1e9) - d for d in (1, 2)]
+    )
+
+
+def test_scenario_errors():
+    with raises(ValueError):
+        compile_scenario({"chain": [{"type": "Amplifier", "gain": "$missing"}]})
+    with raises(ValueError):
+        compile_scenario({"chain": [{"type": "Unknown"}]})
+    with raises(ValueError):
+        compile_scenario({"chain": [{"template": "lna"}]})
+    with raises(ValueError):
+        compile_scenario({"chain": [{"type": "Amplifier", "gain": 20, "nff": 3}]})
+    with raises(ValueError):
+        compile_scenario({"chain": [{"type": "ButterworthBandpassFilter", "bandwidth": 1e6}]})
+    with raises(ValueError):
+        compile_scenario({"chain": [{"type": "Cable", "length": 10, "cable_type": "LMR-400"}]})
+    with raises(ValueError):
+        compile_scenario({"chain": [{"type": "Cable", "cable_type": "LMR-1", "freq": 1e9}]})
+
+
+def test_scenario_cable_type():
+    plan = compile_scenario(
+        {
+            "axes": {"freq": [MHz(100), MHz(900)]},
+            "chain": [{"type": "Cable", "length": 30, "cable_type": "LMR-400", "freq": "$freq"}],
+        }
+    )
+    ref = [Cable(length=30, cable_type="LMR-400", freq=f).gain for f in (MHz(100), MHz(900))]
+    assert plan.evaluate().transducer_gain[0] == approx(ref)
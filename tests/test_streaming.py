@@ -0,0 +1,54 @@
+from rfbudget import compile_scenario, iter_sweep, stream_sweep
+from pytest import approx, raises
+import numpy as np
+
+
+def make_plan():
+    return compile_scenario(
+        {
+            "signal_bandwidth": 1e6,
+            "chain": [
+                {"type": "FreeSpacePathLossFriis", "distance": "$distance", "freq": 1e9},
+                {"type": "Amplifier", "gain": "$gain", "nf": 2},
+            ],
+            "axes": {"distance": {"start": 1e3, "stop": 1e5, "num": 10}, "gain": [10, 20, 30]},
+        }
+    )
+
+
+class Interrupted:
+    def __init__(self, plan, after):
+        self.plan = plan
+        self.stages = plan.stages
+        self.after = after
+
+    def __len__(self):
+        return len(self.plan)
+
+    def evaluate(self, start, stop):
+        if start >= self.after:
+            raise KeyboardInterrupt
+        return self.plan.evaluate(start, stop)
+
+
+def test_iter_sweep_chunks():
+    plan = make_plan()
+    full = plan.evaluate()
+    chunks = list(iter_sweep(plan, chunk_size=7, stages=[-1], dtype=np.float64))
+    assert [(lo, hi) for lo, hi, _ in chunks][-1] == (28, 30)
+    snr = np.concatenate([c["snr"] for _, _, c in chunks], axis=1)
+    assert snr.shape == (1, 30)
+    assert snr[0] == approx(full.snr[-1])
+
+
+def test_stream_sweep_resume(tmp_path):
+    plan = make_plan()
+    with raises(KeyboardInterrupt):
+        stream_sweep(Interrupted(plan, 14), str(tmp_path), chunk_size=7)
+    result = stream_sweep(plan, str(tmp_path), chunk_size=7)
+    assert result.completed == 30
+    assert result["snr"].dtype == np.float32
+    assert result["snr"] == approx(plan.evaluate().snr, rel=1e-6)
+    assert np.load(str(tmp_path / "nf.npy")) == approx(plan.evaluate().nf, rel=1e-6)
+    with raises(ValueError):
+        stream_sweep(plan, str(tmp_path), stages=[-1])
@@ -0,0 +1,54 @@
+from rfbudget import (
+    Amplifier,
+    Antenna,
+    FreeSpacePathLossFriis,
+    Loss,
+    budget,
+    into_svg,
+    MHz,
+    km,
+)
+import os
+import rfbudget
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+
+
+def _budget():
+    return budget(
+        elements=[
+            FreeSpacePathLossFriis(distance=km(1), freq=MHz(868)),
+            Antenna(name="Ant", gain=2),
+            Loss(name="Cable", loss=1.5),
+            Amplifier(name="LNA", gain=20, nf=1, oip3=30),
+        ],
+        input_freq=MHz(868),
+        available_input_power=-30,
+        signal_bandwidth=125000,
+    )
+
+
+def test_svg_schematic():
+    b = _budget()
+    svg = b.schemdraw(renderer="svg")
+    root = ET.fromstring(svg)
+    assert root.tag.endswith("svg")
+    assert "<polygon" in svg and "LNA" in svg and "Cable" in svg
+    assert "d=1000.00m" in svg and "gain=" not in svg
+    assert "gain=20.00dB" in into_svg(b.elements, {"with_gain": True})
+    cells = into_svg(b.elements, as_html_table=True)
+    assert cells.count("<td><svg") == len(b.elements)
+
+
+def test_import_without_schemdraw():
+    code = (
+        "import sys, rfbudget; "
+        "print(any(m.split('.')[0] in ('schemdraw', 'matplotlib') for m in sys.modules))"
+    )
+    src = os.path.dirname(os.path.dirname(rfbudget.__file__))
+    env = dict(os.environ, PYTHONPATH=src)
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,54 @@
+from rfbudget import (
+    DigitalElevationModel,
+    TerrainPathLoss,
+    knife_edge_loss,
+    terrain_path_loss,
+    great_circle_distance,
+    MHz,
+    m,
+)
+from pytest import approx
+import numpy as np
+
+
+def write_tile(directory, name, data):
+    data.astype(">i2").tofile(str(directory / name))
+
+
+def test_knife_edge():
+    # ITU-R P.526: J(0) ~ 6dB, no loss below v = -0.78
+    assert knife_edge_loss(0) == approx(6.03, abs=0.01)
+    assert knife_edge_loss(-1) == 0
+
+
+def test_terrain_flat_and_ridge(tmp_path):
+    n = 1201
+    write_tile(tmp_path, "N45E006.hgt", np.zeros((n, n)))
+    # Ridge of 200m along the meridian at 6.15°E
+    ridge = np.zeros((n, n))
+    ridge[:, 178:183] = 200
+    write_tile(tmp_path, "N46E006.hgt", ridge)
+    dem = DigitalElevationModel(str(tmp_path))
+    assert dem.elevation(46.5, 6.15) == approx(200)
+    assert dem.elevation(40.5, 6.15) == 0  # missing tile
+
+    lat = np.array([45.5, 46.5])
+    distance, diffraction, total = terrain_path_loss(
+        dem, lat, 6.1, lat, 6.2, MHz(900), tx_height=m(30), rx_height=m(30)
+    )
+    assert distance == approx(great_circle_distance(lat, 6.1, lat, 6.2))
+    assert diffraction[0] == approx(0, abs=0.1)
+    assert diffraction[1] > 20
+    assert total == approx(20 * np.log10(distance * 900e6) - 147.55 + diffraction)
+
+    elt = TerrainPathLoss(
+        dem=dem,
+        tx=(46.5, 6.1),
+        rx=(46.5, 6.2),
+        freq=MHz(900),
+        tx_height=m(30),
+        rx_height=m(30),
+        method=TerrainPathLoss.DEYGOUT,
+    )
+    assert elt.diffraction_loss > diffraction[1]
+    assert elt.gain == approx(-(total[1] - diffraction[1] + elt.diffraction_loss))
@@ -0,0 +1,57 @@
+from rfbudget import (
+    Amplifier,
+    BandpassFilter,
+    Cable,
+    Loss,
+    budget,
+    celsius,
+    element_columns_at,
+    loss_temp_to_nf,
+    temperature_sweep,
+    worst_case,
+    MHz,
+    m,
+)
+from pytest import approx
+import numpy as np
+
+
+def _budget():
+    return budget(
+        elements=[
+            Cable(name="Feeder", length=m(10), loss_per_m=0.1, loss_tc=0.002),
+            Amplifier(name="LNA", gain=20, nf=1, oip3=30, gain_tc=-0.01, nf_tc=0.005),
+            Loss(name="Filter", loss=2),
+            Amplifier(name="IF", gain=15, nf=4, oip3=35),
+        ],
+        signal_bandwidth=MHz(1),
+        available_input_power=-90,
+    )
+
+
+def test_temperature_sweep():
+    b = _budget()
+    temps = celsius(np.linspace(-40, 85, 126))
+    result = temperature_sweep(b, temps)
+    assert result.snr.shape == (4, 126)
+    # At the reference temperature the drifts vanish
+    ref = temperature_sweep(b, celsius(25))
+    assert ref.transducer_gain == approx(b.transducer_gain)
+    feeder = result.transducer_gain[0]
+    assert feeder[0] > -1 > feeder[-1]
+    assert result.nf[0] == approx(loss_temp_to_nf(-feeder, temps))
+    assert np.all(np.diff(result.snr[-1]) < 0)
+    # Passive filters are noisier when hot, their loss is fixed
+    gain, nf, _, _ = element_columns_at([BandpassFilter(gain=-2, nf=2)], temps)
+    assert gain[0] == approx(-2)
+    assert nf[0] == approx(loss_temp_to_nf(2, temps))
+
+
+def test_worst_case():
+    b = _budget()
+    temps = celsius(np.array([-40, 25, 85]))
+    corners = worst_case(b, temps, T_receiver=temps)
+    assert corners["snr"].temp == approx(celsius(85))
+    assert corners["nf"].temp == approx(celsius(85))
+    assert corners["transducer_gain"].temp == approx(celsius(85))
+    assert corners["snr"].value == approx(temperature_sweep(b, celsius(85), celsius(85)).snr[-1])
@@ -0,0 +1,43 @@
+from rfbudget import (
+    Amplifier,
+    Antenna,
+    ConverterType,
+    FreeSpacePathLossFriis,
+    Loss,
+    Modulator,
+    VariantSet,
+    budget,
+    MHz,
+    km,
+)
+from pytest import approx
+
+
+def test_variants_match_budgets():
+    front = [
+        Antenna(gain=3),
+        FreeSpacePathLossFriis(distance=km(5), freq=MHz(868)),
+        Amplifier(gain=20, nf=1.5, oip3=25, iip2=40),
+    ]
+    chains = [
+        front + [Loss(loss=2), Amplifier(gain=15, nf=4, oip3=30)],
+        front + [Loss(loss=2), Amplifier(gain=25, nf=5, oip3=35)],
+        front + [Modulator(gain=-7, nf=7, oip3=15, lo=MHz(800), converter_type=ConverterType.Down)],
+        # Equal content shares the prefix even with distinct objects
+        [Antenna(gain=3)] + front[1:] + [Loss(loss=2)],
+    ]
+    variants = VariantSet(
+        chains, input_freq=MHz(868), available_input_power=14, signal_bandwidth=MHz(1)
+    )
+    assert variants.stage_count == 3 + 3 + 1
+    results = variants.evaluate()
+    for chain, r in zip(chains, results):
+        b = budget(
+            elements=chain,
+            input_freq=MHz(868),
+            available_input_power=14,
+            signal_bandwidth=MHz(1),
+        )
+        for name in ("output_freq", "output_power", "transducer_gain", "nf", "snr", "oip3", "iip2", "capacity"):
+            assert getattr(r, name) == approx(getattr(b, name)), name
+        assert r.receiver_thermal_noise_dBm == approx(b.receiver_thermal_noise_dBm)